@@ -0,0 +1,273 @@
+# batch_stub_server.py
+"""
+오프라인 테스트용 OpenAI / Anthropic API 흉내 서버 (표준 라이브러리만 사용)
+
+배치 API와 일반(동기) 요청을 모두 지원하며, 실제 번역 대신 각 줄 앞에 "[STUB] "을 붙여 돌려줍니다.
+배치는 제출 후 --delay 초가 지나면 완료 상태가 됩니다.
+
+사용법:
+    python batch_stub_server.py --port 8765 --delay 5
+
+    # OpenAI 공급자
+    set OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+    # Anthropic 공급자
+    set ANTHROPIC_BASE_URL=http://127.0.0.1:8765
+
+(또는 옵션 'api_base_url'에 위 주소 지정, API 키는 아무 값이나 입력)
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import default as email_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_PREFIX = "[STUB] "
+
+
+def fake_translate(user_text):
+    """[{id, text}] 형식이면 [{id, trans}]로, 아니면 원문 그대로 접두사만 붙여 반환"""
+    try:
+        items = json.loads(user_text)
+        if isinstance(items, dict): items = [items]
+        return json.dumps(
+            [{"id": it.get("id"), "trans": STUB_PREFIX + str(it.get("text", ""))} for it in items],
+            ensure_ascii=False
+        )
+    except (ValueError, AttributeError):
+        return STUB_PREFIX + user_text
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") if ts else None
+
+
+# ==========================================
+# [응답 생성] 공급자별 메시지 형식
+# ==========================================
+def openai_completion(body):
+    user_text = next((m["content"] for m in reversed(body.get("messages", [])) if m.get("role") == "user"), "")
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion",
+        "created": int(time.time()), "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0, "finish_reason": "stop", "logprobs": None,
+            "message": {"role": "assistant", "content": fake_translate(user_text)}
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+def anthropic_message(params):
+    user_text = next((m["content"] for m in reversed(params.get("messages", [])) if m.get("role") == "user"), "")
+    if isinstance(user_text, list):
+        user_text = "".join(part.get("text", "") for part in user_text)
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:12]}", "type": "message", "role": "assistant",
+        "model": params.get("model", "stub"),
+        "content": [{"type": "text", "text": fake_translate(user_text)}],
+        "stop_reason": "end_turn", "stop_sequence": None,
+        "usage": {"input_tokens": 0, "output_tokens": 0}
+    }
+
+
+# ==========================================
+# [저장소] 업로드 파일 / 배치 상태 (메모리)
+# ==========================================
+class StubState:
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.files = {}      # file_id -> {"filename", "content", "created_at"}
+        self.batches = {}    # batch_id -> dict
+
+    def is_done(self, batch):
+        return time.time() - batch["created_at"] >= self.delay
+
+    # ---- OpenAI ----
+    def openai_batch(self, batch):
+        done = self.is_done(batch)
+        if done and not batch.get("output_file_id"):
+            lines = []
+            for req in batch["requests"]:
+                lines.append(json.dumps({
+                    "id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": req["custom_id"],
+                    "response": {"status_code": 200, "request_id": uuid.uuid4().hex, "body": openai_completion(req["body"])},
+                    "error": None
+                }, ensure_ascii=False))
+            file_id = f"file-{uuid.uuid4().hex[:12]}"
+            self.files[file_id] = {"filename": "batch_output.jsonl", "content": "\n".join(lines).encode("utf-8"), "created_at": int(time.time())}
+            batch["output_file_id"] = file_id
+            batch["completed_at"] = int(time.time())
+
+        total = len(batch["requests"])
+        return {
+            "id": batch["id"], "object": "batch", "endpoint": batch["endpoint"],
+            "input_file_id": batch["input_file_id"], "completion_window": "24h",
+            "status": "completed" if done else "in_progress",
+            "output_file_id": batch.get("output_file_id"), "error_file_id": None, "errors": None,
+            "created_at": int(batch["created_at"]), "completed_at": batch.get("completed_at"),
+            "request_counts": {"total": total, "completed": total if done else 0, "failed": 0},
+            "metadata": None
+        }
+
+    # ---- Anthropic ----
+    def anthropic_batch(self, batch, base_url):
+        done = self.is_done(batch)
+        total = len(batch["requests"])
+        return {
+            "id": batch["id"], "type": "message_batch",
+            "processing_status": "ended" if done else "in_progress",
+            "request_counts": {
+                "processing": 0 if done else total, "succeeded": total if done else 0,
+                "errored": 0, "canceled": 0, "expired": 0
+            },
+            "created_at": _iso(batch["created_at"]),
+            "expires_at": _iso(batch["created_at"] + 86400),
+            "ended_at": _iso(batch["created_at"] + self.delay) if done else None,
+            "cancel_initiated_at": None, "archived_at": None,
+            "results_url": f"{base_url}/v1/messages/batches/{batch['id']}/results" if done else None
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state = None  # serve()에서 주입
+
+    def log_message(self, fmt, *args):
+        print(f"[Stub] {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+    # ---- 공통 ----
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, obj, status=200):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self._send_raw(data, "application/json", status)
+
+    def _send_raw(self, data, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _not_found(self):
+        self._send_json({"error": {"type": "not_found_error", "message": f"Unknown path: {self.path}"}}, 404)
+
+    def _base_url(self):
+        return f"http://{self.headers.get('Host', '127.0.0.1')}"
+
+    def _parse_multipart(self, body):
+        """multipart/form-data -> {필드명: (파일명, 바이트)}"""
+        header = f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("utf-8")
+        msg = BytesParser(policy=email_policy).parsebytes(header + body)
+        fields = {}
+        for part in msg.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            fields[name] = (part.get_filename(), part.get_payload(decode=True))
+        return fields
+
+    # ---- 라우팅 ----
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        body = self._read_body()
+        st = self.state
+
+        if path == "/v1/chat/completions":
+            return self._send_json(openai_completion(json.loads(body)))
+
+        if path == "/v1/messages":
+            return self._send_json(anthropic_message(json.loads(body)))
+
+        if path == "/v1/files":
+            fields = self._parse_multipart(body)
+            filename, content = fields.get("file", ("upload.jsonl", b""))
+            file_id = f"file-{uuid.uuid4().hex[:12]}"
+            with st.lock:
+                st.files[file_id] = {"filename": filename, "content": content, "created_at": int(time.time())}
+            return self._send_json({
+                "id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                "filename": filename, "purpose": "batch", "status": "processed"
+            })
+
+        if path == "/v1/batches":
+            req = json.loads(body)
+            with st.lock:
+                f = st.files.get(req.get("input_file_id"))
+                if f is None:
+                    return self._send_json({"error": {"message": "input file not found"}}, 400)
+                requests = [json.loads(line) for line in f["content"].decode("utf-8").splitlines() if line.strip()]
+                batch = {
+                    "id": f"batch_{uuid.uuid4().hex[:12]}", "endpoint": req.get("endpoint"),
+                    "input_file_id": req["input_file_id"], "requests": requests, "created_at": time.time()
+                }
+                st.batches[batch["id"]] = batch
+                return self._send_json(st.openai_batch(batch))
+
+        if path == "/v1/messages/batches":
+            req = json.loads(body)
+            with st.lock:
+                batch = {"id": f"msgbatch_{uuid.uuid4().hex[:12]}", "requests": req.get("requests", []), "created_at": time.time()}
+                st.batches[batch["id"]] = batch
+                return self._send_json(st.anthropic_batch(batch, self._base_url()))
+
+        self._not_found()
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        st = self.state
+
+        m = re.fullmatch(r"/v1/batches/([\w-]+)", path)
+        if m:
+            with st.lock:
+                batch = st.batches.get(m.group(1))
+                if batch is None: return self._not_found()
+                return self._send_json(st.openai_batch(batch))
+
+        m = re.fullmatch(r"/v1/files/([\w-]+)/content", path)
+        if m:
+            with st.lock:
+                f = st.files.get(m.group(1))
+            if f is None: return self._not_found()
+            return self._send_raw(f["content"], "application/octet-stream")
+
+        m = re.fullmatch(r"/v1/messages/batches/([\w-]+)(/results)?", path)
+        if m:
+            with st.lock:
+                batch = st.batches.get(m.group(1))
+                if batch is None: return self._not_found()
+                if not m.group(2):
+                    return self._send_json(st.anthropic_batch(batch, self._base_url()))
+                if not st.is_done(batch):
+                    return self._send_json({"error": {"type": "invalid_request_error", "message": "batch not ended"}}, 400)
+                lines = [json.dumps({
+                    "custom_id": req["custom_id"],
+                    "result": {"type": "succeeded", "message": anthropic_message(req["params"])}
+                }, ensure_ascii=False) for req in batch["requests"]]
+            return self._send_raw("\n".join(lines).encode("utf-8"), "application/binary")
+
+        self._not_found()
+
+
+def serve(host="127.0.0.1", port=8765, delay=5.0):
+    StubHandler.state = StubState(delay)
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    print(f"[Stub] http://{host}:{server.server_address[1]} (배치 완료 지연 {delay}초)")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI/Anthropic 배치 API 오프라인 테스트 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=5.0, help="배치 제출 후 완료까지 걸리는 시간(초)")
+    args = parser.parse_args()
+    try:
+        serve(args.host, args.port, args.delay).serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,88 @@
+# bench_extract_brackets.py
+"""
+[벤치마크] 추출 단계의 괄호 처리: 단일 패스 토크나이저 vs 기존 replace 방식
+
+합성 대사 파일(기본 50MB)을 만들어 _worker_extract 전체 시간을 측정하고,
+기존 방식(괄호마다 전체 텍스트를 replace, O(n²))은 작은 크기(--legacy-mb)에서 측정하여
+결과가 동일한지 확인한 뒤 전체 크기에서의 소요 시간을 추정합니다.
+
+사용법 (프로그램 폴더에서):
+    python benchmarks/bench_extract_brackets.py --size-mb 50 --legacy-mb 2
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logic  # noqa: E402
+
+WORDS = ["今日", "は", "いい", "天気", "ですね", "少女", "先生", "どうして", "わからない", "行こう", "ありがとう", "本当に", "…"]
+
+
+def make_dialog_text(size_bytes, seed=0):
+    """「대사」 / 『제목』 / 화자 태그 / m_Text 가 섞인 합성 덤프 텍스트"""
+    rnd = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size_bytes:
+        body = "".join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 12)))
+        kind = rnd.random()
+        if kind < 0.6:
+            line = f"#speaker={rnd.choice(WORDS)}=\n「{body}」\n"
+        elif kind < 0.7:
+            line = f"『{body}』を読んだ。\n"
+        elif kind < 0.9:
+            line = f'1 string m_Text = "{body}"\n'
+        else:
+            line = f"{body}\x00\x01{rnd.randint(0, 9999)}\n"
+        parts.append(line)
+        total += len(line.encode("utf-8"))
+    return "".join(parts)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=50, help="토크나이저 측정용 파일 크기 (MB)")
+    parser.add_argument("--legacy-mb", type=float, default=2, help="기존 방식 측정용 파일 크기 (MB, O(n²)이므로 작게)")
+    args = parser.parse_args()
+
+    options = {"group_brackets": True}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. 작은 파일: 기존 방식과 결과 비교
+        small_text = make_dialog_text(int(args.legacy_mb * 1024 * 1024), seed=1)
+        t_legacy, legacy_result = timed(logic._tokenize_extract_legacy, small_text)
+        t_new_small, new_result = timed(logic._tokenize_extract, small_text, True)
+        if legacy_result != new_result:
+            print("!! 결과 불일치: 토크나이저 출력이 기존 방식과 다릅니다.")
+            sys.exit(1)
+        print(f"[{args.legacy_mb:g}MB] 괄호 {len(new_result[0])}개 / 청크 {len(new_result[1])}개 - 결과 동일")
+        print(f"  기존 replace 방식 : {t_legacy:8.3f}s")
+        print(f"  단일 패스 토크나이저: {t_new_small:8.3f}s  (x{t_legacy / max(t_new_small, 1e-9):.0f})")
+
+        # 2. 큰 파일: 워커 전체 시간 (파일 읽기 + 정제 + 토큰화 + 필터링)
+        big_path = os.path.join(tmp_dir, "dialog.txt")
+        with open(big_path, "w", encoding="utf-8") as f:
+            f.write(make_dialog_text(int(args.size_mb * 1024 * 1024), seed=2))
+
+        t_worker, (_, lines, error) = timed(logic._worker_extract, (big_path, options, None))
+        if error:
+            print(f"!! 워커 오류: {error}")
+            sys.exit(1)
+
+        scale = (args.size_mb / args.legacy_mb) ** 2
+        print(f"[{args.size_mb:g}MB] _worker_extract: {t_worker:.2f}s ({len(lines)}줄 추출)")
+        print(f"  기존 방식 추정치 (O(n²) 외삽): 약 {t_legacy * scale:,.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# bench_glossary_masking.py
+"""
+[벤치마크] 용어집 마스킹: 공용 인덱스(GlossaryIndex) vs 기존 방식
+
+기존 방식은 거대한 정규식 OR 패턴으로 용어를 찾은 뒤, 매칭될 때마다 용어집 전체를
+처음부터 훑어 마스킹 ID를 찾았습니다 (매칭 수 x 용어 수).
+합성 용어집(기본 10,000개)과 합성 DB(기본 100,000줄)로 process_db_masking의
+적용/해제 시간을 측정하고, 기존 방식은 일부 줄(--legacy-lines)에서 측정하여
+결과가 동일한지 확인한 뒤 전체 크기에서의 소요 시간을 추정합니다.
+
+사용법 (프로그램 폴더에서):
+    python benchmarks/bench_glossary_masking.py --terms 10000 --lines 100000 --legacy-lines 2000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logic  # noqa: E402
+import utils  # noqa: E402
+
+KANA = [chr(c) for c in range(0x30A1, 0x30F6)]
+FILLER = ["は", "の", "を", "に", "で", "した", "。", "、", "「", "」", "今日", "先生"]
+
+
+def make_glossary(path, n_terms, seed=0):
+    rnd = random.Random(seed)
+    terms = set()
+    while len(terms) < n_terms:
+        terms.add("".join(rnd.choice(KANA) for _ in range(rnd.randint(3, 8))))
+    with open(path, "w", encoding="utf-8") as f:
+        for i, term in enumerate(sorted(terms)):
+            f.write(f"{term}=용어{i}\n")
+    return sorted(terms)
+
+
+def make_db(path, terms, n_lines, seed=1):
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(n_lines):
+            words = [rnd.choice(terms) if rnd.random() < 0.3 else rnd.choice(FILLER) for _ in range(rnd.randint(4, 16))]
+            text = "".join(words)
+            f.write(f"{text}={text}\n")
+
+
+def legacy_apply(masking_data):
+    """기존 _get_glossary_map + 선형 탐색 콜백"""
+    sorted_data = sorted(masking_data, key=lambda x: len(x['src']), reverse=True)
+    pattern = re.compile('|'.join(re.escape(item['src']) for item in sorted_data))
+
+    def _cb(m):
+        word = m.group(0)
+        for item in sorted_data:
+            if item['src'] == word:
+                return item['mask_id']
+        return word
+
+    return lambda text: pattern.sub(_cb, text)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--terms", type=int, default=10000, help="용어집 항목 수")
+    parser.add_argument("--lines", type=int, default=100000, help="DB 줄 수")
+    parser.add_argument("--legacy-lines", type=int, default=2000, help="기존 방식 측정용 줄 수 (느리므로 작게)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        glossary_path = os.path.join(tmp_dir, "glossary.txt")
+        db_path = os.path.join(tmp_dir, "db.txt")
+        terms = make_glossary(glossary_path, args.terms)
+        make_db(db_path, terms, args.lines)
+        masking_data = utils.load_glossary_data(glossary_path)
+
+        with open(db_path, "r", encoding="utf-8") as f:
+            db_lines = [line.rstrip("\n") for line in f]
+
+        # 1. 기존 방식: 일부 줄에서 측정 후 결과 비교
+        sample = [line.split("=", 1)[0] for line in db_lines[:args.legacy_lines]]
+        t_build_old, old_mask = timed(legacy_apply, masking_data)
+        t_old, old_result = timed(lambda: [old_mask(t) for t in sample])
+
+        t_build_new, index = timed(utils.GlossaryIndex, masking_data)
+        t_new_small, new_result = timed(lambda: [index.mask_text(t) for t in sample])
+        if old_result != new_result:
+            print("!! 결과 불일치: 공용 인덱스 마스킹 결과가 기존 방식과 다릅니다.")
+            sys.exit(1)
+        print(f"[{args.terms}개 용어 / {len(sample)}줄] 결과 동일")
+        print(f"  기존 방식 : 준비 {t_build_old:6.2f}s + 마스킹 {t_old:8.3f}s")
+        print(f"  공용 인덱스: 준비 {t_build_new:6.2f}s + 마스킹 {t_new_small:8.3f}s  (x{t_old / max(t_new_small, 1e-9):.0f})")
+
+        # 2. 전체 DB: process_db_masking 적용 -> 해제 왕복
+        logs = []
+        t_apply, _ = timed(logic.process_db_masking, db_path, glossary_path, 'apply', logs.append)
+        masked_path = os.path.splitext(db_path)[0] + "_MASKED.txt"
+        t_restore, _ = timed(logic.process_db_masking, masked_path, glossary_path, 'restore', logs.append)
+        errors = [line for line in logs if line.startswith("!!")]
+        if errors:
+            print("\n".join(errors))
+            sys.exit(1)
+
+        restored_path = os.path.splitext(masked_path)[0] + "_RESTORED.txt"
+        with open(restored_path, "r", encoding="utf-8") as f:
+            restored_left = [line.rstrip("\n").split("=", 1)[0] for line in f]
+        round_trip = restored_left == [line.split("=", 1)[0] for line in db_lines]
+
+        per_line = t_old / max(len(sample), 1)
+        print(f"[{args.terms}개 용어 / {args.lines}줄] process_db_masking")
+        print(f"  적용 {t_apply:.2f}s / 해제 {t_restore:.2f}s (원문 왕복 {'일치' if round_trip else '불일치'})")
+        print(f"  기존 방식 적용 추정치 (좌변+우변, 줄 수 비례 외삽): 약 {per_line * args.lines * 2:,.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# bench_import_time.py
+"""
+[벤치마크] 프로그램 시작(import) 시간 측정
+
+각 대상 모듈을 새 파이썬 프로세스에서 `python -X importtime -c "import <모듈>"`로 불러와
+누적 import 시간과 프로세스 전체 시간을 여러 번 측정하고, 가장 무거운 최상위 패키지를 보여줍니다.
+공급자 SDK가 시작 시점에 불러와지지 않는지(지연 로딩)도 함께 확인합니다.
+
+  --cold : 실행마다 빈 바이트코드 캐시(PYTHONPYCACHEPREFIX)를 사용하여 설치 직후 첫 실행을 흉내냄
+
+사용법 (프로그램 폴더에서):
+    python benchmarks/bench_import_time.py --runs 5 main logic
+    python benchmarks/bench_import_time.py --cold logic logic_ai
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROGRAM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작 시점에 불러오면 안 되는 모듈 (logic_ai._load_sdk로 처음 사용할 때만 로딩)
+LAZY_MODULES = ("openai", "anthropic", "deepl", "google.genai", "tiktoken", "requests", "chardet")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def run_import(module, cold):
+    """
+    :return: (프로세스 시간(s), 대상 모듈 누적 import 시간(s), {최상위 패키지: self 시간(s)}, 오류 메시지)
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = PROGRAM_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    cache_dir = tempfile.mkdtemp(prefix="importtime_") if cold else None
+    if cache_dir:
+        env["PYTHONPYCACHEPREFIX"] = cache_dir
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROGRAM_DIR, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+
+    if cache_dir:
+        import shutil
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    cumulative = None
+    by_package = {}
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if not m:
+            continue
+        self_us, cum_us, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        top = name.split(".")[0]
+        by_package[top] = by_package.get(top, 0) + self_us / 1e6
+        if name == module and len(indent) <= 1:
+            cumulative = cum_us / 1e6
+
+    error = None
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["(출력 없음)"])[-1]
+    return wall, cumulative, by_package, error
+
+
+def loaded_lazy_modules(module):
+    """대상 모듈을 불러온 직후 이미 로딩된 SDK 목록"""
+    code = (
+        f"import sys, {module}\n"
+        f"print('LAZY:' + ','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = PROGRAM_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=PROGRAM_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None
+    # 모듈이 import 중에 출력한 내용은 무시
+    result = next((line[5:] for line in proc.stdout.splitlines() if line.startswith("LAZY:")), "")
+    return [m for m in result.split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=["main", "logic"], help="측정할 모듈 (기본: main logic)")
+    parser.add_argument("--runs", type=int, default=5, help="모듈당 반복 횟수")
+    parser.add_argument("--cold", action="store_true", help="바이트코드 캐시 없이 측정")
+    parser.add_argument("--top", type=int, default=8, help="표시할 무거운 패키지 수")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]} / {'콜드(캐시 없음)' if args.cold else '웜(바이트코드 캐시)'} / {args.runs}회")
+    failed = False
+
+    for module in args.modules:
+        walls, cums = [], []
+        packages = {}
+        error = None
+        for _ in range(args.runs):
+            wall, cum, by_package, error = run_import(module, args.cold)
+            if error:
+                break
+            walls.append(wall)
+            if cum is not None:
+                cums.append(cum)
+            for name, sec in by_package.items():
+                packages[name] = packages.get(name, 0) + sec / args.runs
+
+        print(f"\n[{module}]")
+        if error:
+            print(f"  !! import 실패: {error}")
+            failed = True
+            continue
+
+        print(f"  프로세스 시간 : 중앙값 {statistics.median(walls) * 1000:7.1f}ms (최소 {min(walls) * 1000:.1f}ms)")
+        if cums:
+            print(f"  누적 import   : 중앙값 {statistics.median(cums) * 1000:7.1f}ms (최소 {min(cums) * 1000:.1f}ms)")
+
+        print("  무거운 최상위 패키지 (self 시간 합계, 평균):")
+        for name, sec in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+            print(f"    {name:<24} {sec * 1000:7.1f}ms")
+
+        loaded = loaded_lazy_modules(module)
+        if loaded:
+            print(f"  !! 시작 시점에 로딩된 SDK: {', '.join(loaded)}")
+            failed = True
+        elif loaded is not None:
+            print("  SDK 지연 로딩: OK (시작 시점에 로딩된 SDK 없음)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
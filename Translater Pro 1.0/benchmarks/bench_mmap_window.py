@@ -0,0 +1,134 @@
+# bench_mmap_window.py
+"""
+[벤치마크] 대용량 파일 mmap 창 단위 처리 vs 전체 읽기
+
+합성 대사 파일(기본 80MB, UTF-8 BOM 있음/없음 각각)을 만들어 추출(_worker_extract)과
+번역 적용(process_translate)을 전체 읽기 경로와 mmap 창 경로로 각각 실행하고,
+결과(추출 줄 / 출력 파일 바이트)가 동일한지 확인한 뒤 소요 시간을 비교합니다.
+기본 크기는 MMAP_THRESHOLD_BYTES 이상이므로 실제 설정 그대로 mmap 경로가 선택됩니다.
+
+사용법 (프로그램 폴더에서):
+    python benchmarks/bench_mmap_window.py --size-mb 80
+    python benchmarks/bench_mmap_window.py --size-mb 4 --window-kb 256   (창 경계를 많이 만드는 빠른 확인)
+"""
+import argparse
+import codecs
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logic  # noqa: E402
+
+WORDS = ["今日", "は", "いい", "天気", "ですね", "少女", "先生", "どうして", "わからない", "行こう", "ありがとう", "本当に", "…"]
+DB_KEYS = ["先生", "少女", "ありがとう", "天気", "本当に"]
+
+
+def make_dialog_bytes(size_bytes, bom, seed=0):
+    """대사 / 「대사」 / m_Text / 줄바꿈 종류(\\n, \\r\\n)가 섞인 합성 덤프 (bom=True면 UTF-8 BOM으로 시작)"""
+    rnd = random.Random(seed)
+    # 첫 줄은 괄호 없는 대사 (BOM이 본문에 남으면 추출 결과 첫 줄에 섞여 드러남)
+    parts = [codecs.BOM_UTF8] if bom else []
+    parts.append("ありがとう先生\n".encode("utf-8"))
+    total = 0
+    while total < size_bytes:
+        body = "".join(rnd.choice(WORDS) for _ in range(rnd.randint(3, 12)))
+        eol = "\r\n" if rnd.random() < 0.2 else "\n"
+        line = (f"「{body}」{eol}" if rnd.random() < 0.7 else f'1 string m_Text = "{body}"{eol}').encode("utf-8")
+        parts.append(line)
+        total += len(line)
+    return b"".join(parts)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def run_both(threshold, func, *args):
+    """전체 읽기(임계값 무한대)와 mmap 경로(원래 임계값)로 같은 작업을 실행"""
+    original = logic.MMAP_THRESHOLD_BYTES
+    try:
+        logic.MMAP_THRESHOLD_BYTES = float("inf")
+        t_full, full = timed(func, *args, "full")
+        logic.MMAP_THRESHOLD_BYTES = threshold
+        t_mmap, windowed = timed(func, *args, "mmap")
+    finally:
+        logic.MMAP_THRESHOLD_BYTES = original
+    return (t_full, full), (t_mmap, windowed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=80, help="합성 파일 크기 (MB)")
+    parser.add_argument("--window-kb", type=int, default=0, help="mmap 창 크기 (KB, 0이면 기본값)")
+    args = parser.parse_args()
+
+    size_bytes = int(args.size_mb * 1024 * 1024)
+    # 작은 크기로 실행할 때도 mmap 경로가 선택되도록 임계값을 파일 크기 이하로 맞춤
+    threshold = min(logic.MMAP_THRESHOLD_BYTES, size_bytes)
+    if args.window_kb:
+        logic.MMAP_WINDOW_BYTES = args.window_kb * 1024
+    failed = False
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "db.txt")
+        with open(db_path, "w", encoding="utf-8") as f:
+            for i, key in enumerate(DB_KEYS):
+                f.write(f"{key}=번역{i}\n")
+
+        for bom in (False, True):
+            label = "BOM" if bom else "BOM 없음"
+            src_dir = os.path.join(tmp_dir, f"src_{int(bom)}")
+            os.makedirs(src_dir)
+            src_path = os.path.join(src_dir, "dialog.txt")
+            data = make_dialog_bytes(size_bytes, bom, seed=int(bom))
+            with open(src_path, "wb") as f:
+                f.write(data)
+            with open(os.path.join(src_dir, "dialog.json"), "wb") as f:
+                f.write(data)
+
+            # 1. 추출
+            def extract(path, mode):
+                _, lines, error = logic._worker_extract((path, {"group_brackets": True}, None))
+                if error:
+                    raise RuntimeError(error)
+                return lines
+
+            (t_full, full), (t_mmap, windowed) = run_both(threshold, extract, src_path)
+            ok = full == windowed and not any(line.startswith("\ufeff") for line in windowed)
+            failed |= not ok
+            print(f"[{label} / {args.size_mb:g}MB] 추출 {len(windowed)}줄 - {'결과 동일' if ok else '!! 결과 불일치'}")
+            print(f"  전체 읽기 {t_full:7.2f}s / mmap 창 {t_mmap:7.2f}s")
+
+            # 2. 번역 적용 (TXT는 BOM 1개, JSON은 BOM 없이 저장되어야 함)
+            def apply(src, mode):
+                out_dir = os.path.join(tmp_dir, f"out_{int(bom)}_{mode}")
+                logs = []
+                logic.process_translate(src, out_dir, db_path, {"use_db_cache": False}, logs.append)
+                errors = [line for line in logs if line.startswith("!!")]
+                if errors:
+                    raise RuntimeError("\n".join(errors))
+                outputs = {}
+                for name in sorted(os.listdir(out_dir)):
+                    with open(os.path.join(out_dir, name), "rb") as f:
+                        outputs[name] = f.read()
+                return outputs
+
+            (t_full, full), (t_mmap, windowed) = run_both(threshold, apply, src_dir)
+            ok = full == windowed and bool(windowed)
+            ok = ok and windowed["dialog.txt"].startswith(codecs.BOM_UTF8) \
+                and not windowed["dialog.txt"][len(codecs.BOM_UTF8):].startswith(codecs.BOM_UTF8) \
+                and not windowed["dialog.json"].startswith(codecs.BOM_UTF8)
+            failed |= not ok
+            print(f"[{label} / {args.size_mb:g}MB] 번역 적용 (txt + json) - {'출력 동일' if ok else '!! 출력 불일치'}")
+            print(f"  전체 읽기 {t_full:7.2f}s / mmap 창 {t_mmap:7.2f}s")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
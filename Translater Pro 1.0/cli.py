@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Game Translator Pro - 명령줄(헤드리스) 실행기
+
+GUI(customtkinter) 없이 추출/적용/AI 번역/마스킹 단계를 실행합니다.
+빌드 서버나 여러 작업을 병렬로 돌리는 파이프라인에서 사용합니다.
+
+  - 로그     : 표준 출력(stdout)에 한 줄씩 바로 출력
+  - 진행률   : JSON Lines (기본 stderr, --progress로 변경)
+               {"event": "progress", "stage": "extract", "value": 0.42, "text": "..."}
+               {"event": "done", "stage": "extract", "status": "ok", "errors": 0, "elapsed": 1.23}
+  - 종료 코드: 0 성공 / 1 작업 중 오류('!!' 로그) / 2 인자 오류 / 3 입력 경로 없음 / 130 사용자 중단
+  - 중단     : extract/apply/ai 실행 중 Ctrl+C(SIGINT) 또는 SIGTERM을 받으면 진행 중인 일만 마치고
+               지금까지의 결과를 저장한 뒤 130으로 종료 (Ctrl+C를 한 번 더 누르면 즉시 중단)
+
+사용 예 (프로그램 폴더에서):
+    python cli.py extract  <원본폴더> <출력파일.txt> --glossary glossary.txt --mask
+    python cli.py apply    <원본폴더> <출력폴더> --db db.txt
+    python cli.py ai       <입력파일|폴더> <출력파일|폴더> --provider OPENAI --model gpt-4o-mini
+    python cli.py mask     <DB파일> --glossary glossary.txt --mode apply
+    python cli.py estimate <입력파일|폴더> --provider OPENAI --model gpt-4o-mini
+
+API 키는 --api-key 대신 환경 변수 TRANSLATOR_API_KEY로 전달할 수 있습니다 (프로세스 목록에 노출 방지).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2          # argparse 기본값과 동일
+EXIT_NOT_FOUND = 3
+EXIT_INTERRUPTED = 130
+
+API_KEY_ENV = "TRANSLATOR_API_KEY"
+
+
+# ==========================================
+# [출력] 로그/진행률 리포터
+# ==========================================
+class CliReporter:
+    """
+    logic 함수의 log_callback / progress_callback 자리에 넣는 출력기.
+    작업 스레드 여러 개에서 동시에 호출되어도 줄이 섞이지 않도록 잠금을 사용하며,
+    '!!'로 시작하는 로그 수를 세어 종료 코드 판단에 사용합니다.
+    진행률은 값(0.1% 단위)이나 상태 문구가 바뀔 때만 출력합니다.
+    """
+    def __init__(self, stage, progress_stream=None):
+        self.stage = stage
+        self.progress_stream = progress_stream
+        self.errors = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._last_progress = None
+
+    def log(self, msg):
+        msg = str(msg)
+        with self._lock:
+            if msg.startswith("!!"):
+                self.errors += 1
+            sys.stdout.write(msg + "\n")
+            sys.stdout.flush()
+
+    def progress(self, value, text=None):
+        if self.progress_stream is None:
+            return
+        try:
+            value = max(0.0, min(1.0, float(value)))
+        except (TypeError, ValueError):
+            return
+        key = (int(value * 1000), text)
+        with self._lock:
+            if key == self._last_progress:
+                return
+            self._last_progress = key
+            self._emit({"event": "progress", "stage": self.stage, "value": round(value, 4), "text": text})
+
+    def finish(self, exit_code):
+        status = "ok" if exit_code == EXIT_OK else ("interrupted" if exit_code == EXIT_INTERRUPTED else "error")
+        if self.progress_stream is not None:
+            with self._lock:
+                self._emit({
+                    "event": "done", "stage": self.stage, "status": status, "exit_code": exit_code,
+                    "errors": self.errors, "elapsed": round(time.perf_counter() - self.started, 3)
+                })
+
+    def _emit(self, event):
+        self.progress_stream.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.progress_stream.flush()
+
+
+# ==========================================
+# [옵션] 하위 명령별 인자 -> logic 옵션 딕셔너리 (GUI 기본값과 동일)
+# ==========================================
+def _add_scan_arguments(parser):
+    group = parser.add_argument_group("파일 탐색")
+    group.add_argument("--no-recursive", dest="recursive", action="store_false", help="하위 폴더를 탐색하지 않음")
+    group.add_argument("--include", action="append", default=[], metavar="PATTERN",
+                       help="포함할 파일 패턴 (여러 번 지정 가능, ';'로 구분 가능)")
+    group.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                       help="제외할 파일/폴더 패턴 (여러 번 지정 가능, ';'로 구분 가능)")
+
+
+def _scan_options(args):
+    return {
+        'recursive': args.recursive,
+        'include_patterns': ";".join(args.include),
+        'exclude_patterns': ";".join(args.exclude)
+    }
+
+
+def _extract_options(args):
+    options = {
+        'group_brackets': args.group_brackets,
+        'extract_masking': args.mask,
+        'glossary_path': args.glossary or ""
+    }
+    options.update(_scan_options(args))
+    return options
+
+
+def _apply_options(args):
+    options = {
+        'smart_mode': args.smart_mode,
+        'smart_save': args.smart_save,
+        'smart_header': args.smart_header,
+        'smart_special': args.smart_special,
+        'safe_english': args.safe_english,
+        'use_process_pool': args.process_pool,
+        'incremental': args.incremental,
+        'newline_key': args.newline_key, 'space_key': args.space_key,
+        'tag_pattern': args.tag_pattern, 'db_format': args.db_format,
+        'newline_val': args.newline_val, 'space_val': args.space_val
+    }
+    options.update(_scan_options(args))
+    return options
+
+
+def _ai_options(args):
+    import logic_ai
+
+    if args.prompt_file:
+        with open(args.prompt_file, "r", encoding="utf-8") as f:
+            system_prompt = f.read()
+    else:
+        system_prompt = logic_ai.DEFAULT_PROMPT
+
+    options = {
+        'provider': args.provider, 'api_key': args.api_key or os.environ.get(API_KEY_ENV, ""),
+        'model': args.model, 'glossary_path': args.glossary or "", 'system_prompt': system_prompt,
+        'chunk_size': args.chunk_size, 'temperature': args.temperature,
+        'adaptive_chunk': args.adaptive_chunk, 'chunk_tokens': args.chunk_tokens,
+        'force_json': args.force_json,
+        'rate_rpm': args.rpm, 'rate_tpm': args.tpm,
+        'max_concurrency': args.concurrency,
+        'auto_restore': args.auto_restore, 'auto_mask': args.auto_mask,
+        'use_tm': args.use_tm, 'resume': args.resume,
+        'batch_mode': args.batch
+    }
+    if args.api_base_url:
+        options['api_base_url'] = args.api_base_url
+    if args.tm_path:
+        options['tm_path'] = args.tm_path
+    options.update(_scan_options(args))
+    return options
+
+
+# ==========================================
+# [실행] 하위 명령
+# ==========================================
+def cmd_extract(args, reporter, control):
+    import logic
+    logic.process_extract(args.src, args.output, _extract_options(args), reporter.log, reporter.progress, control)
+
+
+def cmd_apply(args, reporter, control):
+    import logic
+    logic.process_translate(args.src, args.out_dir, args.db, _apply_options(args), reporter.log, reporter.progress, control)
+
+
+def cmd_ai(args, reporter, control):
+    import logic_ai
+    options = _ai_options(args)
+    if not options['api_key']:
+        reporter.log(f"!! API 키가 없습니다. --api-key 또는 환경 변수 {API_KEY_ENV}를 지정하세요.")
+        return
+    logic_ai.process_ai_translation(args.input, args.output, options, reporter.log, reporter.progress, control)
+
+
+def cmd_mask(args, reporter, control=None):
+    import logic
+    options = {'parallel': args.parallel}
+    if args.workers:
+        options['workers'] = args.workers
+    logic.process_db_masking(args.db, args.glossary, args.mode, reporter.log, options)
+
+
+def cmd_estimate(args, reporter, control=None):
+    import logic_ai
+    options = dict(_scan_options(args), chunk_tokens=args.chunk_tokens)
+    logic_ai.process_cost_estimation(args.input, args.provider, args.model, reporter.log, options)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--progress", choices=("stderr", "stdout", "none"), default="stderr",
+                        help="진행률(JSON Lines) 출력 위치 (기본: stderr)")
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+    sub.required = True
+
+    # 1. 추출
+    p = sub.add_parser("extract", help="원본 파일에서 번역 대상 문장 추출")
+    p.add_argument("src", help="원본 폴더")
+    p.add_argument("output", help="추출 결과 파일 (.txt)")
+    p.add_argument("--no-group-brackets", dest="group_brackets", action="store_false", help="괄호 묶음 추출 끄기")
+    p.add_argument("--mask", action="store_true", help="추출 시 용어집 마스킹 적용")
+    p.add_argument("--glossary", help="용어집 파일")
+    _add_scan_arguments(p)
+    p.set_defaults(func=cmd_extract, inputs=("src",), cancellable=True)
+
+    # 2. 게임 적용
+    p = sub.add_parser("apply", help="번역 DB를 원본 파일에 적용")
+    p.add_argument("src", help="원본 폴더")
+    p.add_argument("out_dir", help="적용 결과 폴더")
+    p.add_argument("--db", required=True, help="번역 DB 파일")
+    p.add_argument("--no-smart-mode", dest="smart_mode", action="store_false", help="스마트 모드 끄기")
+    p.add_argument("--no-smart-save", dest="smart_save", action="store_false", help="변경된 파일만 저장 끄기")
+    p.add_argument("--no-smart-header", dest="smart_header", action="store_false", help="헤더 보호 끄기")
+    p.add_argument("--no-smart-special", dest="smart_special", action="store_false", help="특수문자 처리 끄기")
+    p.add_argument("--safe-english", action="store_true", help="영문 안전 모드")
+    p.add_argument("--no-process-pool", dest="process_pool", action="store_false", help="멀티프로세스 대신 스레드 사용")
+    p.add_argument("--no-incremental", dest="incremental", action="store_false", help="증분 적용 끄기 (전체 재처리)")
+    p.add_argument("--newline-key", default="\\n", help="DB 키의 줄바꿈 표기 (기본: \\n)")
+    p.add_argument("--space-key", default=" ", help="DB 키의 공백 표기 (기본: 공백)")
+    p.add_argument("--newline-val", default="[ENTER]", help="DB 값의 줄바꿈 표기 (기본: [ENTER])")
+    p.add_argument("--space-val", default="[NBSP]", help="DB 값의 공백 표기 (기본: [NBSP])")
+    p.add_argument("--tag-pattern", default="", help="보호할 태그 정규식")
+    p.add_argument("--db-format", default="자동감지 (Auto)", help="DB 형식 (기본: 자동감지)")
+    _add_scan_arguments(p)
+    p.set_defaults(func=cmd_apply, inputs=("src", "db"), cancellable=True)
+
+    # 3. AI 번역
+    p = sub.add_parser("ai", help="AI 번역")
+    p.add_argument("input", help="입력 파일 또는 폴더")
+    p.add_argument("output", help="출력 파일(확장자 있음) 또는 폴더")
+    p.add_argument("--provider", default="OPENAI", choices=("OPENAI", "ANTHROPIC", "GOOGLE", "DEEPL"))
+    p.add_argument("--model", default="gpt-4o-mini")
+    p.add_argument("--api-key", help=f"API 키 (생략 시 환경 변수 {API_KEY_ENV})")
+    p.add_argument("--api-base-url", help="OpenAI 호환 서버 주소")
+    p.add_argument("--glossary", help="용어집 파일")
+    p.add_argument("--prompt-file", help="시스템 프롬프트 파일 (생략 시 기본 프롬프트)")
+    p.add_argument("--chunk-tokens", type=int, default=0, help="청크 1개의 입력 토큰 예산 (0 = 공급자/모델 기본값)")
+    p.add_argument("--fixed-chunk", dest="adaptive_chunk", action="store_false",
+                   help="토큰 예산 대신 --chunk-size 줄 수로 청크 구성")
+    p.add_argument("--chunk-size", type=int, default=15, help="고정 청크의 줄 수 (--fixed-chunk 사용 시)")
+    p.add_argument("--temperature", type=float, default=0.1)
+    p.add_argument("--no-force-json", dest="force_json", action="store_false", help="JSON 응답 강제 끄기")
+    p.add_argument("--rpm", type=int, default=0, help="분당 요청 수 제한 (0 = 공급자 기본값)")
+    p.add_argument("--tpm", type=int, default=0, help="분당 토큰 수 제한 (0 = 공급자 기본값)")
+    p.add_argument("--concurrency", type=int, default=4, help="동시 요청 수")
+    p.add_argument("--no-auto-mask", dest="auto_mask", action="store_false", help="용어집 자동 마스킹 끄기")
+    p.add_argument("--no-auto-restore", dest="auto_restore", action="store_false", help="마스킹 자동 복원 끄기")
+    p.add_argument("--no-tm", dest="use_tm", action="store_false", help="번역 메모리 사용 안 함")
+    p.add_argument("--tm-path", help="번역 메모리 파일 경로")
+    p.add_argument("--no-resume", dest="resume", action="store_false", help="이어하기 기록 사용 안 함")
+    p.add_argument("--batch", action="store_true", help="배치 API 사용")
+    _add_scan_arguments(p)
+    p.set_defaults(func=cmd_ai, inputs=("input",), cancellable=True)
+
+    # 4. DB 마스킹
+    p = sub.add_parser("mask", help="번역 DB 용어집 마스킹 적용/해제")
+    p.add_argument("db", help="대상 DB 파일")
+    p.add_argument("--glossary", required=True, help="용어집 파일")
+    p.add_argument("--mode", choices=("apply", "restore"), default="apply", help="apply: 마스킹 / restore: 해제")
+    p.add_argument("--parallel", action="store_true", help="대용량 DB 병렬 처리")
+    p.add_argument("--workers", type=int, default=0, help="병렬 처리 프로세스 수 (0 = 자동)")
+    p.set_defaults(func=cmd_mask, inputs=("db", "glossary"), cancellable=False)
+
+    # 5. 비용 산출
+    p = sub.add_parser("estimate", help="AI 번역 예상 비용 산출")
+    p.add_argument("input", help="입력 파일 또는 폴더")
+    p.add_argument("--provider", default="OPENAI", choices=("OPENAI", "ANTHROPIC", "GOOGLE", "DEEPL"))
+    p.add_argument("--model", default="gpt-4o-mini")
+    p.add_argument("--chunk-tokens", type=int, default=0, help="청크 1개의 입력 토큰 예산 (요청 수/시간 추정용, 0 = 기본값)")
+    _add_scan_arguments(p)
+    p.set_defaults(func=cmd_estimate, inputs=("input",), cancellable=False)
+
+    return parser
+
+
+def _install_stop_handlers(control, reporter):
+    """
+    첫 SIGINT/SIGTERM은 작업에 취소를 요청하고(정상 마무리), 두 번째 SIGINT는 기본 동작(KeyboardInterrupt)
+    """
+    def _handler(signum, frame):
+        if control.cancelled:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            raise KeyboardInterrupt
+        reporter.log(">> 중단 요청: 진행 중인 작업을 마무리하고 지금까지의 결과를 저장합니다... (강제 종료: Ctrl+C)")
+        control.cancel()
+
+    signal.signal(signal.SIGINT, _handler)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, _handler)
+
+
+def main(argv=None):
+    # Windows 콘솔(cp949 등)에서 출력할 수 없는 문자로 작업이 중단되지 않도록
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, "reconfigure"):
+            stream.reconfigure(errors="backslashreplace")
+
+    args = build_parser().parse_args(argv)
+    progress_stream = {"stderr": sys.stderr, "stdout": sys.stdout}.get(args.progress)
+    reporter = CliReporter(args.command, progress_stream)
+
+    missing = [getattr(args, name) for name in args.inputs if not os.path.exists(getattr(args, name))]
+    if missing:
+        for path in missing:
+            reporter.log(f"!! 경로가 존재하지 않습니다: {path}")
+        reporter.finish(EXIT_NOT_FOUND)
+        return EXIT_NOT_FOUND
+
+    control = None
+    if args.cancellable and threading.current_thread() is threading.main_thread():
+        import utils
+        control = utils.JobControl()
+        _install_stop_handlers(control, reporter)
+
+    try:
+        args.func(args, reporter, control)
+        if control is not None and control.cancelled:
+            exit_code = EXIT_INTERRUPTED
+        else:
+            exit_code = EXIT_FAILED if reporter.errors else EXIT_OK
+    except KeyboardInterrupt:
+        reporter.log("!! 사용자에 의해 중단되었습니다.")
+        exit_code = EXIT_INTERRUPTED
+    except Exception as e:
+        reporter.log(f"!! Error: {e}")
+        exit_code = EXIT_FAILED
+
+    reporter.finish(exit_code)
+    return exit_code
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
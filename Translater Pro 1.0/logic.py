@@ -1,9 +1,19 @@
 import os
 import re
+import io
+import mmap
+import stat
+import codecs
 import json  
+import pickle
+import hashlib
+import tempfile
+import shutil
 import utils 
 import concurrent.futures 
+import collections
 import time
+from matcher import KeywordMatcher, normalize_key
 
 # ==========================================
 # 상수 및 정규식 정의 (공통 사용)
@@ -11,6 +21,11 @@ import time
 JAPANESE_REGEX_WIDE = re.compile(r'[\u3000-\u303f\u3040-\u309f\u30a0-\u30ff\uff00-\uffef\u4e00-\u9faf\u3400-\u4dbf]')
 BRACKET_REGEX = re.compile(r'(「[^」]+」|『[^』]+』)')
 CHUNK_REGEX = re.compile(r'[^\x00-\x1f]+')
+# [토크나이저] 괄호 그룹(1번 그룹) 또는 청크 구분자(제어문자)를 한 번의 스캔으로 찾음
+EXTRACT_TOKEN_REGEX = re.compile(r'(「[^」]+」|『[^』]+』)|[\x00-\x1f]+')
+CHUNK_SEPARATOR_REGEX = re.compile(r'[\x00-\x1f]+')
+# 추출 전 제거하는 제어문자 (\n, \r 제외)
+CONTROL_CHAR_REGEX = re.compile(r'[\x00-\x09\x0b\x0c\x0e-\x1f\x7f]')
 
 # [추가] 정제 규칙 (Cleaning Rules)
 # 패턴에 매칭되면, 해당 그룹(괄호 안의 내용)만 추출해서 사용합니다.
@@ -29,26 +44,16 @@ CLEANING_RULES = [
 # 즉, 숫자(0-9)나 특수문자(▶, =, <=)만 있는 경우를 거르기 위함입니다.
 VALID_CHAR_REGEX = re.compile(r'[a-zA-Z\u3040-\u30ff\u4e00-\u9faf\u3400-\u4dbf\uac00-\ud7a3]')
 
+# [스트리밍 추출] 워커당 미리 제출해 둘 파일 수 (결과 대기열 크기 제한)
+EXTRACT_WINDOW_PER_WORKER = 4
+
+# [대용량 파일] 이 크기 이상이면 전체를 읽지 않고 mmap 창 단위로 처리
+MMAP_THRESHOLD_BYTES = 64 * 1024 * 1024
+MMAP_WINDOW_BYTES = 8 * 1024 * 1024
+
 # ==========================================
 # 내부 헬퍼 함수
 # ==========================================
-def _get_glossary_map(masking_data):
-    """
-    리스트 형태의 masking_data를 받아 검색용 패턴과 매핑 정보를 반환
-    """
-    if not masking_data:
-        return None, None
-        
-    # 긴 단어부터 매칭되도록 정렬 (utils에서 이미 정렬되지만 안전장치)
-    sorted_data = sorted(masking_data, key=lambda x: len(x['src']), reverse=True)
-    
-    if not sorted_data:
-        return None, None
-
-    # 정규식 패턴 생성
-    pattern = re.compile('|'.join(re.escape(item['src']) for item in sorted_data))
-    return pattern, sorted_data
-
     # [추가] 청크 정제 함수
 def clean_extracted_chunk(text):
     """
@@ -71,141 +76,436 @@ def clean_extracted_chunk(text):
     return text
 
 # ==========================================
-# [Worker] 개별 파일 추출 작업
+# [Helper] 추출용 단일 패스 토크나이저
 # ==========================================
-def _worker_extract(args):
-    path, options, masking_data, glossary_pattern = args
-    found_lines = []
+def _tokenize_extract(text, group_brackets):
+    """
+    텍스트를 한 번만 스캔하여 (괄호 그룹 목록, 일반 청크 목록)을 반환합니다.
+    괄호 그룹을 제거한 뒤 남은 텍스트를 CHUNK_REGEX로 나눈 결과와 동일하며,
+    괄호 앞뒤의 텍스트는 (기존처럼) 하나의 청크로 이어집니다.
+    """
+    result = _scan_extract_tokens(text, group_brackets)
+    if result is None:
+        return _tokenize_extract_legacy(text)
+    return result[0], result[1]
+
+def _scan_extract_tokens(text, group_brackets, final=True):
+    """
+    _tokenize_extract의 본체. (괄호 목록, 청크 목록, 다음 시작 위치)를 반환합니다.
+    - final=False (대용량 파일의 창 단위 처리): 창 끝에서 잘렸을 수 있는 부분(닫히지 않은 괄호, 마지막 청크)은
+      제외하고, 결과가 전체 읽기와 같아지는 구분자('\n') 위치까지만 반환. 그런 위치가 없으면 cut=None
+    - 괄호 안에 여는 괄호가 또 있으면(「a「b」, 『a「b」c』) 기존 replace 방식의 결과가 달라질 수 있으므로 None 반환
+    """
+    token_regex = EXTRACT_TOKEN_REGEX if group_brackets else CHUNK_SEPARATOR_REGEX
+    brackets = []
+    chunks = []
+    carry = []  # 괄호를 건너뛰며 이어 붙는 현재 청크 조각
+    last = 0
+    cut, snapshot = None, (0, 0)
+
+    # [창 단위] 창 안에서 닫히지 않은 첫 여는 괄호 (마지막 닫는 괄호 뒤의 여는 괄호)
+    # -> 창 밖에서 닫힐 수 있으므로 여기서부터는 다음 창에서 처리
+    open_pos = len(text)
+    if not final and group_brackets:
+        for opener, closer in (('「', '」'), ('『', '』')):
+            i = text.find(opener, text.rfind(closer) + 1)
+            if i != -1:
+                open_pos = min(open_pos, i)
+
+    for m in token_regex.finditer(text):
+        start = m.start()
+        if start > open_pos:
+            break
+        if start > last:
+            carry.append(text[last:start])
+        last = m.end()
+
+        b = m.group(1) if m.lastindex else None
+        if b is not None:
+            if '「' in b[1:] or '『' in b[1:]:
+                return None
+            brackets.append(b)
+        else:
+            if carry:
+                chunks.append("".join(carry))
+                carry = []
+            if not final and last < len(text):
+                nl = text.find('\n', max(start, 1), last)
+                if nl != -1:
+                    cut, snapshot = nl, (len(brackets), len(chunks))
+
+    if not final:
+        return brackets[:snapshot[0]], chunks[:snapshot[1]], cut
+
+    if last < len(text):
+        carry.append(text[last:])
+    if carry:
+        chunks.append("".join(carry))
+    return brackets, chunks, len(text)
+
+def _tokenize_extract_legacy(text):
+    """기존 방식 (괄호마다 전체 텍스트 replace). 중첩 괄호처럼 드문 경우의 결과 호환용"""
+    brackets = BRACKET_REGEX.findall(text)
+    for b in brackets:
+        text = text.replace(b, "")
+    return brackets, CHUNK_REGEX.findall(text)
+
+# ==========================================
+# [Helper] 대용량 파일 창(window) 단위 읽기 (mmap)
+# ==========================================
+class _WindowFallback(Exception):
+    """창 단위 처리로는 전체 읽기와 같은 결과를 보장할 수 없음 (UTF-8 아님, 중첩 괄호 등)"""
+
+def _content_start(mm):
+    """UTF-8 BOM 다음 위치 (전체 읽기 경로의 decode_bytes처럼 BOM은 본문에서 제외)"""
+    return len(codecs.BOM_UTF8) if mm[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+
+def _read_window(mm, start, window_bytes):
+    """start부터 약 window_bytes만큼, 줄 경계('\n' 다음)에서 끝나는 구간을 UTF-8로 디코딩"""
+    size = len(mm)
+    end = min(size, start + window_bytes)
+    if end < size:
+        nl = mm.find(b'\n', end)
+        end = size if nl == -1 else nl + 1
     try:
-        try:
-            with open(path, 'r', encoding='utf-8') as f: text = f.read()
-        except UnicodeDecodeError:
-            enc = utils.detect_encoding(path)
-            with open(path, 'r', encoding=enc, errors='replace') as f: text = f.read()
+        return mm[start:end].decode('utf-8'), end
+    except UnicodeDecodeError:
+        raise _WindowFallback("not utf-8")
 
-        clean = re.sub(r'[\x00-\x09\x0b\x0c\x0e-\x1f\x7f]', '', text)
+def _iter_extract_tokens_mmap(path, group_brackets, window_bytes=None):
+    """
+    파일을 mmap으로 열어 창 단위로 (괄호 목록, 청크 목록)을 생성합니다.
+    모든 창의 결과를 이어 붙이면 _tokenize_extract(전체 텍스트)와 동일합니다.
+    """
+    window_bytes = window_bytes or MMAP_WINDOW_BYTES
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        pos = _content_start(mm)
+        win = window_bytes
+        while pos < size:
+            text, end = _read_window(mm, pos, win)
+            # 텍스트 모드 읽기(universal newline)와 동일하게 줄바꿈 통일
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+            clean = CONTROL_CHAR_REGEX.sub('', text)
 
-        # 1. 괄호 문자 우선 처리
-        if options.get('group_brackets'):
-            for b in BRACKET_REGEX.findall(clean):
-                processed_b = b
-                
-                # 정제 로직
-                processed_b = clean_extracted_chunk(processed_b)
-
-                # 마스킹 적용
-                if options.get('extract_masking') and glossary_pattern:
-                    def mask_cb(m):
-                        word = m.group(0)
-                        for idx, item in enumerate(masking_data):
-                            if item['src'] == word:
-                                return f"__MASK_{idx:03d}__"
-                        return word
-                    processed_b = glossary_pattern.sub(mask_cb, processed_b)
-                
-                if processed_b:
-                    found_lines.append(processed_b)
-                
-                clean = clean.replace(b, "") 
+            result = _scan_extract_tokens(clean, group_brackets, final=(end == size))
+            if result is None:
+                raise _WindowFallback("nested brackets")
+            brackets, chunks, cut = result
 
-        # 2. 일반 텍스트 청크 처리
-        for m in CHUNK_REGEX.finditer(clean):
-            chunk = m.group().strip()
-            
-            # [정제 수행]
-            cleaned_chunk = clean_extracted_chunk(chunk)
-            
-            if not cleaned_chunk:
+            if end == size:
+                yield brackets, chunks
+                return
+            if cut is None:
+                win *= 2  # 안전한 경계가 없음 (아주 긴 괄호/줄) -> 창 확장
                 continue
 
-            # [신뢰도 판단] 정제 과정에서 껍데기가 벗겨졌다면 -> 의도된 텍스트 (신뢰도 높음)
-            is_high_confidence = (cleaned_chunk != chunk)
+            yield brackets, chunks
+            # cut('\n')에 해당하는 원본 바이트 위치: 뒤에서부터 같은 개수의 줄바꿈을 거슬러 올라감
+            pos = _rfind_newlines(mm, pos, end, clean.count('\n', cut))
+            win = window_bytes
+
+def _rfind_newlines(mm, lo, hi, count):
+    """[lo, hi) 구간 끝에서부터 줄바꿈(\r\n, \n, \r 각각 1개)을 count개 거슬러 올라간 위치"""
+    pos = hi
+    for _ in range(count):
+        pos = max(mm.rfind(b'\n', lo, pos), mm.rfind(b'\r', lo, pos))
+        if pos > lo and mm[pos] == 0x0A and mm[pos - 1] == 0x0D:
+            pos -= 1
+    return pos
 
-            # [핵심 수정] 검증을 위한 임시 텍스트 생성
-            # \n, \r 같은 이스케이프 문자는 '문자'가 아니라 '서식'으로 취급하여 제거하고 판단합니다.
-            # 이렇게 하면 "002\n"에서 "\n"이 사라져 "002"만 남게 되므로, 문자(n)가 있다고 착각하지 않습니다.
-            validation_text = cleaned_chunk.replace(r'\n', '').replace(r'\r', '')
+def _iter_match_windows_mmap(mm, matcher, window_bytes=None):
+    """
+    mmap 파일을 창 단위로 디코딩하여 (창 텍스트, 구간 시작, 구간 끝, 매칭 목록)을 생성합니다.
+    - 각 구간을 순서대로 이어 붙이면 파일 전체가 되며, 매칭 결과는 전체를 한 번에 검색한 것과 동일
+    - 창 끝에서 잘릴 수 있는 매칭을 피하기 위해, 창의 마지막 (최대 키 줄바꿈 수 + 2)줄 안에서 시작하는
+      매칭은 다음 창에서 처리 (다음 창은 한 줄 앞에서 시작하여 가드/줄바꿈 정규화 문맥을 유지)
+    """
+    window_bytes = window_bytes or MMAP_WINDOW_BYTES
+    size = len(mm)
+    margin = matcher.max_newlines + 2
+    start_b = _content_start(mm)
+    scan_pos = 0
+    win = window_bytes
 
-            has_japanese = JAPANESE_REGEX_WIDE.search(validation_text)
-            has_valid_char = VALID_CHAR_REGEX.search(validation_text)
+    while True:
+        text, end_b = _read_window(mm, start_b, win)
+        at_eof = (end_b == size)
 
-            # [저장 조건]
-            # 1. 신뢰도가 높은 경우 (m_Text 등)
-            #    -> 이스케이프(\n)를 뺀 나머지 부분에 유효 문자(알파벳/한글/한자)가 있어야 함
-            if is_high_confidence:
-                if has_valid_char:
-                    found_lines.append(cleaned_chunk)
-            
-            # 2. 일반 텍스트인 경우
-            #    -> 일본어 포함 & 2글자 이상 (검증 텍스트 기준)
-            elif has_japanese and len(validation_text) > 1:
-                found_lines.append(cleaned_chunk)
-                
-        return path, found_lines, None
+        limit = len(text)
+        if not at_eof:
+            # 창 끝에서 margin줄 앞의 줄 시작 위치
+            limit -= 1
+            for _ in range(margin):
+                limit = text.rfind('\n', 0, limit)
+                if limit == -1: break
+            limit += 1
+            if limit <= scan_pos:
+                win *= 2  # 줄이 너무 길어 안전한 경계가 없음 -> 창 확장
+                continue
+
+        matches = []
+        region_end = limit
+        for start, end, key in matcher.finditer(text, scan_pos):
+            if start >= limit: break
+            matches.append((start, end, key))
+            region_end = max(limit, end)
+
+        yield text, scan_pos, region_end, matches
+        if at_eof: return
+
+        # 다음 창: region_end가 속한 줄의 한 줄 앞에서 시작
+        nl = text.rfind('\n', 0, region_end)
+        line_start = text.rfind('\n', 0, nl) + 1 if nl > 0 else 0
+        start_b = end_b - len(text[line_start:].encode('utf-8'))
+        scan_pos = region_end - line_start
+        win = window_bytes
+
+def _apply_file_mmap(path, out_path, matcher, replace_cb, is_json_ext, is_smart_save, probe_matcher=None, want_hash=False):
+    """
+    대용량 파일을 mmap 창 단위로 치환하여 저장합니다. (전체 읽기 경로와 동일한 출력)
+    :return: (치환 횟수, sha256 또는 None, 저장 여부) / 프로브 결과 새 키가 없으면 None
+    :raises _WindowFallback: UTF-8이 아닌 파일 -> 호출 측에서 전체 읽기로 처리
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # [증분 모드] 내용이 그대로인 파일은 새 DB 키가 등장할 때만 처리
+        if probe_matcher is not None:
+            if not any(matches for _, _, _, matches in _iter_match_windows_mmap(mm, probe_matcher)):
+                return None
+
+        file_hash = hashlib.sha256(mm).hexdigest() if want_hash else None
+        head = mm[:4]
+
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        tmp_path = out_path + ".tmp"
+        changed_count = 0
+        out_len = 0
+        try:
+            with open(tmp_path, 'wb') as out_f:
+                # TXT/DAT 파일: 한글 인식을 위해 BOM(서명) 추가 / JSON: 순수 UTF-8
+                if not is_json_ext:
+                    out_f.write(codecs.BOM_UTF8)
+                    out_len += len(codecs.BOM_UTF8)
+
+                for text, start, end, matches in _iter_match_windows_mmap(mm, matcher):
+                    pieces = []
+                    last = start
+                    for m_start, m_end, key in matches:
+                        pieces.append(text[last:m_start])
+                        pieces.append(replace_cb(key, text[m_start:m_end]))
+                        last = m_end
+                    pieces.append(text[last:end])
+                    changed_count += len(matches)
+
+                    data = "".join(pieces).encode('utf-8')
+                    out_f.write(data)
+                    out_len += len(data)
+
+                # [헤더 보호 로직] 바이너리 헤더(앞 4바이트)가 있는 TXT/DAT 파일
+                if len(mm) >= 4 and out_len >= 4 and not is_json_ext and (head[0] == 0 or head[1] == 0):
+                    out_f.seek(0)
+                    out_f.write(head)
+        except BaseException:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            raise
+
+    if is_smart_save and changed_count == 0:
+        os.remove(tmp_path)
+        return changed_count, file_hash, False
+
+    os.replace(tmp_path, out_path)
+    return changed_count, file_hash, True
+
+# ==========================================
+# [Worker] 개별 파일 추출 작업
+# ==========================================
+def _worker_extract(args):
+    path, options, glossary_index = args
+    group_brackets = options.get('group_brackets')
+    bracket_lines = []
+    chunk_lines = []
+    try:
+        # 대용량 파일: 전체를 읽지 않고 mmap 창 단위로 처리 (결과 동일, 메모리 사용량 제한)
+        if os.path.getsize(path) >= max(MMAP_THRESHOLD_BYTES, 1):
+            try:
+                for brackets, chunks in _iter_extract_tokens_mmap(path, group_brackets):
+                    _collect_extract_lines(brackets, chunks, options, glossary_index, bracket_lines, chunk_lines)
+                return path, bracket_lines + chunk_lines, None
+            except _WindowFallback:
+                bracket_lines, chunk_lines = [], []
+
+        with open(path, 'rb') as f: raw_bytes = f.read()
+        text, _ = utils.decode_bytes(raw_bytes, path)
+        text = text.replace('\r\n', '\n').replace('\r', '\n')  # 텍스트 모드 읽기와 동일하게 줄바꿈 통일
+
+        clean = CONTROL_CHAR_REGEX.sub('', text)
+        brackets, chunks = _tokenize_extract(clean, group_brackets)
+        _collect_extract_lines(brackets, chunks, options, glossary_index, bracket_lines, chunk_lines)
+        return path, bracket_lines + chunk_lines, None
 
     except Exception as e:
         return path, [], str(e)
 
+def _collect_extract_lines(brackets, chunks, options, glossary_index, bracket_lines, chunk_lines):
+    """토큰(괄호/청크)을 정제·필터링하여 괄호 결과와 청크 결과 목록에 추가 (괄호 결과가 먼저 기록됨)"""
+    # 1. 괄호 문자 우선 처리
+    for b in brackets:
+        processed_b = b
+        
+        # 정제 로직
+        processed_b = clean_extracted_chunk(processed_b)
+
+        # 마스킹 적용 (DB 마스킹/AI 번역과 같은 __MSK_xxxx__ ID 사용)
+        if options.get('extract_masking') and glossary_index:
+            processed_b = glossary_index.mask_text(processed_b)
+        
+        if processed_b:
+            bracket_lines.append(processed_b)
+
+    # 2. 일반 텍스트 청크 처리
+    for chunk in chunks:
+        chunk = chunk.strip()
+        
+        # [정제 수행]
+        cleaned_chunk = clean_extracted_chunk(chunk)
+        
+        if not cleaned_chunk:
+            continue
+
+        # [신뢰도 판단] 정제 과정에서 껍데기가 벗겨졌다면 -> 의도된 텍스트 (신뢰도 높음)
+        is_high_confidence = (cleaned_chunk != chunk)
+
+        # [핵심 수정] 검증을 위한 임시 텍스트 생성
+        # \n, \r 같은 이스케이프 문자는 '문자'가 아니라 '서식'으로 취급하여 제거하고 판단합니다.
+        # 이렇게 하면 "002\n"에서 "\n"이 사라져 "002"만 남게 되므로, 문자(n)가 있다고 착각하지 않습니다.
+        validation_text = cleaned_chunk.replace(r'\n', '').replace(r'\r', '')
+
+        has_japanese = JAPANESE_REGEX_WIDE.search(validation_text)
+        has_valid_char = VALID_CHAR_REGEX.search(validation_text)
+
+        # [저장 조건]
+        # 1. 신뢰도가 높은 경우 (m_Text 등)
+        #    -> 이스케이프(\n)를 뺀 나머지 부분에 유효 문자(알파벳/한글/한자)가 있어야 함
+        if is_high_confidence:
+            if has_valid_char:
+                chunk_lines.append(cleaned_chunk)
+        
+        # 2. 일반 텍스트인 경우
+        #    -> 일본어 포함 & 2글자 이상 (검증 텍스트 기준)
+        elif has_japanese and len(validation_text) > 1:
+            chunk_lines.append(cleaned_chunk)
+
 # ==========================================
 # 1. 텍스트 추출 로직 (Process Extract)
 # ==========================================
-def process_extract(src_dir, out_path_or_dir, options, log_callback, progress_callback=None):
+def process_extract(src_dir, out_path_or_dir, options, log_callback, progress_callback=None, control=None):
+    """
+    :param control: utils.JobControl (선택). 일시정지 중에는 결과 기록을 멈추고, 취소되면 대기 중인
+                    파일은 건너뛴 채 지금까지 기록한 내용을 저장하고 종료합니다.
+    """
     if not src_dir or not out_path_or_dir:
         log_callback("!! 경로를 지정해주세요.")
         return
 
     log_callback("=== 추출 작업 시작 (멀티스레딩/스마트 정제) ===")
     
-    masking_data = utils.load_glossary_data(options.get('glossary_path'))
-    glossary_pattern = None
-    
-    if options.get('extract_masking') and masking_data:
-        glossary_pattern, _ = _get_glossary_map(masking_data)
-        log_callback(f">> 용어집 마스킹 활성화: {len(masking_data)}개 항목")
+    glossary_index = None
+    if options.get('extract_masking'):
+        masking_data = utils.load_glossary_data(options.get('glossary_path'))
+        if masking_data:
+            glossary_index = utils.GlossaryIndex(masking_data)
+            log_callback(f">> 용어집 마스킹 활성화: {len(masking_data)}개 항목")
 
-    extracted_lines = []
-    extracted_set = set()
-    
-    files = [f for f in os.listdir(src_dir) if f.lower().endswith(('.txt', '.json', '.dat'))]
-    total_files = len(files)
+    save_path = out_path_or_dir
+    if os.path.isdir(save_path):
+        save_path = os.path.join(save_path, "_EXTRACTED_DB.txt")
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = []
-        for fname in files:
-            path = os.path.join(src_dir, fname)
-            args = (path, options, masking_data, glossary_pattern)
-            futures.append(executor.submit(_worker_extract, args))
+    # [탐색] 폴더를 도는 동안 찾은 파일부터 바로 제출 (전체 개수는 탐색이 끝나야 확정)
+    # 원본 폴더 안에 저장하는 경우 결과 폴더와 기록 중인 결과 파일은 다시 추출하지 않음
+    save_key = os.path.normcase(os.path.abspath(save_path))
+    file_iter = (
+        rel for rel in utils.iter_stage_files(src_dir, utils.EXTRACT_EXTENSIONS, options,
+                                              skip_dirs=[os.path.dirname(save_key)])
+        if os.path.normcase(os.path.abspath(os.path.join(src_dir, rel))) != save_key
+    )
+    discovered = 0
+    walk_done = False
 
-        for idx, future in enumerate(concurrent.futures.as_completed(futures)):
-            path, lines, error = future.result()
-            fname = os.path.basename(path)
+    # [스트리밍] 파일 순서대로 결과를 받아 중복 제거 후 즉시 기록
+    # - 제출은 최대 window개까지만 앞서 나가므로 대기 중인 결과(메모리)가 제한됨
+    # - 중복 판정은 문자열 대신 16바이트 해시만 보관
+    max_workers = min(32, (os.cpu_count() or 1) + 4)
+    window = max_workers * EXTRACT_WINDOW_PER_WORKER
+    extracted_seen = set()
+    extracted_count = 0
+    stopped = False
 
-            if error:
-                log_callback(f"!! {fname} 읽기 실패: {error}")
-            else:
-                for line in lines:
-                    if line not in extracted_set:
-                        extracted_set.add(line)
-                        extracted_lines.append(line)
+    try:
+        with open(save_path, 'w', encoding='utf-8') as out_f, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = collections.deque()
 
-            if (idx + 1) % 100 == 0:
-                log_callback(f">> [분석] ({idx + 1}/{total_files}) 완료")
-            
-            if progress_callback and total_files > 0:
-                progress_callback((idx + 1) / total_files, fname)
+            def _submit_next():
+                nonlocal discovered, walk_done
+                rel_path = next(file_iter, None)
+                if rel_path is None:
+                    walk_done = True
+                    return False
+                discovered += 1
+                args = (os.path.join(src_dir, rel_path), options, glossary_index)
+                pending.append(executor.submit(_worker_extract, args))
+                return True
 
-    save_path = out_path_or_dir
-    if os.path.isdir(save_path):
-        save_path = os.path.join(save_path, "_EXTRACTED_DB.txt")
+            while len(pending) < window and _submit_next():
+                pass
 
-    try:
-        with open(save_path, 'w', encoding='utf-8') as f:
-            for line in extracted_lines:
-                f.write(f"{line}=\n")
-        log_callback(f"=== 완료: {len(extracted_lines)}줄 추출됨 ===")
+            idx = 0
+            while pending:
+                if control is not None and not control.checkpoint():
+                    # [취소] 아직 시작하지 않은 파일은 취소 (실행 중인 파일은 executor 종료 시 마무리됨)
+                    for future in pending:
+                        future.cancel()
+                    stopped = True
+                    break
+
+                path, lines, error = pending.popleft().result()
+                _submit_next()
+                fname = os.path.relpath(path, src_dir)
+
+                if error:
+                    log_callback(f"!! {fname} 읽기 실패: {error}")
+                else:
+                    new_lines = []
+                    for line in lines:
+                        digest = hashlib.blake2b(line.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+                        if digest not in extracted_seen:
+                            extracted_seen.add(digest)
+                            new_lines.append(f"{line}=\n")
+                    if new_lines:
+                        out_f.write("".join(new_lines))
+                        out_f.flush()
+                        extracted_count += len(new_lines)
+
+                idx += 1
+                total_label = discovered if walk_done else f"{discovered}+"
+                if idx % 100 == 0:
+                    log_callback(f">> [분석] ({idx}/{total_label}) 완료")
+                
+                if progress_callback and discovered > 0:
+                    progress_callback(idx / discovered, fname)
+
+        if stopped:
+            log_callback(f"=== 중단됨: {idx}개 파일에서 {extracted_count}줄 추출 (여기까지 저장) ===")
+        else:
+            if discovered == 0:
+                log_callback("!! 처리할 파일이 없습니다. (확장자/포함·제외 패턴 확인)")
+            log_callback(f"=== 완료: {extracted_count}줄 추출됨 ===")
         log_callback(f"저장 위치: {save_path}")
     except Exception as e:
-        log_callback(f"!! 저장 실패: {e}")
+        log_callback(f"!! 저장 실패: {e} (지금까지 {extracted_count}줄 기록됨)")
+    finally:
+        utils.encoding_cache.flush()
 
 
 # ==========================================
@@ -233,22 +533,276 @@ def chunk_list(lst, n):
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
 
+# ==========================================
+# [Helper] 번역 DB 매처 생성
+# ==========================================
+ASCII_CHECK_REGEX = re.compile(r'^[\x00-\x7F]+$')
+JSON_KEY_GUARD_REGEX = re.compile(r'\s*:')
+
+def _safe_english_guard(text, start, end):
+    """
+    순수 영문 보호 조건 (따옴표/괄호 보호 + JSON 키 보호)
+    앞: " ' >  /  뒤: " ' <  /  뒤에 ':'가 오면 JSON 키이므로 제외
+    """
+    if start == 0 or end >= len(text):
+        return False
+    if text[start - 1] not in '"\'>' or text[end] not in '"\'<':
+        return False
+    return not JSON_KEY_GUARD_REGEX.match(text, end)
+
+def _build_db_matcher(db, use_safe_mode=False):
+    """
+    번역 DB의 키들로 KeywordMatcher를 생성합니다.
+    - 여러 줄 키는 다양한 줄바꿈 표기(\\n, \\r\\n, 실제 개행)에 유연하게 매칭
+    - 긴 키 우선 매칭 (Leftmost-Longest)
+    - 영문 보호 모드: 한 줄짜리 순수 ASCII 키는 따옴표/괄호 안에 있을 때만 매칭
+    """
+    keys = [normalize_key(k) for k in db]
+
+    guarded_keys = None
+    if use_safe_mode:
+        guarded_keys = [k for k in keys if '\n' not in k and ASCII_CHECK_REGEX.match(k)]
+
+    return KeywordMatcher(keys, flexible_newline=True,
+                          guard=_safe_english_guard, guarded_keys=guarded_keys)
+
+# ==========================================
+# [Helper] 번역 DB 로드 및 컴파일 캐시
+# ==========================================
+DB_CACHE_DIRNAME = "_db_cache"
+DB_CACHE_VERSION = 2       # 매처 구조가 바뀌면 올려서 기존 캐시 무효화
+DB_CACHE_MAX_FILES = 8     # 오래된 캐시는 자동 정리
+
+def _parse_translation_db(text):
+    """'원문=번역문' 형식의 DB 텍스트를 {원문 키: 번역문} 딕셔너리로 변환"""
+    db = {}
+    for line in io.StringIO(text, newline=None):
+        if '=' not in line: continue
+        k, v = line.strip().split('=', 1)
+        clean_k = k.strip().replace(r'\r\n', '\n').replace(r'\r', '\n').replace(r'\n', '\n')
+        clean_k = clean_k.replace('\r\n', '\n').replace('\r', '\n')
+        db[clean_k] = v.strip()
+    return db
+
+def _is_private_dir(path):
+    """
+    캐시(pickle)를 읽어도 안전한 폴더인지 확인: 현재 사용자 소유이고 다른 사용자가 쓸 수 없어야 함
+    (pickle은 불러올 때 코드를 실행할 수 있으므로, 남이 만든 캐시 파일을 읽으면 안 됨)
+    """
+    if not hasattr(os, 'getuid'):
+        return True  # Windows: 임시 폴더가 사용자 프로필 안에 있음
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not (st.st_mode & 0o022)
+
+def _get_db_cache_dir():
+    # 프로그램 폴더에 쓸 수 없으면 임시 폴더 안의 사용자별 폴더 사용 (공용 임시 폴더는 다른 사용자가 미리 만들 수 있음)
+    user_tag = str(os.getuid()) if hasattr(os, 'getuid') else ""
+    candidates = (
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), DB_CACHE_DIRNAME),
+        os.path.join(tempfile.gettempdir(), f"{DB_CACHE_DIRNAME}_{user_tag}" if user_tag else DB_CACHE_DIRNAME),
+    )
+    for candidate in candidates:
+        try:
+            os.makedirs(candidate, mode=0o700, exist_ok=True)
+            st = os.lstat(candidate)
+            if hasattr(os, 'getuid') and st.st_uid == os.getuid() and stat.S_ISDIR(st.st_mode) and st.st_mode & 0o022:
+                os.chmod(candidate, 0o700)  # 직접 만든 캐시 폴더인데 그룹/기타 쓰기 권한이 있으면 좁힘
+        except OSError:
+            continue
+        if _is_private_dir(candidate):
+            return candidate
+    return None
+
+def _get_db_cache_path(db_rev, use_safe_mode):
+    """DB 내용 해시 + 매칭 옵션(영문보호/유연한 줄바꿈) + 캐시 버전으로 캐시 파일명 결정"""
+    cache_dir = _get_db_cache_dir()
+    if not cache_dir:
+        return None
+    digest = db_rev[:32]
+    flags = f"v{DB_CACHE_VERSION}_safe{int(bool(use_safe_mode))}_nl1"
+    return os.path.join(cache_dir, f"db_{digest}_{flags}.pkl")
+
+def _prune_db_cache(cache_dir):
+    try:
+        entries = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith('.pkl')]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for old in entries[DB_CACHE_MAX_FILES:]:
+            os.remove(old)
+    except: pass
+
+def _load_translate_db(db_path, use_safe_mode=False, use_cache=True):
+    """
+    번역 DB를 읽어 (db, matcher, 캐시 사용 여부, DB 리비전 해시)를 반환합니다.
+    DB 내용과 옵션이 같으면 정규화된 DB와 컴파일된 매처를 디스크 캐시에서 그대로 불러옵니다.
+    """
+    with open(db_path, 'rb') as f:
+        raw_bytes = f.read()
+    db_rev = hashlib.sha256(raw_bytes).hexdigest()
+
+    cache_path = _get_db_cache_path(db_rev, use_safe_mode) if use_cache else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                version, db, matcher = pickle.load(f)
+            if version == DB_CACHE_VERSION:
+                os.utime(cache_path)  # 최근 사용 표시 (정리 대상에서 제외)
+                return db, matcher, True, db_rev
+        except: pass  # 손상된 캐시는 무시하고 새로 생성
+
+    db = _parse_translation_db(raw_bytes.decode('utf-8'))
+    if not db:
+        return db, None, False, db_rev
+
+    # [변경] 거대한 정규식 OR 패턴 대신 Aho-Corasick 매처 사용 (키 개수와 무관한 선형 스캔)
+    matcher = _build_db_matcher(db, use_safe_mode)
+
+    if cache_path:
+        tmp_path = None
+        try:
+            # 여러 프로세스가 같은 캐시를 동시에 만들 수 있으므로 임시 파일 이름은 매번 새로 만듦
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((DB_CACHE_VERSION, db, matcher), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            tmp_path = None
+            _prune_db_cache(os.path.dirname(cache_path))
+        except: pass  # 캐시 저장 실패는 작업에 영향 없음
+        finally:
+            if tmp_path:
+                try: os.remove(tmp_path)
+                except OSError: pass
+
+    return db, matcher, False, db_rev
+
+# ==========================================
+# [Helper] 증분 적용 매니페스트 (Incremental Apply)
+# ==========================================
+# 출력 폴더 옆에 '<출력폴더>_apply_manifest.json'으로 저장
+# - 파일별: 크기, 수정시각, 내용 해시, 적용된 DB 리비전, 매칭된 키 목록, 저장 여부
+# - DB 전체: 키별 번역문 해시 (다음 실행 시 '바뀐 키'를 찾기 위함)
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = "_apply_manifest.json"
+
+def _short_hash(text):
+    if text is None: return ""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def _get_manifest_path(out_dir):
+    return os.path.normpath(out_dir) + MANIFEST_SUFFIX
+
+def _get_options_signature(options):
+    """출력 결과에 영향을 주는 옵션만 모아 서명 생성 (바뀌면 전체 재처리)"""
+    keys = ('safe_english', 'newline_key', 'space_key', 'smart_save')
+    sig = {k: options.get(k) for k in keys}
+    sig['matcher'] = DB_CACHE_VERSION
+    return _short_hash(json.dumps(sig, sort_keys=True, ensure_ascii=False))
+
+def _load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except: pass
+    return None
+
+def _save_manifest(path, manifest):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _plan_incremental_apply(files, src_dir, out_dir, db, db_rev, options, manifest):
+    """
+    이전 매니페스트와 비교하여 이번 실행의 처리 계획을 세웁니다.
+    :return: (처리 대상 목록, 확인(probe) 대상 집합, probe 매처, 유지할 기록, DB 키 해시 목록)
+             - 처리 대상: 새 파일 / 내용 변경 / 매칭된 키의 번역이 바뀐 파일 / 출력이 사라진 파일
+             - probe 대상: 내용은 같지만 새로 추가된 DB 키가 들어있을 수 있는 파일
+    """
+    # 키 해시는 매처가 돌려주는 표준 키 기준, 값은 원래 키로 조회 (DB는 원래 키로 저장되어 있음)
+    db_entries = {}
+    for k, v in db.items():
+        db_entries[_short_hash(normalize_key(k))] = _short_hash(v)
+
+    if not manifest or manifest.get('options_sig') != _get_options_signature(options):
+        return list(files), set(), None, {}, db_entries
+
+    prev_entries = manifest.get('db_entries', {})
+    prev_files = manifest.get('files', {})
+
+    changed_keys = set()
+    probe_matcher = None
+    if manifest.get('db_rev') != db_rev:
+        changed_keys = {kh for kh, vh in prev_entries.items() if db_entries.get(kh) != vh}
+        added = {}
+        for k, v in db.items():
+            nk = normalize_key(k)
+            if _short_hash(nk) not in prev_entries:
+                added[nk] = v
+        if added:
+            probe_matcher = _build_db_matcher(added, options.get('safe_english', False))
+
+    to_process = []
+    probe_files = set()
+    kept = {}
+
+    for fname in files:
+        rec = prev_files.get(fname)
+        if not rec:
+            to_process.append(fname)
+            continue
+
+        try:
+            st = os.stat(os.path.join(src_dir, fname))
+        except OSError:
+            to_process.append(fname)
+            continue
+
+        same = rec.get('size') == st.st_size and rec.get('mtime') == st.st_mtime_ns
+        if not same and rec.get('size') == st.st_size:
+            # 수정시각만 바뀐 경우 내용 해시로 재확인
+            with open(os.path.join(src_dir, fname), 'rb') as f:
+                same = hashlib.sha256(f.read()).hexdigest() == rec.get('hash')
+        if not same:
+            to_process.append(fname)
+            continue
+
+        if rec.get('saved') and not os.path.exists(os.path.join(out_dir, fname)):
+            to_process.append(fname)
+            continue
+
+        if changed_keys and not changed_keys.isdisjoint(rec.get('matched', ())):
+            to_process.append(fname)
+            continue
+
+        kept[fname] = dict(rec, mtime=st.st_mtime_ns, db_rev=db_rev)
+        if probe_matcher:
+            probe_files.add(fname)
+            to_process.append(fname)
+
+    return to_process, probe_files, probe_matcher, kept, db_entries
+
 # ==========================================
 # [Worker] 파일 묶음(Batch) 처리 작업
 # ==========================================
 def _worker_translate_batch(args):
-    file_list, src_dir, out_dir, db, options, pattern = args
+    file_list, src_dir, out_dir, db, options, matcher, probe_matcher, probe_files = args
     
     processed_cnt = 0
     saved_cnt = 0
     last_error = None
+    records = {}  # [증분 모드] 파일별 매니페스트 기록 (실패 시 None)
     
     nl_key = options.get('newline_key', '\\n')
     sp_key = options.get('space_key', ' ')
     is_smart_save = options.get('smart_save', True)
+    is_incremental = options.get('incremental', False)
     
-    if not pattern or not db:
-        return 0, 0, "DB Empty"
+    if not matcher or not db:
+        return 0, 0, "DB Empty", records
 
     for i, fname in enumerate(file_list):
         # [핵심] 10개 처리할 때마다 0.001초 쉼 -> UI 스레드에 제어권 양보 (응답없음 방지)
@@ -256,27 +810,18 @@ def _worker_translate_batch(args):
             time.sleep(0.001)
 
         path = os.path.join(src_dir, fname)
+        out_path = os.path.join(out_dir, fname)  # 하위 폴더 구조 그대로 유지
         is_json_ext = fname.lower().endswith('.json')
         processed_cnt += 1
+        records[fname] = None
         
         try:
-            with open(path, 'rb') as f:
-                raw_bytes = f.read()
-            
-            try:
-                text = raw_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                enc = utils.detect_encoding(path)
-                text = raw_bytes.decode(enc, errors='replace')
-
-            # 치환 로직 (구버전 방식)
-            def replace_cb(m):
-                match_str = m.group(0)
-                temp_key = match_str.replace(r'\r\n', '\n').replace(r'\r', '\n').replace(r'\n', '\n')
-                temp_key = temp_key.replace('\r\n', '\n').replace('\r', '\n')
-                parts = [p.strip() for p in temp_key.split('\n')]
-                search_key = "\n".join(parts)
+            st = os.stat(path)
+            matched_keys = set()
 
+            # 치환 로직 (매처가 찾아준 표준 키로 DB 조회)
+            def replace_cb(search_key, match_str):
+                matched_keys.add(search_key)
                 if search_key not in db: return match_str 
                 val = db[search_key]
 
@@ -290,13 +835,60 @@ def _worker_translate_batch(args):
                     val = val.replace(sp_key, '\u00A0').replace(nl_key, ' ')
                 return val
 
-            final_text, changed_count = pattern.subn(replace_cb, text)
+            is_probe = bool(probe_files) and fname in probe_files
+
+            # [대용량 파일] 전체를 읽지 않고 mmap 창 단위로 치환 (결과 동일, 메모리 사용량 제한)
+            if st.st_size >= max(MMAP_THRESHOLD_BYTES, 1):
+                try:
+                    result = _apply_file_mmap(
+                        path, out_path, matcher, replace_cb, is_json_ext, is_smart_save,
+                        probe_matcher if is_probe else None, is_incremental
+                    )
+                except _WindowFallback:
+                    matched_keys.clear()  # UTF-8이 아님 -> 아래 전체 읽기 경로로 처리
+                else:
+                    if result is None:
+                        records[fname] = {'unchanged': True}
+                        continue
+                    changed_count, file_hash, saved = result
+                    if is_incremental:
+                        records[fname] = {
+                            'size': st.st_size, 'mtime': st.st_mtime_ns, 'hash': file_hash,
+                            'matched': sorted(_short_hash(k) for k in matched_keys),
+                            'saved': saved
+                        }
+                    if saved:
+                        saved_cnt += 1
+                    continue
+
+            with open(path, 'rb') as f:
+                raw_bytes = f.read()
+            
+            # 캐시된 인코딩 -> BOM -> utf-8/cp932/utf-16 순서로 한 번만 디코딩
+            text, _ = utils.decode_bytes(raw_bytes, path)
+
+            # [증분 모드] 내용이 그대로인 파일은 '새로 추가된 DB 키'가 등장할 때만 다시 처리
+            if is_probe:
+                if next(probe_matcher.finditer(text), None) is None:
+                    records[fname] = {'unchanged': True}
+                    continue
+
+            final_text, changed_count = matcher.subn(replace_cb, text)
+
+            if is_incremental:
+                records[fname] = {
+                    'size': st.st_size, 'mtime': st.st_mtime_ns,
+                    'hash': hashlib.sha256(raw_bytes).hexdigest(),
+                    'matched': sorted(_short_hash(k) for k in matched_keys),
+                    'saved': not (is_smart_save and changed_count == 0)
+                }
 
             if is_smart_save and changed_count == 0:
                 continue 
 
-            if not os.path.exists(out_dir):
-                os.makedirs(out_dir, exist_ok=True) 
+            out_parent = os.path.dirname(out_path)
+            if not os.path.exists(out_parent):
+                os.makedirs(out_parent, exist_ok=True) 
 
             # ▼▼▼ [수정] 파일 확장자에 따라 인코딩 차별화 ▼▼▼
             if is_json_ext:
@@ -316,71 +908,86 @@ def _worker_translate_batch(args):
                     temp_arr[:4] = raw_bytes[:4]
                     out_bytes = bytes(temp_arr)
 
-            with open(os.path.join(out_dir, fname), 'wb') as f:
+            with open(out_path, 'wb') as f:
                 f.write(out_bytes)
             saved_cnt += 1
 
         except Exception as e:
+            records[fname] = None
             last_error = f"{fname}: {str(e)}"
     
-    return processed_cnt, saved_cnt, last_error
+    utils.encoding_cache.flush()  # 이번 묶음에서 새로 감지한 인코딩 저장 (프로세스 풀에서도 유지)
+    return processed_cnt, saved_cnt, last_error, records
+
+# ==========================================
+# [Worker] 프로세스 풀 전용 (워커 프로세스별 상태)
+# ==========================================
+_POOL_STATE = {}
+
+def _init_translate_pool(db, options, matcher, probe_matcher=None):
+    """프로세스 풀 initializer: 워커 프로세스마다 DB와 매처를 한 번만 받아 보관"""
+    _POOL_STATE['db'] = db
+    _POOL_STATE['options'] = options
+    _POOL_STATE['matcher'] = matcher
+    _POOL_STATE['probe_matcher'] = probe_matcher
+
+def _worker_translate_batch_pooled(args):
+    file_list, src_dir, out_dir, probe_files = args
+    return _worker_translate_batch((
+        file_list, src_dir, out_dir,
+        _POOL_STATE.get('db'), _POOL_STATE.get('options', {}), _POOL_STATE.get('matcher'),
+        _POOL_STATE.get('probe_matcher'), probe_files
+    ))
 
 # ==========================================
 # 2. 번역 적용 로직 (Process Translate)
 # ==========================================
-def process_translate(src_dir, out_dir, db_path, options, log_callback, progress_callback=None):
+def process_translate(src_dir, out_dir, db_path, options, log_callback, progress_callback=None, control=None):
+    """
+    :param control: utils.JobControl (선택). 일시정지 중에는 새 배치를 제출하지 않으며, 취소되면
+                    대기 중인 배치를 취소하고 실행 중인 배치만 마친 뒤 매니페스트를 저장하고 종료합니다.
+                    (증분 모드에서는 다음 실행이 남은 파일부터 이어서 처리)
+    """
     if not (src_dir and out_dir and db_path):
         log_callback("!! 경로를 모두 지정해주세요.")
         return
 
     log_callback("=== 번역 적용 시작 (반응형 배치 모드) ===")
 
-    # 1. DB 로드 (기존과 동일)
-    db = {}
+    # 1. DB 로드 (변경 없는 DB는 디스크 캐시에서 즉시 로드)
+    use_safe_mode = options.get('safe_english', False)
     try:
-        with open(db_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if '=' not in line: continue
-                k, v = line.strip().split('=', 1)
-                clean_k = k.strip().replace(r'\r\n', '\n').replace(r'\r', '\n').replace(r'\n', '\n')
-                clean_k = clean_k.replace('\r\n', '\n').replace('\r', '\n')
-                db[clean_k] = v.strip()
+        db, matcher, from_cache, db_rev = _load_translate_db(db_path, use_safe_mode, options.get('use_db_cache', True))
         
-        keys = sorted(db.keys(), key=len, reverse=True)
-        if not keys:
+        if not db:
             log_callback("!! DB 파일이 비어있습니다.")
             return
 
-        escaped_keys = []
-        flexible_newline = r'[ \t]*(?:\\r\\n|\\n|\\r|\r\n|\n|\r)[ \t]*'
-        ascii_check = re.compile(r'^[\x00-\x7F]+$')
-
-        # ▼▼▼ [추가] 옵션값 가져오기 ▼▼▼
-        use_safe_mode = options.get('safe_english', False)
-
-        for k in keys:
-            parts = k.split('\n')
-            safe_parts = [re.escape(p) for p in parts]
-            pattern_str = flexible_newline.join(safe_parts)
-            # ▼▼▼ [수정] 옵션이 켜져 있을 때만 "비싼 연산" 수행 ▼▼▼
-            if use_safe_mode and len(parts) == 1 and ascii_check.match(k):
-                # 안전 장치 (따옴표/괄호 보호 + JSON 키 보호) - 연산 비용 높음
-                safe_prefix = r'(?<=[\"\'\>])'
-                safe_suffix = r'(?=[\"\'\<])'
-                json_guard  = r'(?!\s*:)'
-                pattern_str = safe_prefix + pattern_str + safe_suffix + json_guard
-            
-            escaped_keys.append(pattern_str)
-        
-        pattern = re.compile('|'.join(escaped_keys))
-        log_callback(f">> DB 로드 완료: {len(db)}개 항목 (영문보호: {'ON' if use_safe_mode else 'OFF'})")
+        log_callback(f">> DB 로드 완료: {len(db)}개 항목 (영문보호: {'ON' if use_safe_mode else 'OFF'}, 캐시: {'사용' if from_cache else '새로 생성'})")
         
     except Exception as e:
         log_callback(f"!! DB 로드 실패: {e}")
         return
 
-    # 2. 파일 목록 스캔
-    files = [f for f in os.listdir(src_dir) if f.lower().endswith(('.txt', '.json', '.dat'))]
+    # 2. 파일 목록 스캔 (하위 폴더 포함, 상대 경로)
+    # 증분 계획/진행률에 전체 목록이 필요하므로 여기서는 끝까지 탐색해 둠
+    files = list(utils.iter_stage_files(src_dir, utils.APPLY_EXTENSIONS, options, skip_dirs=[out_dir]))
+    if not files:
+        log_callback("!! 처리할 파일이 없습니다. (확장자/포함·제외 패턴 확인)")
+
+    # 2-1. [증분 모드] 지난 실행 이후 바뀌지 않은 파일은 건너뜀
+    is_incremental = options.get('incremental', False)
+    probe_files, probe_matcher, manifest_files, db_entries = set(), None, {}, {}
+    if is_incremental:
+        manifest_path = _get_manifest_path(out_dir)
+        files, probe_files, probe_matcher, manifest_files, db_entries = _plan_incremental_apply(
+            files, src_dir, out_dir, db, db_rev, options, _load_manifest(manifest_path)
+        )
+        skipped = len(manifest_files) - len(probe_files)
+        log_callback(f">> [증분 모드] 변경 없음 {skipped}개 건너뜀 / 처리 대상 {len(files)}개 (신규 키 확인 {len(probe_files)}개 포함)")
+        if not files and progress_callback:
+            progress_callback(1.0, "변경된 파일 없음")
+
     total_files = len(files)
     
     # ---------------------------------------------------------------
@@ -395,37 +1002,119 @@ def process_translate(src_dir, out_dir, db_path, options, log_callback, progress
     cpu_count = os.cpu_count() or 4
     safe_workers = max(1, cpu_count - 1) 
     
-    log_callback(f">> 총 {total_files}개 파일 번역 시작...")
+    # ---------------------------------------------------------------
+    # [최적화 4] 실행 백엔드 선택
+    # 치환은 CPU 연산이므로 스레드는 GIL에 묶임 -> 프로세스 풀로 코어 수만큼 병렬 처리
+    # DB/매처는 initializer로 워커당 1회만 전달 (배치마다 직렬화하지 않음)
+    # ---------------------------------------------------------------
+    use_process_pool = options.get('use_process_pool', False)
+    if use_process_pool:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=safe_workers,
+            initializer=_init_translate_pool,
+            initargs=(db, options, matcher, probe_matcher)
+        )
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=safe_workers)
+
+    log_callback(f">> 총 {total_files}개 파일 번역 시작... (실행 모드: {'멀티프로세스' if use_process_pool else '멀티스레드'}, 워커 {safe_workers}개)")
 
     total_scanned = 0
     total_saved = 0
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=safe_workers) as executor:
-        futures = []
-        for chunk in file_chunks:
-            args = (chunk, src_dir, out_dir, db, options, pattern)
-            futures.append(executor.submit(_worker_translate_batch, args))
-        
-        for idx, future in enumerate(concurrent.futures.as_completed(futures)):
-            p_cnt, s_cnt, error = future.result()
-            total_scanned += p_cnt
-            total_saved += s_cnt
-            
-            if error: log_callback(f"!! 오류: {error}")
-            
-            # 진행률 업데이트
-            if progress_callback:
-                progress = total_scanned / total_files if total_files > 0 else 0
-                progress_callback(progress, f"{total_scanned}/{total_files} 완료 ({int(progress*100)}%)")
-                
-            # [최적화 3] 로그는 배치 5번마다 한 번씩만 출력 (너무 빠르면 읽기 힘듦)
-            if idx % 5 == 0 or idx == len(file_chunks) - 1:
-                 log_callback(f">> 진행 중: {total_scanned}개 완료 (생성: {total_saved}개)")
+    stopped = False
+    finished = set()  # [증분 모드] 워커가 처리를 마친 파일
+
+    # [제출 창] 배치를 한꺼번에 넣지 않고 워커당 2개까지만 앞서 제출
+    # -> 일시정지하면 새 배치 제출이 멈추고, 취소 시 버릴 대기 배치도 적음
+    chunk_iter = iter(file_chunks)
+    window = safe_workers * 2
+
+    with executor:
+        in_flight = set()
+
+        def _submit_next():
+            chunk = next(chunk_iter, None)
+            if chunk is None:
+                return False
+            chunk_probe = probe_files.intersection(chunk) if probe_files else None
+            if use_process_pool:
+                in_flight.add(executor.submit(_worker_translate_batch_pooled, (chunk, src_dir, out_dir, chunk_probe)))
+            else:
+                args = (chunk, src_dir, out_dir, db, options, matcher, probe_matcher, chunk_probe)
+                in_flight.add(executor.submit(_worker_translate_batch, args))
+            return True
+
+        idx = -1
+        while True:
+            if control is not None:
+                if not in_flight:
+                    control.checkpoint()  # 실행 중인 배치가 없으면 재개/취소될 때까지 대기
+                if control.cancelled and not stopped:
+                    stopped = True
+                    for future in in_flight:
+                        future.cancel()
+                    log_callback(">> 작업 취소 요청: 실행 중인 배치만 마무리합니다...")
 
+            if not stopped and (control is None or not control.paused):
+                while len(in_flight) < window and _submit_next():
+                    pass
+
+            if not in_flight:
+                break
+
+            done, in_flight = concurrent.futures.wait(
+                in_flight, timeout=utils.CONTROL_POLL_INTERVAL if control is not None else None,
+                return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                if future.cancelled():
+                    continue
+                idx += 1
+                p_cnt, s_cnt, error, records = future.result()
+                total_scanned += p_cnt
+                total_saved += s_cnt
+
+                if is_incremental:
+                    for fname, rec in records.items():
+                        finished.add(fname)
+                        if rec is None:
+                            manifest_files.pop(fname, None)  # 실패한 파일은 다음 실행에 다시 처리
+                        elif not rec.get('unchanged'):
+                            rec['db_rev'] = db_rev
+                            manifest_files[fname] = rec
+
+                if error: log_callback(f"!! 오류: {error}")
+
+                # 진행률 업데이트
+                if progress_callback:
+                    progress = total_scanned / total_files if total_files > 0 else 0
+                    progress_callback(progress, f"{total_scanned}/{total_files} 완료 ({int(progress*100)}%)")
+
+                # [최적화 3] 로그는 배치 5번마다 한 번씩만 출력 (너무 빠르면 읽기 힘듦)
+                if idx % 5 == 0 or idx == len(file_chunks) - 1:
+                    log_callback(f">> 진행 중: {total_scanned}개 완료 (생성: {total_saved}개)")
+
+
+    if is_incremental:
+        if stopped:
+            # 확인하지 못한 probe 파일은 기록을 지워야 다음 실행에서 새 DB 키를 다시 확인함
+            # (남겨 두면 새 db_rev 기준으로 '변경 없음' 처리되어 추가된 키가 적용되지 않음)
+            for fname in probe_files - finished:
+                manifest_files.pop(fname, None)
+        try:
+            _save_manifest(manifest_path, {
+                'version': MANIFEST_VERSION,
+                'db_rev': db_rev,
+                'options_sig': _get_options_signature(options),
+                'db_entries': db_entries,
+                'files': manifest_files
+            })
+        except Exception as e:
+            log_callback(f"!! 매니페스트 저장 실패: {e}")
 
     # [수정] 최종 결과 로그를 명확하게 분리
     log_callback("========================================")
-    log_callback(f"   [작업 완료]")
+    log_callback(f"   [작업 중단] (남은 파일 {total_files - total_scanned}개)" if stopped else f"   [작업 완료]")
     log_callback(f"   - 전체 스캔 파일: {total_scanned}개")
     log_callback(f"   - 실제 생성 파일: {total_saved}개 (스마트 저장)")
     log_callback("========================================")
@@ -433,15 +1122,118 @@ def process_translate(src_dir, out_dir, db_path, options, log_callback, progress
 # ==========================================
 # 3. DB 마스킹 유틸리티 (Process DB Masking)
 # ==========================================
-def process_db_masking(db_path, glossary_path, mode, log_callback):
+# [스트리밍] 한 번에 기록하는 줄 수 / [병렬] 워커 하나가 맡는 구간 크기 (줄 경계로 보정)
+DB_MASKING_WRITE_LINES = 10000
+DB_MASKING_RANGE_BYTES = 8 * 1024 * 1024
+DB_MASKING_LOG_INTERVAL = 200000
+
+def _mask_db_line(line, mode, glossary_index):
+    """
+    DB 한 줄 변환 (좌변/우변 분리)
+    :return: (출력 줄, 처리 대상 여부) - 빈 줄/주석은 그대로 기록하고 개수에서 제외
+    """
+    line = line.strip()
+    if not line:
+        return "\n", False
+
+    # 주석 처리
+    if line.startswith('//'):
+        return f"{line}\n", False
+
+    # 등호(=) 기준 분리
+    has_equal = '=' in line
+    if has_equal:
+        left, right = line.split('=', 1)
+    else:
+        left, right = line, ""
+
+    # [모드별 로직 수행]
+    if mode == 'apply':
+        # 적용: 좌변/우변 모두 동일한 Mask ID로 변환
+        new_left = glossary_index.mask_text(left)
+        new_right = glossary_index.mask_text(right) if has_equal else ""
+    elif has_equal:
+        # 해제: 좌변은 원문(Src), 우변은 번역문(Tgt)으로 변환
+        new_left = glossary_index.restore(left, glossary_index.id_to_src)
+        new_right = glossary_index.restore(right, glossary_index.id_to_tgt)
+    else:
+        # 등호가 없는 문장(순수 텍스트 파일 등)은 번역문으로 치환하는 것이 자연스러움
+        new_left = glossary_index.restore(left, glossary_index.id_to_tgt)
+        new_right = ""
+
+    # 결과 재조립
+    if has_equal:
+        return f"{new_left}={new_right}\n", True
+    return f"{new_left}\n", True
+
+def _mask_db_stream(lines, out_f, mode, glossary_index, log_callback=None):
+    """줄 단위로 읽고 변환하여 일정 개수마다 기록 (메모리 사용량이 파일 크기와 무관)"""
+    buffer = []
+    count = 0
+    total = 0
+    for line in lines:
+        out_line, counted = _mask_db_line(line, mode, glossary_index)
+        buffer.append(out_line)
+        count += counted
+        total += 1
+        if len(buffer) >= DB_MASKING_WRITE_LINES:
+            out_f.writelines(buffer)
+            buffer.clear()
+        if log_callback and total % DB_MASKING_LOG_INTERVAL == 0:
+            log_callback(f">> [마스킹] {total:,}줄 처리 중...")
+    out_f.writelines(buffer)
+    return count
+
+def _split_line_ranges(path, range_bytes):
+    """파일을 약 range_bytes 크기의 (시작, 끝) 바이트 구간으로 나눔 (각 구간은 줄바꿈 직후에서 시작)"""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = min(size, start + range_bytes)
+            if end < size:
+                f.seek(end)
+                f.readline()  # 줄 끝까지 포함
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+# [Worker] 프로세스 풀 전용 (워커 프로세스별 용어집 인덱스)
+_MASKING_POOL_STATE = {}
+
+def _init_masking_pool(masking_data):
+    _MASKING_POOL_STATE['index'] = utils.GlossaryIndex(masking_data)
+
+def _worker_mask_range(args):
+    """
+    DB의 한 구간을 변환하여 임시 파일에 기록
+    :return: (임시 파일 경로, 처리 줄 수)
+    """
+    db_path, start, end, mode, part_path = args
+    with open(db_path, 'rb') as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    text = raw.decode('utf-8')
+    del raw
+    with open(part_path, 'w', encoding='utf-8', newline='') as out_f:
+        # 구간 결과는 '\n' 그대로 기록 -> 이어 붙일 때 최종 파일에서 한 번만 줄바꿈 변환
+        count = _mask_db_stream(io.StringIO(text, newline=None), out_f, mode, _MASKING_POOL_STATE['index'])
+    return part_path, count
+
+def process_db_masking(db_path, glossary_path, mode, log_callback, options=None):
     """
     마스킹 적용 및 해제 (좌변/우변 분리 로직 적용)
     :param mode: 'apply' (원문 -> 마스킹ID), 'restore' (마스킹ID -> 원문/번역문)
+    :param options: {'parallel': 구간을 나눠 여러 프로세스로 처리, 'workers': 프로세스 수}
     """
     if not (db_path and glossary_path):
         log_callback("!! DB 파일과 용어집 경로를 모두 지정해주세요.")
         return
 
+    options = options or {}
+
     # 용어집 로드
     masking_data = utils.load_glossary_data(glossary_path)
     if not masking_data:
@@ -449,105 +1241,76 @@ def process_db_masking(db_path, glossary_path, mode, log_callback):
         return
 
     log_callback(f"=== DB 마스킹 {'적용' if mode == 'apply' else '해제(복원)'} 시작 ===")
-    
-    try:
-        # 1. 검색 및 치환을 위한 매핑 테이블 생성
-        # Apply용: 긴 단어부터 매칭되도록 정렬된 패턴
-        glossary_pattern, sorted_data = _get_glossary_map(masking_data)
-        
-        # Restore용: Mask ID를 Key로 하는 고속 조회 딕셔너리
-        id_to_src = {item['mask_id']: item['src'] for item in masking_data}
-        id_to_tgt = {item['mask_id']: item['tgt'] for item in masking_data}
-        
-        # 마스킹 ID 패턴 (예: __MSK_0000__)
-        restore_pattern = re.compile(r"__MSK_\d{4}__")
 
-        updated_lines = []
-        
-        # -------------------------------------------------------
-        # [내부 함수] 마스킹 적용 (Apply)
-        # -------------------------------------------------------
-        def _apply_text(text):
-            if not glossary_pattern: return text
-            # 텍스트 내의 원문을 찾아 Mask ID로 치환
-            def _cb(m):
-                word = m.group(0)
-                for item in sorted_data:
-                    if item['src'] == word:
-                        return item['mask_id']
-                return word
-            return glossary_pattern.sub(_cb, text)
-
-        # -------------------------------------------------------
-        # [내부 함수] 마스킹 해제 (Restore)
-        # -------------------------------------------------------
-        def _restore_text(text, target_map):
-            # 텍스트 내의 Mask ID를 찾아 target_map(Src 또는 Tgt)으로 치환
-            def _cb(m):
-                mask_id = m.group(0)
-                return target_map.get(mask_id, mask_id) # 맵에 없으면 그대로 유지
-            return restore_pattern.sub(_cb, text)
-
-        # 파일 처리 시작
-        with open(db_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        count = 0
-        for line in lines:
-            line = line.strip()
-            if not line:
-                updated_lines.append("\n")
-                continue
-            
-            # 주석 처리
-            if line.startswith('//'):
-                updated_lines.append(f"{line}\n")
-                continue
+    suffix = "_MASKED.txt" if mode == "apply" else "_RESTORED.txt"
+    out_path = os.path.splitext(db_path)[0] + suffix
+    tmp_path = out_path + ".tmp"
 
-            # 등호(=) 기준 분리
-            left = line
-            right = ""
-            has_equal = '=' in line
-            
-            if has_equal:
-                parts = line.split('=', 1)
-                left = parts[0]
-                right = parts[1]
-
-            # [모드별 로직 수행]
-            if mode == 'apply':
-                # 적용: 좌변/우변 모두 동일한 Mask ID로 변환
-                new_left = _apply_text(left)
-                new_right = _apply_text(right) if has_equal else ""
-                
-            else: # mode == 'restore'
-                # 해제: 좌변은 원문(Src), 우변은 번역문(Tgt)으로 변환
-                new_left = _restore_text(left, id_to_src)
-                
-                if has_equal:
-                    new_right = _restore_text(right, id_to_tgt)
-                else:
-                    # 등호가 없는 문장(순수 텍스트 파일 등)은 번역문으로 치환하는 것이 자연스러움
-                    new_left = _restore_text(left, id_to_tgt)
-                    new_right = ""
+    try:
+        ranges = None
+        if options.get('parallel'):
+            ranges = _split_line_ranges(db_path, options.get('range_bytes', DB_MASKING_RANGE_BYTES))
+            if len(ranges) < 2:
+                ranges = None  # 작은 파일은 프로세스를 띄우는 비용이 더 큼
 
-            # 결과 재조립
-            if has_equal:
-                updated_lines.append(f"{new_left}={new_right}\n")
+        # 결과는 임시 파일에 쓴 뒤 완료 시 교체 (중간에 실패해도 기존 결과 파일 보존)
+        with open(tmp_path, 'w', encoding='utf-8') as out_f:
+            if ranges is None:
+                # 1. 검색 및 치환을 위한 공용 인덱스 생성 (추출 단계와 동일)
+                glossary_index = utils.GlossaryIndex(masking_data)
+                with open(db_path, 'r', encoding='utf-8') as src_f:
+                    count = _mask_db_stream(src_f, out_f, mode, glossary_index, log_callback)
             else:
-                updated_lines.append(f"{new_left}\n")
-                
-            count += 1
+                count = _mask_db_parallel(db_path, ranges, mode, masking_data, out_f, options, log_callback)
 
-        # 결과 저장
-        suffix = "_MASKED.txt" if mode == "apply" else "_RESTORED.txt"
-        out_path = os.path.splitext(db_path)[0] + suffix
-    
-        with open(out_path, 'w', encoding='utf-8') as f:
-            f.writelines(updated_lines)
-        
+        os.replace(tmp_path, out_path)
         log_callback(f">> 처리 완료 ({count} 라인)")
         log_callback(f">> 저장 경로: {out_path}")
-    
+
     except Exception as e:
+        try: os.remove(tmp_path)
+        except OSError: pass
         log_callback(f"!! 작업 중 오류 발생: {e}")
+
+def _mask_db_parallel(db_path, ranges, mode, masking_data, out_f, options, log_callback):
+    """
+    구간별로 워커 프로세스에 맡기고, 끝난 구간을 원래 순서대로 이어 붙임.
+    동시에 진행되는 구간 수를 제한하여 임시 파일(디스크)과 메모리 사용량을 묶어둡니다.
+    """
+    workers = max(1, options.get('workers') or max(1, (os.cpu_count() or 2) - 1))
+    window = workers * 2
+    log_callback(f">> [병렬 모드] {len(ranges)}개 구간 / 워커 {workers}개")
+
+    part_dir = tempfile.mkdtemp(prefix="db_masking_", dir=os.path.dirname(os.path.abspath(db_path)))
+    count = 0
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_masking_pool, initargs=(masking_data,)) as executor:
+            pending = collections.deque()
+            range_iter = iter(enumerate(ranges))
+
+            def _submit_next():
+                item = next(range_iter, None)
+                if item is None: return False
+                idx, (start, end) = item
+                part_path = os.path.join(part_dir, f"part_{idx:06d}.txt")
+                pending.append(executor.submit(_worker_mask_range, (db_path, start, end, mode, part_path)))
+                return True
+
+            while len(pending) < window and _submit_next():
+                pass
+
+            done = 0
+            while pending:
+                part_path, part_count = pending.popleft().result()
+                _submit_next()
+                with open(part_path, 'r', encoding='utf-8', newline='') as part_f:
+                    shutil.copyfileobj(part_f, out_f)
+                os.remove(part_path)
+                count += part_count
+                done += 1
+                if done % 10 == 0 or done == len(ranges):
+                    log_callback(f">> [병렬 모드] {done}/{len(ranges)} 구간 완료 ({count:,}줄)")
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+    return count
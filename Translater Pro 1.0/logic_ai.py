@@ -1,20 +1,39 @@
 import os
+import sys
 import time
+import threading
+import concurrent.futures
+import collections
 import re
 import json
 import math
-import requests
-import tiktoken
+import sqlite3
+import hashlib
+import unicodedata
 import tempfile
+import importlib
 from datetime import datetime, timedelta
-from openai import OpenAI
-import anthropic
-import deepl
-from google import genai
-from google.genai import types
 
 import utils
 
+# ==========================================
+# [지연 로딩] 공급자 SDK
+# ==========================================
+# SDK(openai, anthropic, google.genai, deepl, tiktoken)와 requests는 가져오는 데만 수백 ms가 걸리므로
+# 프로그램 시작 시가 아니라 실제로 공급자를 만들거나 비용을 계산할 때 처음 한 번만 불러옵니다.
+_SDK_MODULES = {}
+_SDK_LOCK = threading.Lock()
+
+def _load_sdk(module_name):
+    module = _SDK_MODULES.get(module_name)
+    if module is None:
+        with _SDK_LOCK:
+            module = _SDK_MODULES.get(module_name)
+            if module is None:
+                module = importlib.import_module(module_name)
+                _SDK_MODULES[module_name] = module
+    return module
+
 # ==========================================
 # [설정] 기본 UI 표시용 모델 목록
 # ==========================================
@@ -25,36 +44,85 @@ PROVIDER_MODELS = {
     "DEEPL": ["DeepL API (Character based)"]
 }
 
+# 기본 프롬프트 (GUI 프롬프트 입력창 / CLI 공통)
+DEFAULT_PROMPT = (
+    "You are a professional game translator.\n"
+    "Output must be a JSON array of objects. Format: [{\"id\": 1, \"trans\": \"Korean text\"}, ...]\n"
+    "Do NOT translate or alter tokens like __MSK_0000__ (keep them exactly as-is).\n"
+    "Translate the 'text' field into natural Korean 'trans'."
+)
+
 class PricingEngine:
+    """
+    모델 가격표 (LiteLLM 커뮤니티 데이터).
+    import 시점에는 아무것도 읽지 않고, 처음 필요할 때 캐시(또는 실행 파일에 동봉된) 가격표를 읽습니다.
+    캐시가 오래되었으면 일단 기존 데이터로 동작하고 백그라운드에서 갱신합니다 (stale-while-revalidate).
+    새 데이터가 반영되면 add_listener()로 등록한 콜백이 (백그라운드 스레드에서) 호출됩니다.
+    """
     LITELLM_URL = "https://raw.githubusercontent.com/BerriAI/litellm/main/model_prices_and_context_window.json"
     CACHE_FILENAME = "pricing_cache.json"
     CACHE_DURATION = timedelta(days=1)
+    RETRY_INTERVAL = timedelta(minutes=10)  # 갱신 실패(오프라인 등) 후 재시도 간격
+    FETCH_TIMEOUT = 10
 
     def __init__(self):
         self.price_map = {}
         self.cache_path = self._determine_cache_path()
-        self.load_data()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._refresh_thread = None
+        self._last_attempt = None
+        self._listeners = []
 
     def _determine_cache_path(self):
-        try:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            candidate = os.path.join(base_dir, self.CACHE_FILENAME)
-            if not os.path.exists(candidate):
-                with open(candidate, 'w', encoding='utf-8') as f:
-                    f.write("{}")
-            return candidate
-        except:
-            return os.path.join(tempfile.gettempdir(), self.CACHE_FILENAME)
-
-    def load_data(self):
-        if self._is_cache_valid():
-            try:
-                with open(self.cache_path, "r", encoding="utf-8") as f:
-                    self.price_map = json.load(f)
-                self._update_global_models() 
+        # 프로그램 폴더에 쓸 수 없으면 임시 폴더 사용 (파일은 실제로 받아왔을 때만 생성)
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        if os.access(base_dir, os.W_OK):
+            return os.path.join(base_dir, self.CACHE_FILENAME)
+        return os.path.join(tempfile.gettempdir(), self.CACHE_FILENAME)
+
+    def _bundled_path(self):
+        """PyInstaller 등으로 동봉된 가격표 (읽기 전용, 캐시가 없을 때만 사용)"""
+        base_dir = getattr(sys, '_MEIPASS', None) or os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(base_dir, self.CACHE_FILENAME)
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try: callback()
+            except Exception as e: print(f"[PricingEngine] listener error: {e}")
+
+    def ensure_loaded(self):
+        """캐시/동봉 가격표를 한 번만 읽음 (네트워크 사용 안 함)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
                 return
-            except: pass
-        self.fetch_community_data()
+            for path in (self.cache_path, self._bundled_path()):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data:
+                        self.price_map = data
+                        break
+                except: continue
+            self._loaded = True
+        if self.price_map:
+            self._update_global_models()
+            self._notify()
+
+    def load_data(self, wait=False):
+        """
+        가격표를 준비하고, 캐시가 오래되었으면 백그라운드 갱신을 시작합니다.
+        :param wait: True이면 가격 데이터가 전혀 없을 때에 한해 진행 중인 갱신을 기다림 (작업 스레드 전용)
+        """
+        self.ensure_loaded()
+        thread = self.refresh_async() if not self._is_cache_valid() else None
+        if wait and thread and not self.price_map:
+            thread.join(self.FETCH_TIMEOUT + 5)
 
     def _is_cache_valid(self):
         if not os.path.exists(self.cache_path): return False
@@ -63,16 +131,45 @@ class PricingEngine:
             return datetime.now() - mtime < self.CACHE_DURATION
         except: return False
 
+    def refresh_async(self, force=False):
+        """
+        백그라운드 갱신 시작 (이미 진행 중이면 그 스레드를 반환)
+        :param force: True이면 최근 실패 여부와 관계없이 즉시 시도
+        """
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return self._refresh_thread
+            now = datetime.now()
+            if not force and self._last_attempt and now - self._last_attempt < self.RETRY_INTERVAL:
+                return None
+            self._last_attempt = now
+            self._refresh_thread = threading.Thread(target=self.fetch_community_data, daemon=True, name="PricingRefresh")
+            self._refresh_thread.start()
+            return self._refresh_thread
+
     def fetch_community_data(self):
+        """가격표를 받아 캐시에 저장하고 모델 목록 갱신 (동기 호출, 성공 여부 반환)"""
         try:
-            response = requests.get(self.LITELLM_URL, timeout=10)
+            response = _load_sdk('requests').get(self.LITELLM_URL, timeout=self.FETCH_TIMEOUT)
             response.raise_for_status()
-            self.price_map = response.json()
-            with open(self.cache_path, "w", encoding="utf-8") as f:
-                json.dump(self.price_map, f, ensure_ascii=False, indent=2)
-            self._update_global_models()
+            data = response.json()
         except Exception as e:
             print(f"[PricingEngine] Update failed: {e}")
+            return False
+
+        with self._lock:
+            self.price_map = data
+            self._loaded = True
+        try:
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"[PricingEngine] Cache save failed: {e}")
+        self._update_global_models()
+        self._notify()
+        return True
 
     def _update_global_models(self):
         global PROVIDER_MODELS
@@ -125,33 +222,347 @@ class PricingEngine:
             print(f"[PricingEngine] Update failed: {e}")
 
     def get_price(self, model_name):
+        self.ensure_loaded()
         if model_name in self.price_map:
             info = self.price_map[model_name]
             return info.get("input_cost_per_token", 0) * 1_000_000, info.get("output_cost_per_token", 0) * 1_000_000
         return 0.0, 0.0
 
+    def get_max_output_tokens(self, model_name):
+        """모델의 최대 출력 토큰 수 (가격표에 없으면 None)"""
+        self.ensure_loaded()
+        info = self.price_map.get(model_name) or {}
+        value = info.get("max_output_tokens") or info.get("max_tokens")
+        return value if isinstance(value, int) and value > 0 else None
+
 pricing_engine = PricingEngine()
 
+# ==========================================
+# [속도 제한] 공급자/모델별 토큰 버킷 (RPM + TPM)
+# ==========================================
+# 기본 한도 (분당 요청 수, 분당 토큰 수). 0이면 해당 항목 제한 없음.
+# 실제 계정 등급에 맞게 옵션('rate_rpm', 'rate_tpm')으로 덮어쓸 수 있음
+DEFAULT_RATE_LIMITS = {
+    "OPENAI": (500, 200_000),
+    "ANTHROPIC": (50, 40_000),
+    "GOOGLE": (150, 1_000_000),
+    "DEEPL": (60, 0),
+}
+RATE_BURST_SECONDS = 10      # 버킷 용량 = 몇 초 분량의 한도를 한 번에 쓸 수 있는가
+RATE_MIN_SCALE = 0.1         # 429 반복 시 최저 속도 (설정 한도 대비)
+
+def estimate_tokens(text):
+    """토크나이저 없이 빠르게 토큰 수 추산 (영문 약 4글자당 1토큰, 한중일 문자는 1글자당 약 1토큰)"""
+    if not text: return 0
+    ascii_len = len(text.encode('ascii', 'ignore'))
+    return int(ascii_len / 4) + (len(text) - ascii_len) + 1
+
+def estimate_request_tokens(system_prompt, user_text):
+    """요청 1건의 예상 토큰 (입력 전체 + 출력은 입력 데이터의 1.2배 가정)"""
+    payload = estimate_tokens(user_text)
+    return estimate_tokens(system_prompt) + payload + int(payload * 1.2)
+
+def load_tiktoken_encoding(model):
+    """OpenAI 모델용 tiktoken 인코더 (tiktoken 미설치 시 ImportError)"""
+    tiktoken = _load_sdk('tiktoken')
+    try: return tiktoken.encoding_for_model(model)
+    except Exception: return tiktoken.get_encoding("cl100k_base")
+
+_JSON_DECODER = json.JSONDecoder()
+
+def parse_translation_items(response_text):
+    """
+    AI 응답에서 {id, trans} 항목 목록을 꺼냅니다.
+    전체 JSON 파싱에 실패하면(잘린 응답, 앞뒤 잡담 등) 본문에서 완전한 형태로 남아 있는 객체만 골라냅니다.
+    :return: (항목 목록, 전체 파싱 성공 여부)
+    """
+    clean_json = re.sub(r"```json|```", "", response_text or "").strip()
+    if not clean_json:
+        return [], False
+
+    try:
+        data = json.loads(clean_json)
+    except json.JSONDecodeError:
+        items = []
+        pos = 0
+        while True:
+            start = clean_json.find('{', pos)
+            if start < 0:
+                break
+            try:
+                obj, end = _JSON_DECODER.raw_decode(clean_json, start)
+            except json.JSONDecodeError:
+                pos = start + 1
+                continue
+            if isinstance(obj, dict) and 'id' in obj:
+                items.append(obj)
+                pos = end
+            else:
+                pos = start + 1  # 감싸는 객체 등 -> 안쪽 항목을 계속 탐색
+        return items, False
+
+    if isinstance(data, dict):
+        # JSON 모드에서 {"translations": [...]}처럼 목록을 한 번 감싸서 응답하는 경우
+        lists = [v for v in data.values() if isinstance(v, list)]
+        data = lists[0] if 'id' not in data and len(lists) == 1 else [data]
+    if not isinstance(data, list):
+        return [], True
+    return [item for item in data if isinstance(item, dict)], True
+
+def is_rate_limit_error(e):
+    if getattr(e, 'status_code', None) == 429 or getattr(e, 'code', None) == 429:
+        return True
+    error_str = str(e)
+    return "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "rate limit" in error_str.lower()
+
+def extract_retry_after(e):
+    """예외에서 서버가 알려준 대기 시간(초)을 추출 (Retry-After 헤더 / Gemini retryDelay)"""
+    response = getattr(e, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers:
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers.get('retry-after-ms')) / 1000
+            if headers.get('retry-after'):
+                return float(headers.get('retry-after'))
+        except (TypeError, ValueError): pass
+
+    m = re.search(r"retry[_ ]?delay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", str(e), re.IGNORECASE)
+    if not m:
+        m = re.search(r"retry in (\d+(?:\.\d+)?)\s*s", str(e), re.IGNORECASE)
+    return float(m.group(1)) if m else None
+
+class RequestCancelled(Exception):
+    """속도 제한/재시도 대기 중에 작업이 취소됨 (요청을 보내지 않음)"""
+
+class RateLimiter:
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM) 두 개의 토큰 버킷으로 요청 시작을 조절합니다.
+    429 응답을 받으면 Retry-After 만큼 전체 요청을 멈추고 속도를 낮췄다가, 성공이 이어지면 서서히 복구합니다.
+    (여러 스레드가 같은 인스턴스를 공유)
+    """
+    def __init__(self, rpm, tpm):
+        self._lock = threading.Lock()
+        self._scale = 1.0
+        self._strikes = 0
+        self._paused_until = 0.0
+        self._last = time.monotonic()
+        self.configure(rpm, tpm)
+        self._req_avail = self._req_cap
+        self._tok_avail = self._tok_cap
+
+    def configure(self, rpm, tpm):
+        self.rpm = max(0, rpm or 0)
+        self.tpm = max(0, tpm or 0)
+        self._req_cap = max(1.0, self.rpm * RATE_BURST_SECONDS / 60)
+        self._tok_cap = max(1.0, self.tpm * RATE_BURST_SECONDS / 60)
+
+    def _refill(self, now):
+        elapsed = now - self._last
+        self._last = now
+        if self.rpm:
+            self._req_avail = min(self._req_cap, self._req_avail + elapsed * self.rpm / 60 * self._scale)
+        if self.tpm:
+            self._tok_avail = min(self._tok_cap, self._tok_avail + elapsed * self.tpm / 60 * self._scale)
+
+    def acquire(self, tokens=0, control=None):
+        """
+        요청 1건(+예상 토큰)을 보낼 수 있을 때까지 대기
+        :param control: utils.JobControl (선택). 대기 중 취소되면 RequestCancelled
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+
+                if wait <= 0:
+                    # 버킷 용량보다 큰 요청은 가득 찼을 때 보낼 수 있도록 상한 적용
+                    need_tok = min(tokens, self._tok_cap) if self.tpm else 0
+                    req_short = (1 - self._req_avail) if self.rpm else 0
+                    tok_short = (need_tok - self._tok_avail) if self.tpm else 0
+
+                    if req_short <= 0 and tok_short <= 0:
+                        if self.rpm: self._req_avail -= 1
+                        if self.tpm: self._tok_avail -= need_tok
+                        return
+
+                    wait = max(
+                        req_short / (self.rpm / 60 * self._scale) if req_short > 0 else 0,
+                        tok_short / (self.tpm / 60 * self._scale) if tok_short > 0 else 0
+                    )
+            self._sleep(min(max(wait, 0.01), 5.0), control)
+
+    @staticmethod
+    def _sleep(seconds, control):
+        if control is None:
+            time.sleep(seconds)
+        elif not control.sleep(seconds):
+            raise RequestCancelled()
+
+    def report_success(self):
+        with self._lock:
+            self._strikes = 0
+            self._scale = min(1.0, self._scale + 0.05)
+
+    def report_rate_limited(self, retry_after=None):
+        """429 발생: 모든 요청을 일시 정지하고 속도를 낮춤. 대기 시간(초) 반환"""
+        with self._lock:
+            self._strikes += 1
+            self._scale = max(RATE_MIN_SCALE, self._scale * 0.7)
+            wait = retry_after if retry_after else min(60.0, 2.0 ** self._strikes)
+            self._paused_until = max(self._paused_until, time.monotonic() + wait)
+            return wait
+
+    def wait_backoff(self, attempt, control=None):
+        """일시적 오류(서버 오류/네트워크 등) 재시도 대기 - 해당 요청만 대기 (취소되면 RequestCancelled)"""
+        self._sleep(min(30.0, 2.0 ** attempt), control)
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider, model, rpm=None, tpm=None):
+    """공급자+모델별 공유 RateLimiter 반환 (rpm/tpm 미지정 시 공급자 기본값)"""
+    default_rpm, default_tpm = DEFAULT_RATE_LIMITS.get(provider, (60, 0))
+    rpm = rpm or default_rpm
+    tpm = tpm or default_tpm
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get((provider, model))
+        if limiter is None:
+            limiter = RateLimiter(rpm, tpm)
+            _rate_limiters[(provider, model)] = limiter
+        elif (limiter.rpm, limiter.tpm) != (rpm, tpm):
+            with limiter._lock:
+                limiter.configure(rpm, tpm)
+        return limiter
+
+# ==========================================
+# [청크 구성] 토큰 예산 기반 청크 (응답 잘림/파싱 실패 시 자동 축소)
+# ==========================================
+# 공급자별 요청 1건의 입력 데이터 토큰 목표치 (옵션 'chunk_tokens'로 덮어쓸 수 있음)
+DEFAULT_CHUNK_TOKENS = {
+    "OPENAI": 2000,
+    "ANTHROPIC": 1500,
+    "GOOGLE": 3000,
+    "DEEPL": 3000,
+}
+CHUNK_ITEM_OVERHEAD_TOKENS = 8   # 줄마다 붙는 {"id": n, "text": ...} 구조 비용
+CHUNK_OUTPUT_RATIO = 1.2         # 출력 = 입력 데이터의 약 1.2배 (estimate_request_tokens와 같은 가정)
+CHUNK_OUTPUT_SAFETY = 0.7        # 모델 최대 출력 중 실제로 채울 비율
+CHUNK_MAX_LINES = 200            # 짧은 줄이라도 한 요청에 넣는 최대 줄 수
+CHUNK_MIN_TOKENS = 100
+CHUNK_SHRINK_RATIO = 0.5         # 실패 시 실패한 청크 크기 대비 축소 비율
+CHUNK_GROW_RATIO = 1.25          # 연속 성공 시 회복 비율 (목표치까지)
+CHUNK_GROW_AFTER = 8             # 회복에 필요한 연속 성공 횟수
+CHUNK_RECOVERY_MAX_REQUESTS = 12 # 청크 하나에서 누락 줄을 나눠 다시 보내는 최대 요청 수
+
+def resolve_chunk_tokens(provider, model, requested=0, max_output_tokens=None):
+    """
+    청크 1개의 입력 데이터 토큰 예산.
+    지정값(없으면 공급자 기본값)을 모델 최대 출력(가격표) 및 공급자 요청 한도에 맞게 제한합니다.
+    """
+    target = requested or DEFAULT_CHUNK_TOKENS.get(provider, 1500)
+    limits = [v for v in (max_output_tokens, pricing_engine.get_max_output_tokens(model)) if v]
+    if limits:
+        target = min(target, int(min(limits) * CHUNK_OUTPUT_SAFETY / CHUNK_OUTPUT_RATIO))
+    return max(CHUNK_MIN_TOKENS, int(target))
+
+class ChunkBudget:
+    """
+    청크를 고정 줄 수 대신 토큰 예산으로 구성합니다.
+    짧은 UI 문자열은 한 요청에 많이 묶어 요청 수를 줄이고, 긴 독백 줄은 출력 한도를 넘지 않게 적게 묶습니다.
+    응답 잘림/JSON 파싱 실패가 나면 실패한 청크 크기의 절반으로 예산을 줄이고,
+    성공이 이어지면 목표치까지 서서히 되돌립니다. (여러 스레드가 공유)
+    """
+    def __init__(self, target_tokens, count_tokens=None, max_lines=CHUNK_MAX_LINES):
+        self.target = max(CHUNK_MIN_TOKENS, int(target_tokens))
+        self.current = self.target
+        self.max_lines = max(1, int(max_lines))
+        self.count_tokens = count_tokens or estimate_tokens
+        self._lock = threading.Lock()
+        self._streak = 0
+
+    def line_cost(self, line):
+        return self.count_tokens(line) + CHUNK_ITEM_OVERHEAD_TOKENS
+
+    def split(self, lines):
+        """현재 예산에 맞춰 청크를 하나씩 생성 (도중에 예산이 바뀌면 다음 청크부터 반영)"""
+        chunk = []
+        used = 0
+        for line in lines:
+            cost = self.line_cost(line)
+            if chunk and (used + cost > self.current or len(chunk) >= self.max_lines):
+                yield chunk
+                chunk, used = [], 0
+            chunk.append(line)
+            used += cost
+        if chunk:
+            yield chunk
+
+    def report_success(self):
+        with self._lock:
+            self._streak += 1
+            if self._streak >= CHUNK_GROW_AFTER and self.current < self.target:
+                self.current = min(self.target, int(self.current * CHUNK_GROW_RATIO))
+                self._streak = 0
+
+    def report_failure(self, chunk):
+        """실패한 청크 기준으로 예산 축소. :return: (이전 예산, 새 예산)"""
+        used = sum(self.line_cost(line) for line in chunk)
+        with self._lock:
+            self._streak = 0
+            old = self.current
+            self.current = max(CHUNK_MIN_TOKENS, min(self.current, int(used * CHUNK_SHRINK_RATIO)))
+            return old, self.current
+
 class BaseProvider:
+    max_output_tokens = None  # 요청에 고정으로 지정하는 최대 출력 토큰 (없으면 모델 한도)
+    control = None            # utils.JobControl (TranslationProcessor가 지정, 재시도 대기 중 취소용)
+    json_items = True         # 응답이 {id, trans} JSON 목록인지 (아니면 누락 줄을 나눠 다시 요청하지 않음)
+
     def __init__(self, options):
         self.options = options
         self.temperature = options.get('temperature', 0.1)
+        self.rate_limiter = get_rate_limiter(
+            options.get('provider'), options.get('model'),
+            options.get('rate_rpm'), options.get('rate_tpm')
+        )
 
     def translate(self, system_prompt, user_text, retry_count=3):
+        limiter = self.rate_limiter
+        tokens = estimate_request_tokens(system_prompt, user_text)
         for attempt in range(retry_count):
+            limiter.acquire(tokens, self.control)
             try:
-                return self._call_api(system_prompt, user_text)
+                result = self._call_api(system_prompt, user_text)
+                limiter.report_success()
+                return result
             except Exception as e:
                 if attempt == retry_count - 1:
                     raise e
-                time.sleep(2 ** attempt) 
+                if is_rate_limit_error(e):
+                    wait = limiter.report_rate_limited(extract_retry_after(e))
+                    print(f"[RateLimit] 429 한도 초과. {wait:.1f}초 대기 후 재시도... ({attempt+1}/{retry_count})")
+                else:
+                    limiter.wait_backoff(attempt, self.control)
         return ""
     def _call_api(self, system_prompt, user_text): raise NotImplementedError
 
+    # ---- 배치 API (비동기 대량 처리, 지원 공급자만) ----
+    supports_batch = False
+    def build_batch_request(self, custom_id, system_prompt, user_text): raise NotImplementedError
+    def submit_batch(self, batch_file): raise NotImplementedError
+    def poll_batch(self, batch_id): raise NotImplementedError
+    def fetch_batch_results(self, batch_id): raise NotImplementedError
+
 class OpenAIProvider(BaseProvider):
+    supports_batch = True
+    BATCH_DONE_STATES = ("completed", "failed", "expired", "cancelled")
+
     def __init__(self, api_key, model, options):
         super().__init__(options)
-        self.client = OpenAI(api_key=api_key)
+        # api_base_url 미지정 시 SDK 기본값(OPENAI_BASE_URL 환경변수 포함) 사용
+        self.client = _load_sdk('openai').OpenAI(api_key=api_key, base_url=options.get('api_base_url') or None)
         self.model = model
         
     def _call_api(self, system_prompt, user_text):
@@ -166,24 +577,102 @@ class OpenAIProvider(BaseProvider):
         )
         return response.choices[0].message.content.strip()
 
+    def build_batch_request(self, custom_id, system_prompt, user_text):
+        body = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_text}],
+            "temperature": self.temperature,
+        }
+        if self.options.get('force_json'):
+            body["response_format"] = {"type": "json_object"}
+        return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+
+    def submit_batch(self, batch_file):
+        with open(batch_file, "rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        return batch.id
+
+    def poll_batch(self, batch_id):
+        """:return: (완료 여부, 상태 문자열)"""
+        batch = self.client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        detail = f"{batch.status} ({counts.completed}/{counts.total})" if counts else batch.status
+        return batch.status in self.BATCH_DONE_STATES, detail
+
+    def fetch_batch_results(self, batch_id):
+        """{custom_id: 응답 텍스트} (실패한 요청은 제외)"""
+        batch = self.client.batches.retrieve(batch_id)
+        results = {}
+        if not batch.output_file_id:
+            return results
+        content = self.client.files.content(batch.output_file_id).text
+        for line in content.splitlines():
+            if not line.strip(): continue
+            item = json.loads(line)
+            response = item.get('response') or {}
+            if response.get('status_code') != 200: continue
+            choices = response.get('body', {}).get('choices') or []
+            if choices:
+                results[item['custom_id']] = (choices[0]['message'].get('content') or "").strip()
+        return results
+
 class AnthropicProvider(BaseProvider):
+    supports_batch = True
+    max_output_tokens = 4096
+
     def __init__(self, api_key, model, options):
         super().__init__(options)
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # api_base_url 미지정 시 SDK 기본값(ANTHROPIC_BASE_URL 환경변수 포함) 사용
+        self.client = _load_sdk('anthropic').Anthropic(api_key=api_key, base_url=options.get('api_base_url') or None)
         self.model = model
         
     def _call_api(self, system_prompt, user_text):
         # Claude는 response_format 파라미터가 다름 (현재는 프롬프트 의존성이 높음)
         response = self.client.messages.create(
-            model=self.model, max_tokens=4096, system=system_prompt,
+            model=self.model, max_tokens=self.max_output_tokens, system=system_prompt,
             messages=[{"role": "user", "content": user_text}], 
             temperature=self.temperature
         )
         return response.content[0].text.strip()
 
+    def build_batch_request(self, custom_id, system_prompt, user_text):
+        return {
+            "custom_id": custom_id,
+            "params": {
+                "model": self.model, "max_tokens": self.max_output_tokens, "system": system_prompt,
+                "messages": [{"role": "user", "content": user_text}],
+                "temperature": self.temperature
+            }
+        }
+
+    def submit_batch(self, batch_file):
+        # Anthropic은 파일 업로드 없이 요청 목록을 직접 전송 (파일은 기록/재연결용)
+        with open(batch_file, "r", encoding="utf-8") as f:
+            batch_requests = [json.loads(line) for line in f if line.strip()]
+        batch = self.client.messages.batches.create(requests=batch_requests)
+        return batch.id
+
+    def poll_batch(self, batch_id):
+        batch = self.client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        finished = counts.succeeded + counts.errored + counts.canceled + counts.expired
+        return batch.processing_status == "ended", f"{batch.processing_status} ({finished}/{finished + counts.processing})"
+
+    def fetch_batch_results(self, batch_id):
+        results = {}
+        for entry in self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded" and entry.result.message.content:
+                results[entry.custom_id] = entry.result.message.content[0].text.strip()
+        return results
+
 class GoogleGeminiProvider(BaseProvider):
     def __init__(self, api_key, model, options):
         super().__init__(options)
+        genai = _load_sdk('google.genai')
+        self.types = types = _load_sdk('google.genai.types')
         self.client = genai.Client(api_key=api_key)
         self.model_name = model
         
@@ -200,58 +689,48 @@ class GoogleGeminiProvider(BaseProvider):
         # [변경] force_json 옵션에 따라 MIME Type 결정
         mime_type = "application/json" if self.options.get('force_json') else "text/plain"
         
-        max_retries = 10
-        base_wait_time = 60
-
-        for attempt in range(max_retries):
-            try:
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=full_prompt,
-                    config=types.GenerateContentConfig(
-                        safety_settings=self.safety_settings,
-                        temperature=self.temperature,
-                        response_mime_type=mime_type
-                    )
+        try:
+            response = self.client.models.generate_content(
+                model=self.model_name,
+                contents=full_prompt,
+                config=self.types.GenerateContentConfig(
+                    safety_settings=self.safety_settings,
+                    temperature=self.temperature,
+                    response_mime_type=mime_type
                 )
+            )
+        except Exception as e:
+            if "NoneType" in str(e):
+                return "{}"
+            raise  # 429 등은 BaseProvider의 속도 제한/재시도 로직에서 처리
 
-                if response.text:
-                    return response.text.strip()
-                else:
-                    print(f"!! [경고] Gemini 응답 공백 (필터됨). 원문 유지.")
-                    return "{}" 
-            
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
-                    wait_time = base_wait_time + (attempt * 10)
-                    print(f"\n[Gemini] 429 한도 초과. {wait_time}초 대기... ({attempt+1}/{max_retries})")
-                    time.sleep(wait_time)
-                    continue
-                
-                if "NoneType" in error_str:
-                    return "{}"
-
-                print(f"!! [오류] Gemini API 호출 중 문제: {e}")
-                if attempt == max_retries - 1:
-                    return "{}"
-                time.sleep(2)
+        if response.text:
+            return response.text.strip()
+        else:
+            print(f"!! [경고] Gemini 응답 공백 (필터됨). 원문 유지.")
+            return "{}" 
 
-        return "{}"
+    def translate(self, system_prompt, user_text, retry_count=10):
+        # Gemini는 429가 잦으므로 재시도 횟수를 늘림
+        # (최종 실패는 예외로 올려 호출 측에서 API 오류로 기록 - 빈 응답으로 바꾸면 누락으로 오인하여 재요청함)
+        return super().translate(system_prompt, user_text, retry_count)
 
 class DeepLProvider(BaseProvider):
-    def __init__(self, api_key):
-        self.translator = deepl.Translator(api_key)
+    json_items = False  # 입력 JSON을 문자열째 번역하므로 {id, trans} 형식이 아님
+
+    def __init__(self, api_key, options):
+        super().__init__(options)
+        self.translator = _load_sdk('deepl').Translator(api_key)
     def _call_api(self, system_prompt, user_text):
         result = self.translator.translate_text(user_text, target_lang="KO", preserve_formatting=True)
         return result.text
 
-def calculate_estimates(target_path, provider, model, log_callback):
+def calculate_estimates(target_path, provider, model, log_callback, options=None):
     if not target_path or not os.path.exists(target_path):
         log_callback("!! 대상 경로가 올바르지 않습니다.")
         return None
         
-    pricing_engine.load_data()
+    pricing_engine.load_data(wait=True)  # 가격표가 전혀 없을 때만 갱신을 기다림
     
     total_chars = 0
     total_tokens = 0
@@ -260,8 +739,10 @@ def calculate_estimates(target_path, provider, model, log_callback):
     
     enc = None
     if provider == "OPENAI":
-        try: enc = tiktoken.encoding_for_model(model)
-        except: enc = tiktoken.get_encoding("cl100k_base")
+        try:
+            enc = load_tiktoken_encoding(model)
+        except ImportError:
+            log_callback(">> tiktoken 미설치: 글자 수 기반으로 토큰을 추정합니다.")
 
     # [수정] 파일인지 폴더인지 판단하여 목록 생성
     files_to_process = []
@@ -274,7 +755,7 @@ def calculate_estimates(target_path, provider, model, log_callback):
     else:
         # 폴더인 경우
         root_dir = target_path
-        files_to_process = [f for f in os.listdir(root_dir) if f.lower().endswith(('.txt', '.json'))]
+        files_to_process = list(utils.iter_stage_files(root_dir, utils.ESTIMATE_EXTENSIONS, options))
     
     if not files_to_process:
         log_callback("!! 처리할 텍스트 파일(.txt, .json)이 없습니다.")
@@ -315,9 +796,12 @@ def calculate_estimates(target_path, provider, model, log_callback):
         output_cost = ((total_tokens * 1.2) / 1_000_000) * out_price 
         estimated_cost = input_cost + output_cost
 
-    # 예상 시간 (청크 단위 요청 딜레이 고려)
-    CHUNK_SIZE = 20
-    total_chunks = math.ceil(total_lines / CHUNK_SIZE)
+    # 예상 시간 (토큰 예산 청크 기준 요청 수 x 요청당 평균 소요)
+    chunk_tokens = resolve_chunk_tokens(provider, model, int((options or {}).get('chunk_tokens', 0) or 0))
+    total_chunks = max(
+        math.ceil((total_tokens + total_lines * CHUNK_ITEM_OVERHEAD_TOKENS) / chunk_tokens),
+        math.ceil(total_lines / CHUNK_MAX_LINES)
+    )
     estimated_time_sec = total_chunks * 2.5 
 
     log_callback(f"=== [{provider}] 견적 산출 결과 ===")
@@ -329,31 +813,251 @@ def calculate_estimates(target_path, provider, model, log_callback):
     
     return {"cost": estimated_cost, "time_sec": estimated_time_sec, "files": file_count, "lines": total_lines}
 
+# ==========================================
+# [번역 메모리] 이미 번역한 문장 재사용 (SQLite)
+# ==========================================
+class TranslationMemory:
+    """
+    원문 -> 번역문(마스킹 복원 전 AI 응답) 영구 저장소.
+    같은 공급자/모델/프롬프트/용어집 조합(namespace)에서 번역한 줄은 다시 요청하지 않습니다.
+    여러 스레드에서 공유하므로 하나의 연결을 잠금으로 보호합니다.
+    """
+    DB_FILENAME = "translation_memory.sqlite3"
+
+    def __init__(self, namespace, db_path=None):
+        self.namespace = namespace
+        self.db_path = db_path or self._determine_db_path()
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS tm ("
+                " ns TEXT NOT NULL, src TEXT NOT NULL, trans TEXT NOT NULL, updated REAL,"
+                " PRIMARY KEY (ns, src)) WITHOUT ROWID"
+            )
+            self.conn.commit()
+
+    def _determine_db_path(self):
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        if os.access(base_dir, os.W_OK):
+            return os.path.join(base_dir, self.DB_FILENAME)
+        return os.path.join(tempfile.gettempdir(), self.DB_FILENAME)
+
+    @staticmethod
+    def make_namespace(provider, model, system_prompt, glossary_items, auto_mask):
+        """공급자 + 모델 + 프롬프트 해시 + 용어집 해시 (+마스킹 여부)로 캐시 구역 결정"""
+        glossary_sig = json.dumps(
+            [(g['src'], g['tgt'], g.get('hint', ''), g['mask_id']) for g in glossary_items],
+            ensure_ascii=False
+        )
+        prompt_hash = hashlib.sha256((system_prompt or "").encode('utf-8')).hexdigest()[:16]
+        glossary_hash = hashlib.sha256(glossary_sig.encode('utf-8')).hexdigest()[:16]
+        return f"{provider}|{model}|p:{prompt_hash}|g:{glossary_hash}|m:{int(bool(auto_mask))}"
+
+    @staticmethod
+    def normalize(text):
+        return unicodedata.normalize('NFC', text.strip())
+
+    def get_many(self, texts):
+        """
+        {원문: 번역문} 중 저장된 항목만 반환
+        (정규화 결과가 같은 원문은 모두 같은 번역을 받음 - 예: 조합형/완성형만 다른 같은 줄)
+        """
+        raw_by_key = {}
+        for t in texts:
+            raw_by_key.setdefault(self.normalize(t), []).append(t)
+        keys = list(raw_by_key)
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):  # SQLite 변수 개수 제한 대비
+                part = keys[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self.conn.execute(
+                    f"SELECT src, trans FROM tm WHERE ns = ? AND src IN ({placeholders})",
+                    [self.namespace, *part]
+                ).fetchall()
+                for src, trans in rows:
+                    for raw in raw_by_key[src]:
+                        found[raw] = trans
+        return found
+
+    def put_many(self, pairs):
+        if not pairs: return
+        now = time.time()
+        rows = [(self.namespace, self.normalize(src), trans, now) for src, trans in pairs.items() if trans]
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO tm (ns, src, trans, updated) VALUES (?, ?, ?, ?)", rows)
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+# ==========================================
+# [이어하기] 청크 단위 작업 저널 (Append-only JSONL)
+# ==========================================
+class ResumeJournal:
+    """
+    완료된 청크의 {원문: 최종 번역문}을 한 줄씩 덧붙여 기록합니다.
+    프로그램이 중간에 종료되어도 다음 실행에서 기록된 줄은 다시 요청하지 않습니다.
+    첫 줄은 작업 서명(header)이며, 서명이 다르면(공급자/모델/프롬프트/용어집 변경) 새로 시작합니다.
+    """
+    VERSION = 1
+    SUFFIX = "_ai_journal.jsonl"
+
+    def __init__(self, out_target, signature, resume=True):
+        self.path = os.path.normpath(out_target) + self.SUFFIX
+        self.signature = signature
+        self.entries = {}
+        self.resumed = False
+        self._lock = threading.Lock()
+
+        if resume:
+            self.entries = self._load()
+            self.resumed = bool(self.entries)
+
+        if self.resumed:
+            self._fp = open(self.path, 'a', encoding='utf-8')
+        else:
+            self._fp = open(self.path, 'w', encoding='utf-8')
+            self._write_line({'version': self.VERSION, 'sig': signature})
+
+    def _load(self):
+        """서명이 일치하는 저널의 기록을 읽어옴 (비정상 종료로 잘린 마지막 줄은 무시)"""
+        entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get('version') != self.VERSION or header.get('sig') != self.signature:
+                    return {}
+                for line in f:
+                    try:
+                        entries.update(json.loads(line).get('c', {}))
+                    except json.JSONDecodeError:
+                        continue
+        except (OSError, ValueError):
+            return {}
+        return entries
+
+    def _write_line(self, obj):
+        self._fp.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+
+    def record(self, translation_map):
+        if not translation_map: return
+        with self._lock:
+            self._write_line({'c': translation_map})
+
+    def close(self, completed=False):
+        with self._lock:
+            self._fp.close()
+        if completed:
+            try: os.remove(self.path)
+            except OSError: pass
+
+# ==========================================
+# [배치 API] 제출 파일 / 상태 파일
+# ==========================================
+BATCH_FILE_SUFFIX = "_ai_batch.jsonl"
+BATCH_STATE_SUFFIX = "_ai_batch_state.json"
+
+# [실패 보고서] 재요청까지 실패하여 원문으로 남은 줄 목록 (<출력>_ai_failures.jsonl)
+FAILURE_REPORT_SUFFIX = "_ai_failures.jsonl"
+BATCH_POLL_INTERVAL = 30  # 초
+
 # ==========================================
 # [메인 로직: 번역 프로세서]
 # ==========================================
 class TranslationProcessor:
-    def __init__(self, options, log_callback, progress_callback=None):
+    def __init__(self, options, log_callback, progress_callback=None, control=None):
         self.options = options
         self.log = log_callback
         self.progress = progress_callback
+        # 일시정지/취소 (utils.JobControl, 선택). 취소되면 새 요청을 보내지 않고 완료된 결과만 저장
+        self.control = control
+        self.stopped = False
+        self.failures = []  # 최종 실패한 줄 (실패 보고서용)
         self.glossary_mgr = GlossaryManager(options.get('glossary_path'))
         self.provider = self._init_provider()
+        if self.provider:
+            self.provider.control = control
 
         self.chunk_size = options.get('chunk_size', 15)
+        self.chunk_budget = self._init_chunk_budget()
         self.system_prompt_base = options.get('system_prompt', "")
-        self.request_delay = options.get('request_delay', 0.5)
+        self.translations = {}  # 이번 실행에서 번역된 {원문: 번역문} (모든 파일 공유)
+        self.journal = None
+
+        # 번역 메모리 (실패해도 번역 자체는 계속 진행)
+        self.memory = None
+        self.memory_hits = 0
+        self._stats_lock = threading.Lock()
+        if options.get('use_tm', True):
+            try:
+                namespace = TranslationMemory.make_namespace(
+                    options.get('provider'), options.get('model'), self.system_prompt_base,
+                    self.glossary_mgr.term_map, options.get('auto_mask', True)
+                )
+                self.memory = TranslationMemory(namespace, options.get('tm_path'))
+            except Exception as e:
+                self.log(f"!! 번역 메모리 사용 불가: {e}")
 
     def _init_provider(self):
         p_name = self.options['provider']
         key = self.options['api_key']
         model = self.options['model']
-        if p_name == "OPENAI": return OpenAIProvider(key, model, self.options)
-        if p_name == "ANTHROPIC": return AnthropicProvider(key, model, self.options)
-        if p_name == "GOOGLE": return GoogleGeminiProvider(key, model, self.options)
-        if p_name == "DEEPL": return DeepLProvider(key, self.options)
+        try:
+            if p_name == "OPENAI": return OpenAIProvider(key, model, self.options)
+            if p_name == "ANTHROPIC": return AnthropicProvider(key, model, self.options)
+            if p_name == "GOOGLE": return GoogleGeminiProvider(key, model, self.options)
+            if p_name == "DEEPL": return DeepLProvider(key, self.options)
+        except ImportError as e:
+            # SDK는 처음 사용할 때 불러오므로 미설치 오류도 여기서 발생
+            self.log(f"!! {p_name} SDK를 불러올 수 없습니다: {e}")
         return None
 
+    def _init_chunk_budget(self):
+        """
+        토큰 예산 기반 청크 구성 (기본). 옵션 'adaptive_chunk'가 False이면 None -> 고정 줄 수('chunk_size')
+        'chunk_tokens': 청크 1개의 입력 토큰 예산 (0이면 공급자/모델 기본값)
+        """
+        if not self.options.get('adaptive_chunk', True) or not self.provider:
+            return None
+        count_tokens = estimate_tokens
+        if self.options['provider'] == "OPENAI":
+            try:
+                enc = load_tiktoken_encoding(self.options.get('model'))
+                count_tokens = lambda text: len(enc.encode(text))
+            except Exception:
+                pass  # tiktoken이 없으면 추정치 사용
+        target = resolve_chunk_tokens(
+            self.options['provider'], self.options.get('model'),
+            int(self.options.get('chunk_tokens', 0) or 0), getattr(self.provider, 'max_output_tokens', None)
+        )
+        return ChunkBudget(target, count_tokens)
+
+    def _iter_chunks(self, lines):
+        """줄 목록을 청크로 나눔 (토큰 예산 모드에서는 실패 후 줄어든 예산이 다음 청크부터 반영됨)"""
+        if self.chunk_budget is None:
+            for i in range(0, len(lines), self.chunk_size):
+                yield lines[i:i + self.chunk_size]
+        else:
+            yield from self.chunk_budget.split(lines)
+
+    def _report_chunk(self, chunk_map, complete):
+        """청크 결과를 예산에 반영 (응답이 잘렸거나 파싱에 실패하면 다음 청크부터 작게 구성)"""
+        if self.chunk_budget is None:
+            return
+        if complete:
+            self.chunk_budget.report_success()
+            return
+        old, new = self.chunk_budget.report_failure([info['orig'] for info in chunk_map.values()])
+        if new < old:
+            self.log(f">> 청크 토큰 예산 축소: {old} -> {new} (응답 잘림/파싱 실패)")
+
     def run(self, input_path, out_target):
         """
         out_target: 사용자가 지정한 출력 경로 (파일일 수도, 폴더일 수도 있음)
@@ -401,7 +1105,7 @@ class TranslationProcessor:
         elif os.path.isdir(input_path):
             # 폴더 일괄 모드
             src_root = input_path
-            target_files = [f for f in os.listdir(src_root) if f.lower().endswith(('.txt', '.json', '.ini'))]
+            target_files = list(utils.iter_stage_files(src_root, utils.AI_EXTENSIONS, self.options, skip_dirs=[output_dir]))
             self.log(f">> [모드] 폴더 일괄 번역: {len(target_files)}개 파일 발견")
         else:
             self.log(f"!! 오류: 경로를 찾을 수 없습니다: {input_path}")
@@ -430,7 +1134,7 @@ class TranslationProcessor:
                         # 입력도 1개, 출력도 파일 지정이면 사용자가 정한 이름 그대로 사용
                         final_out_path = out_target
                     else:
-                        # 그 외에는 출력 폴더 내에 원본 파일명 유지
+                        # 그 외에는 출력 폴더 내에 원본 상대 경로(하위 폴더 포함) 유지
                         final_out_path = os.path.join(output_dir, fname)
 
                     tasks.append({
@@ -448,106 +1152,566 @@ class TranslationProcessor:
             return
 
         self.log(f">> 총 {len(tasks)}개 파일, 약 {total_lines_global} 라인 처리 시작")
-        self.log(f">> 설정 확인: Chunk={self.chunk_size}, Temp={self.options.get('temperature')}, JSON모드={'ON' if self.options.get('force_json') else 'OFF'}")
 
-        current_processed_count = 0
-        
-        for task in tasks:
-            self.log(f">> [처리 시작] {task['fname']}")
+        # [이어하기] 이전 실행에서 완료된 청크 결과 불러오기
+        self.journal = None
+        try:
+            self.journal = ResumeJournal(out_target, self._get_job_signature(input_path), self.options.get('resume', True))
+            if self.journal.resumed:
+                self.translations.update(self.journal.entries)
+                self.log(f">> 이어하기: 이전 작업에서 완료된 {len(self.journal.entries)}줄을 불러왔습니다.")
+        except Exception as e:
+            self.log(f"!! 작업 저널 사용 불가 (이어하기 비활성): {e}")
+
+        # [중복 제거] 여러 파일에 반복되는 줄은 처음 등장한 파일에서 한 번만 번역
+        unique_lines = self._dedupe_tasks(tasks)
+        if unique_lines < total_lines_global:
+            saved_ratio = (1 - unique_lines / total_lines_global) * 100
+            self.log(f">> 중복 제거: {total_lines_global}줄 -> 고유 {unique_lines}줄 ({saved_ratio:.1f}% 요청 절감)")
+        total_lines_global = unique_lines
+
+        # 저널에 기록된 줄은 요청 대상에서 제외 (남은 줄이 없는 파일은 바로 저장됨)
+        if self.translations:
+            for task in tasks:
+                task['lines'] = [l for l in task['lines'] if self._extract_key(l) not in self.translations]
+            total_lines_global = sum(len(task['lines']) for task in tasks)
+        if self.chunk_budget is not None:
+            chunk_desc = f"토큰 예산 {self.chunk_budget.target} (최대 {self.chunk_budget.max_lines}줄)"
+        else:
+            chunk_desc = f"{self.chunk_size}줄 고정"
+        self.log(f">> 설정 확인: Chunk={chunk_desc}, Temp={self.options.get('temperature')}, JSON모드={'ON' if self.options.get('force_json') else 'OFF'}")
+        limiter = getattr(self.provider, 'rate_limiter', None)
+        if limiter:
+            self.log(f">> 속도 제한: {limiter.rpm or '무제한'} RPM / {limiter.tpm or '무제한'} TPM (429 발생 시 자동 감속)")
+
+        max_concurrency = max(1, int(self.options.get('max_concurrency', 1) or 1))
+        use_batch = self.options.get('batch_mode', False)
+        if use_batch and not self.provider.supports_batch:
+            self.log(f"!! {self.options['provider']}는 배치 API를 지원하지 않습니다. 일반 모드로 진행합니다.")
+            use_batch = False
+
+        if use_batch:
+            # [배치 모드] 모든 청크를 하나의 배치 파일로 제출하고 완료될 때까지 대기
+            self._run_batch(tasks, out_target, input_path)
+        elif max_concurrency > 1:
+            # [병렬 모드] 여러 파일의 청크를 동시에 요청 (최대 N개 in-flight)
+            self.log(f">> 동시 요청 모드: 최대 {max_concurrency}개 청크 병렬 처리")
+            self._run_concurrent(tasks, total_lines_global, max_concurrency)
+        else:
+            current_processed_count = 0
             
-            current_processed_count = self._process_file_internal(
-                task, current_processed_count, total_lines_global
-            )
+            for task in tasks:
+                if not self._checkpoint(): break
+                self.log(f">> [처리 시작] {task['fname']}")
+                
+                current_processed_count = self._process_file_internal(
+                    task, current_processed_count, total_lines_global
+                )
+
+        if self.memory:
+            self.log(f">> 번역 메모리 재사용: {self.memory_hits}줄 (API 요청 생략)")
+            self.memory.close()
+
+        if self.journal:
+            # 중단된 경우 저널을 남겨 두어 다음 실행에서 이어서 번역
+            self.journal.close(completed=not self.stopped)
+
+        self._write_failure_report(out_target)
+
+        if self.stopped:
+            self.log("=== 작업 중단: 완료된 청크까지 저장했습니다 (같은 설정으로 다시 실행하면 이어서 진행) ===")
+            return
 
         self.log("=== 모든 작업 완료 ===")
         if self.progress: self.progress(1.0, "완료")
 
-    def _process_file_internal(self, task, current_global_count, total_global_count):
-        fname = task['fname']
-        lines_to_process = task['lines']
-        out_path = task['out']
-        
-        translation_map = {}
-        
-        CHUNK_SIZE = self.chunk_size
-        SYSTEM_PROMPT_BASE = self.system_prompt_base
+    def _checkpoint(self):
+        """새 요청/파일을 시작해도 되는지 확인 (일시정지 중이면 대기). 취소되면 False"""
+        if self.control is None or self.control.checkpoint():
+            return True
+        if not self.stopped:
+            self.stopped = True
+            self.log(">> 작업 취소 요청: 새 요청을 보내지 않고 진행 중인 요청만 마무리합니다...")
+        return False
 
-        for i in range(0, len(lines_to_process), CHUNK_SIZE):
-            chunk = lines_to_process[i:i + CHUNK_SIZE]
-            
+    def _run_batch(self, tasks, out_target, input_path):
+        """
+        공급자의 비동기 배치 API로 모든 청크를 한 번에 처리합니다. (요금 할인, 높은 처리 한도)
+        제출 파일(<출력>_ai_batch.jsonl)과 배치 ID를 기록해 두어, 대기 중 프로그램이 종료되어도
+        같은 내용으로 다시 실행하면 새로 제출하지 않고 기존 배치에 다시 연결합니다.
+        """
+        batch_file = os.path.normpath(out_target) + BATCH_FILE_SUFFIX
+        state_file = os.path.normpath(out_target) + BATCH_STATE_SUFFIX
+        poll_interval = max(1, self.options.get('batch_poll_interval', BATCH_POLL_INTERVAL))
+
+        # 1. 청크 준비 (번역 메모리 적중분은 바로 반영)
+        pending = {}
+        for t_idx, task in enumerate(tasks):
+            for chunk_no, chunk in enumerate(self._iter_chunks(task['lines'])):
+                try:
+                    translation_map, chunk_map, system_prompt, input_json = self._prepare_chunk(chunk)
+                except Exception as e:
+                    self.log(f"!! 청크 준비 중 오류 ({task['fname']}): {e}")
+                    continue
+                self._commit_chunk(translation_map)
+                if chunk_map:
+                    custom_id = f"t{t_idx}-c{chunk_no}"
+                    pending[custom_id] = (chunk_no, chunk_map, system_prompt, input_json, task['fname'])
+
+        if pending:
+            # 2. 제출 파일 작성
+            with open(batch_file, "w", encoding="utf-8") as f:
+                for custom_id, (_, _, system_prompt, input_json, _) in pending.items():
+                    f.write(json.dumps(self.provider.build_batch_request(custom_id, system_prompt, input_json), ensure_ascii=False) + "\n")
+            with open(batch_file, "rb") as f:
+                batch_hash = hashlib.sha256(f.read()).hexdigest()
+
+            # 3. 제출 (같은 내용의 미완료 배치가 있으면 재연결)
+            batch_id = None
             try:
-                chunk_data = []
-                chunk_map = {} 
-                
-                for idx, line in enumerate(chunk):
-                    local_id = idx + 1
-                    
-                    if '=' in line:
-                        clean_text = line.split('=', 1)[0].strip()
-                    else:
-                        clean_text = line.strip()
-
-                    # [수정] 옵션에 따라 마스킹 적용 여부 결정
-                    if self.options.get('auto_mask', True):
-                        # 마스킹 적용
-                        masked_text, active_masks = self.glossary_mgr.apply_masking(clean_text)
-                    else:
-                        # 마스킹 미적용 (원문 그대로 사용)
-                        masked_text = clean_text
-                        active_masks = {}
-
-                    chunk_data.append({"id": local_id, "text": masked_text})
-                    chunk_map[local_id] = {"orig": clean_text, "masks": active_masks}
-
-                context_hint = ""
-                for c_item in chunk_data:
-                    masks = chunk_map[c_item['id']]['masks']
-                    if masks:
-                        for t, info in masks.items():
-                            if info['hint']:
-                                context_hint += f"Reference: {t} means {info['tgt']} (Context: {info['hint']})\n"
-                            else:
-                                context_hint += f"Reference: {t} means {info['tgt']}\n"
-
-                final_system_prompt = SYSTEM_PROMPT_BASE + context_hint
-                
-                input_json = json.dumps(chunk_data, ensure_ascii=False)
-                
-                response_text = self.provider.translate(final_system_prompt, input_json)
-                
+                with open(state_file, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get('hash') == batch_hash:
+                    batch_id = state.get('batch_id')
+                    self.log(f">> 기존 배치에 다시 연결: {batch_id}")
+            except (OSError, ValueError):
+                pass
+
+            if not batch_id:
+                self.log(f">> 배치 제출 중: 요청 {len(pending)}건 ({os.path.basename(batch_file)})")
+                batch_id = self.provider.submit_batch(batch_file)
+                with open(state_file, "w", encoding="utf-8") as f:
+                    json.dump({'batch_id': batch_id, 'hash': batch_hash, 'source': os.path.abspath(input_path)}, f)
+                self.log(f">> 배치 제출 완료: {batch_id} (최대 24시간 소요될 수 있음)")
+
+            # 4. 완료까지 폴링
+            while True:
+                if not self._checkpoint():
+                    # 배치는 서버에서 계속 진행되며, 상태 파일이 남아 있으므로 다시 실행하면 같은 배치에 연결됨
+                    self.log(f">> 배치 대기 중단: {batch_id} (같은 설정으로 다시 실행하면 결과를 이어서 받습니다)")
+                    return
+                try:
+                    done, detail = self.provider.poll_batch(batch_id)
+                except Exception as e:
+                    done, detail = False, f"상태 조회 실패: {e}"
+                self.log(f">> 배치 상태: {detail}")
+                if self.progress: self.progress(0.5 if not done else 0.9, f"배치 대기 중: {detail}")
+                if done: break
+                if self.control is not None:
+                    self.control.sleep(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+
+            # 5. 결과 병합 (기존 JSON 해석 + 마스킹 복원 경로 재사용)
+            # 응답이 잘렸거나 일부 줄이 빠진 청크는 빠진 줄만 일반 API로 나눠서 다시 요청
+            results = self.provider.fetch_batch_results(batch_id)
+            for custom_id, (chunk_no, chunk_map, _, _, fname) in pending.items():
+                response_text = results.get(custom_id)
+                if response_text is None:
+                    self._record_failures(chunk_map, list(chunk_map), fname, chunk_no, "배치 요청 실패")
+                    continue
+                translation_map = {}
                 try:
-                    clean_json = re.sub(r"```json|```", "", response_text).strip()
-                    if clean_json:
-                        translated_list = json.loads(clean_json)
-                        if isinstance(translated_list, dict): translated_list = [translated_list]
-                        
-                        for item in translated_list:
-                            lid = item.get('id')
-                            trans_text = item.get('trans')
-                            
-                            if lid in chunk_map and trans_text:
-                                orig_info = chunk_map[lid]
-                                # 옵션 키 'auto_restore'가 없으면 기본값 True (기존 동작 유지)
-                                if self.options.get('auto_restore', True):
-                                    final_trans = self.glossary_mgr.restore_masking(trans_text, orig_info['masks'])
-                                else:
-                                    # 해제하지 않고 저장
-                                    final_trans = trans_text
-                                translation_map[orig_info['orig']] = final_trans
-                except json.JSONDecodeError:
-                    self.log(f"!! JSON 파싱 실패 (청크 {i//CHUNK_SIZE}). 원문 유지.")
+                    missing, reason, retry = self._apply_response(response_text, chunk_map, translation_map, chunk_no)
+                    self._report_chunk(chunk_map, not missing)
+                    if missing:
+                        self._recover_missing(chunk_map, missing, reason, retry, translation_map, chunk_no, fname)
+                except Exception as e:
+                    self.log(f"!! 배치 결과 처리 중 오류 ({custom_id}): {e}")
+                self._commit_chunk(translation_map)
+
+            missing = len(pending) - sum(1 for c in pending if c in results)
+            if missing:
+                self.log(f"!! 배치 요청 {missing}건 실패. 해당 줄은 원문 유지.")
+            self.log(f">> 배치 결과 반영: {len(pending) - missing}/{len(pending)}건")
+
+            for path in (batch_file, state_file):
+                try: os.remove(path)
+                except OSError: pass
+
+        # 6. 저장
+        for task in tasks:
+            self._write_output(task, self.translations)
+
+    def _get_job_signature(self, input_path):
+        """결과에 영향을 주는 설정이 같을 때만 저널을 이어 씀"""
+        namespace = TranslationMemory.make_namespace(
+            self.options.get('provider'), self.options.get('model'), self.system_prompt_base,
+            self.glossary_mgr.term_map, self.options.get('auto_mask', True)
+        )
+        return f"{namespace}|r:{int(bool(self.options.get('auto_restore', True)))}|src:{os.path.abspath(input_path)}"
 
+    def _commit_chunk(self, translation_map):
+        """청크 결과를 공유 번역 결과에 반영하고 저널에 기록"""
+        self.translations.update(translation_map)
+        if self.journal:
+            try:
+                self.journal.record(translation_map)
             except Exception as e:
-                self.log(f"!! 청크 처리 중 오류: {e}")
-                time.sleep(1)
+                self.log(f"!! 작업 저널 기록 실패: {e}")
+
+    @staticmethod
+    def _extract_key(line):
+        """'원문=번역' 형식의 줄에서 원문(키) 부분만 추출"""
+        if '=' in line:
+            return line.split('=', 1)[0].strip()
+        return line.strip()
+
+    def _dedupe_tasks(self, tasks):
+        """
+        모든 파일의 키(원문)를 모아, 각 키를 처음 등장한 파일(owner)에만 남깁니다.
+        - task['lines']: 이 파일이 직접 번역할 고유 줄
+        - task['deps']: 이 파일을 저장하기 전에 끝나야 하는 파일 인덱스 (자기 자신 포함)
+        :return: 실제로 번역할 고유 줄 수
+        """
+        owner = {}
+        unique_total = 0
+        for t_idx, task in enumerate(tasks):
+            owned = []
+            deps = {t_idx}
+            for line in task['lines']:
+                key = self._extract_key(line)
+                o = owner.get(key)
+                if o is None:
+                    owner[key] = t_idx
+                    owned.append(line)
+                else:
+                    deps.add(o)
+            task['lines'] = owned
+            task['deps'] = deps
+            unique_total += len(owned)
+        return unique_total
+
+    def _process_file_internal(self, task, current_global_count, total_global_count):
+        fname = task['fname']
+        lines_to_process = task['lines']
+        
+        for chunk_no, chunk in enumerate(self._iter_chunks(lines_to_process)):
+            if not self._checkpoint(): break
+            
+            self._commit_chunk(self._translate_chunk(chunk, chunk_no, fname))
 
             current_global_count += len(chunk)
             if self.progress and total_global_count > 0:
                 ratio = current_global_count / total_global_count
                 self.progress(ratio, f"{fname} 처리 중")
-            
-            time.sleep(self.request_delay)
+
+        # 순차 모드에서는 앞선 파일(owner)이 모두 끝났으므로 공유 번역 결과로 바로 저장 가능
+        # (중단된 경우에도 지금까지 번역된 줄을 저장하고, 나머지 줄은 원문 유지)
+        self._write_output(task, self.translations)
+
+        return current_global_count
+
+    def _run_concurrent(self, tasks, total_global_count, max_workers):
+        """
+        모든 파일의 청크를 하나의 작업 큐로 보고, 최대 max_workers개의 요청을 동시에 유지합니다.
+        파일은 자신과 공유 키를 가진 앞선 파일(deps)의 청크가 모두 끝나면 저장합니다.
+        """
+        # 청크는 제출 직전에 만들어지므로(예산 변동 반영) 파일별 남은 '줄 수'로 완료를 판단
+        remaining = [len(task['lines']) for task in tasks]
+        waiting = [set(task['deps']) for task in tasks]
+        dependents = [[] for _ in tasks]
+        for t_idx, task in enumerate(tasks):
+            for o in task['deps']:
+                dependents[o].append(t_idx)
+
+        written = set()
+
+        def _mark_done(t_idx):
+            for d in dependents[t_idx]:
+                waiting[d].discard(t_idx)
+                if not waiting[d]:
+                    self._write_output(tasks[d], self.translations)
+                    written.add(d)
+
+        def _iter_jobs():
+            for t_idx, task in enumerate(tasks):
+                for chunk_no, chunk in enumerate(self._iter_chunks(task['lines'])):
+                    yield t_idx, chunk_no, chunk
+
+        # 번역할 줄이 없는 파일 (모든 줄이 앞선 파일과 중복)
+        for t_idx, cnt in enumerate(remaining):
+            if cnt == 0:
+                _mark_done(t_idx)
+
+        jobs = _iter_jobs()
+        started = set()
+        current_global_count = 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = {}
+
+            def _submit_next():
+                job = next(jobs, None)
+                if job is None: return False
+                t_idx, chunk_no, chunk = job
+                if t_idx not in started:
+                    started.add(t_idx)
+                    self.log(f">> [처리 시작] {tasks[t_idx]['fname']}")
+                in_flight[executor.submit(self._translate_chunk, chunk, chunk_no, tasks[t_idx]['fname'])] = job
+                return True
+
+            while True:
+                # 일시정지 중에는 새 청크를 제출하지 않음 (요청 중인 청크는 계속 진행)
+                # 취소되면 제출을 멈추고 요청 중인 청크만 받아서 반영 (이미 비용이 나간 결과는 버리지 않음)
+                # (요청 중인 청크가 없으면 재개/취소될 때까지 대기)
+                if self.control is not None and (not in_flight or self.control.cancelled):
+                    self._checkpoint()
+                if not self.stopped and (self.control is None or not self.control.paused):
+                    while len(in_flight) < max_workers and _submit_next():
+                        pass
+
+                if not in_flight:
+                    break
+
+                done, _ = concurrent.futures.wait(
+                    in_flight, timeout=utils.CONTROL_POLL_INTERVAL if self.control is not None else None,
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    t_idx, chunk_no, chunk = in_flight.pop(future)
+                    try:
+                        self._commit_chunk(future.result())
+                    except Exception as e:
+                        self.log(f"!! 청크 처리 중 오류: {e}")
+
+                    current_global_count += len(chunk)
+                    if self.progress and total_global_count > 0:
+                        ratio = current_global_count / total_global_count
+                        self.progress(ratio, f"{tasks[t_idx]['fname']} 처리 중")
+
+                    remaining[t_idx] -= len(chunk)
+                    if remaining[t_idx] == 0:
+                        _mark_done(t_idx)
+
+        if self.stopped:
+            # 번역을 시작한 파일은 지금까지의 결과로 저장 (남은 줄은 원문 유지)
+            for t_idx in sorted(started - written):
+                self._write_output(tasks[t_idx], self.translations)
+
+    def _translate_chunk(self, chunk, chunk_no, fname=""):
+        """
+        청크 하나를 번역하여 {원문: 번역문} 딕셔너리로 반환합니다.
+        응답이 잘렸거나 일부 줄이 빠지면 받은 항목은 그대로 쓰고, 빠진 줄만 나눠서 다시 요청합니다.
+        (끝내 실패한 줄은 포함되지 않으며 저장 시 원문 유지 + 실패 보고서에 기록)
+        """
+        translation_map = {}
+        chunk_map = {}
 
+        try:
+            translation_map, chunk_map, system_prompt, input_json = self._prepare_chunk(chunk)
+            if not chunk_map:
+                return translation_map
+            if not self._checkpoint():
+                return translation_map  # 대기 중에 취소됨 (번역 메모리 적중분만 반영)
+
+            response_text = self.provider.translate(system_prompt, input_json)
+            missing, reason, retry = self._apply_response(response_text, chunk_map, translation_map, chunk_no)
+        except RequestCancelled:
+            self._checkpoint()  # 대기 중 취소됨 -> 실패가 아니라 중단 (다음 실행에서 다시 요청)
+            return translation_map
+        except Exception as e:
+            # API 오류(재시도 소진 등)는 나눠서 다시 보내도 같은 결과이므로 바로 실패로 기록
+            self.log(f"!! 청크 처리 중 오류: {e}")
+            self._record_failures(chunk_map, list(chunk_map), fname, chunk_no, f"API 오류: {e}")
+            time.sleep(1)
+            return translation_map
+
+        self._report_chunk(chunk_map, not missing)
+        if missing:
+            self._recover_missing(chunk_map, missing, reason, retry, translation_map, chunk_no, fname)
+        return translation_map
+
+    def _recover_missing(self, chunk_map, missing, reason, retry, translation_map, chunk_no, fname):
+        """
+        응답에서 빠진 줄(missing: local_id 목록)만 반씩 나눠 다시 요청합니다 (이분 분할).
+        문제가 되는 줄(필터링/너무 긴 줄 등)을 한 줄 단위까지 좁히고, 그래도 실패한 줄만 실패로 기록합니다.
+        - retry: 응답에 받은 항목이 있었거나 응답이 잘린 경우에만 True (빈 응답/항목 없음은 나눠도 같은 결과)
+        - {id, trans} 형식으로 답하지 않는 공급자는 다시 요청하지 않음
+        - 청크당 재요청은 CHUNK_RECOVERY_MAX_REQUESTS회까지 (남은 줄은 실패로 기록)
+        """
+        orig_ids = {chunk_map[lid]['orig']: lid for lid in missing}  # 보고서에는 원래 청크의 id로 기록
+        if not retry or not getattr(self.provider, 'json_items', True):
+            self.log(f">> 청크 {chunk_no}: {reason} - 누락 {len(missing)}줄은 원문 유지 (재요청 안 함)")
+            self._record_failures(chunk_map, missing, fname, chunk_no, reason)
+            return
+
+        self.log(f">> 청크 {chunk_no} 복구: {reason} - {len(chunk_map) - len(missing)}줄 반영, 누락 {len(missing)}줄만 다시 요청")
+        queue = collections.deque(self._bisect([chunk_map[lid]['orig'] for lid in missing]))
+        budget = CHUNK_RECOVERY_MAX_REQUESTS
+
+        while queue:
+            part = queue.popleft()
+            if not self._checkpoint():
+                return  # 취소됨 (남은 줄은 저널에 없으므로 다음 실행에서 다시 요청)
+
+            sub_map = {}
+            try:
+                sub_translations, sub_map, system_prompt, input_json = self._prepare_chunk(part)
+                translation_map.update(sub_translations)
+                if not sub_map:
+                    continue
+                if budget <= 0:
+                    self._record_failures(sub_map, list(sub_map), fname, chunk_no,
+                                          f"{reason} (재요청 한도 {CHUNK_RECOVERY_MAX_REQUESTS}회 초과)", orig_ids)
+                    continue
+                budget -= 1
+                response_text = self.provider.translate(system_prompt, input_json)
+                sub_missing, reason, retry = self._apply_response(response_text, sub_map, translation_map, chunk_no)
+            except RequestCancelled:
+                self._checkpoint()
+                return
+            except Exception as e:
+                self._record_failures(sub_map, list(sub_map), fname, chunk_no, f"API 오류: {e}", orig_ids)
+                continue
+
+            if not sub_missing:
+                continue
+            if len(sub_map) == 1 or not retry:
+                self._record_failures(sub_map, sub_missing, fname, chunk_no, reason, orig_ids)
+            else:
+                queue.extend(self._bisect([sub_map[lid]['orig'] for lid in sub_missing]))
+
+    @staticmethod
+    def _bisect(lines):
+        if len(lines) <= 1:
+            return [lines]
+        mid = len(lines) // 2
+        return [lines[:mid], lines[mid:]]
+
+    def _record_failures(self, chunk_map, local_ids, fname, chunk_no, reason, orig_ids=None):
+        with self._stats_lock:
+            for lid in local_ids:
+                text = chunk_map[lid]['orig']
+                self.failures.append({
+                    'file': fname, 'chunk': chunk_no, 'id': (orig_ids or {}).get(text, lid),
+                    'text': text, 'reason': reason
+                })
+
+    def _write_failure_report(self, out_target):
+        """최종 실패한 줄을 <출력>_ai_failures.jsonl로 저장 (실패가 없으면 이전 보고서 삭제)"""
+        path = os.path.normpath(out_target) + FAILURE_REPORT_SUFFIX
+        if not self.failures:
+            try: os.remove(path)
+            except OSError: pass
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                for entry in sorted(self.failures, key=lambda e: (e['file'], e['chunk'], e['id'])):
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.log(f"!! 번역 실패 {len(self.failures)}줄 (원문 유지). 실패 보고서: {path}")
+        except Exception as e:
+            self.log(f"!! 번역 실패 {len(self.failures)}줄 (원문 유지). 보고서 저장 실패: {e}")
+
+    def _prepare_chunk(self, chunk):
+        """
+        청크를 요청 형태로 준비합니다.
+        :return: (번역 메모리로 채운 결과, {local_id: 원문/마스크 정보}, 시스템 프롬프트, 요청 JSON)
+                 요청할 줄이 없으면 chunk_map이 비어 있음
+        """
+        translation_map = {}
+        SYSTEM_PROMPT_BASE = self.system_prompt_base
+
+        chunk_data = []
+        chunk_map = {} 
+
+        clean_texts = [self._extract_key(line) for line in chunk]
+
+        # [번역 메모리] 이미 번역된 줄은 바로 채우고, 나머지(미스)만 요청
+        cached = self.memory.get_many(clean_texts) if self.memory else {}
+        if cached:
+            for clean_text, trans_text in cached.items():
+                translation_map[clean_text] = self._finalize_translation(clean_text, trans_text)
+            with self._stats_lock:
+                self.memory_hits += sum(1 for t in clean_texts if t in cached)
+
+        pending = set()
+        for clean_text in clean_texts:
+            if clean_text in cached or clean_text in pending:
+                continue
+            pending.add(clean_text)
+            local_id = len(chunk_data) + 1
+
+            # [수정] 옵션에 따라 마스킹 적용 여부 결정
+            if self.options.get('auto_mask', True):
+                # 마스킹 적용
+                masked_text, active_masks = self.glossary_mgr.apply_masking(clean_text)
+            else:
+                # 마스킹 미적용 (원문 그대로 사용)
+                masked_text = clean_text
+                active_masks = {}
+
+            chunk_data.append({"id": local_id, "text": masked_text})
+            chunk_map[local_id] = {"orig": clean_text, "masks": active_masks}
+
+        if not chunk_data:
+            return translation_map, chunk_map, "", ""
+
+        context_hint = ""
+        for c_item in chunk_data:
+            masks = chunk_map[c_item['id']]['masks']
+            if masks:
+                for t, info in masks.items():
+                    if info['hint']:
+                        context_hint += f"Reference: {t} means {info['tgt']} (Context: {info['hint']})\n"
+                    else:
+                        context_hint += f"Reference: {t} means {info['tgt']}\n"
+
+        final_system_prompt = SYSTEM_PROMPT_BASE + context_hint
+        
+        input_json = json.dumps(chunk_data, ensure_ascii=False)
+        return translation_map, chunk_map, final_system_prompt, input_json
+
+    def _apply_response(self, response_text, chunk_map, translation_map, chunk_no):
+        """
+        AI 응답(JSON {id, trans} 목록)을 해석하여 translation_map에 채우고 번역 메모리에 저장
+        (JSON이 깨진 응답도 완전한 항목은 살려서 반영)
+        :return: (번역을 받지 못한 local_id 목록, 실패 사유, 나눠서 다시 요청할 가치가 있는지)
+                 - 모두 받았으면 ([], None, False)
+                 - 일부 항목을 받았거나 응답이 잘린 경우에만 재요청 (빈 응답/항목 없음은 나눠도 같은 결과)
+        """
+        translated_list, parsed = parse_translation_items(response_text)
+
+        new_entries = {}
+        for item in translated_list:
+            lid = item.get('id')
+            trans_text = item.get('trans')
+            if isinstance(lid, str) and lid.isdigit():
+                lid = int(lid)
+
+            if lid in chunk_map and trans_text and isinstance(trans_text, str):
+                orig_info = chunk_map[lid]
+                # 옵션 키 'auto_restore'가 없으면 기본값 True (기존 동작 유지)
+                if self.options.get('auto_restore', True):
+                    final_trans = self.glossary_mgr.restore_masking(trans_text, orig_info['masks'])
+                else:
+                    # 해제하지 않고 저장
+                    final_trans = trans_text
+                translation_map[orig_info['orig']] = final_trans
+                new_entries[orig_info['orig']] = trans_text
+
+        if self.memory and new_entries:
+            self.memory.put_many(new_entries)
+
+        missing = [lid for lid, info in chunk_map.items() if info['orig'] not in new_entries]
+        if not missing:
+            return [], None, False
+        if parsed:
+            if not new_entries:
+                return missing, "응답에 번역 항목 없음", False
+            return missing, "응답에서 누락", True
+        if not (response_text or "").strip():
+            return missing, "빈 응답", False
+        return missing, f"JSON 파싱 실패 (완전한 항목 {len(new_entries)}개 복구)", True
+
+    def _finalize_translation(self, clean_text, trans_text):
+        """번역 메모리에 저장된 AI 응답에 현재 옵션대로 마스킹 복원 적용"""
+        if self.options.get('auto_mask', True) and self.options.get('auto_restore', True):
+            _, active_masks = self.glossary_mgr.apply_masking(clean_text)
+            return self.glossary_mgr.restore_masking(trans_text, active_masks)
+        return trans_text
+
+    def _write_output(self, task, translation_map):
         try:
             final_results = []
             for line in task['raw_content']:
@@ -566,46 +1730,42 @@ class TranslationProcessor:
                 else:
                     final_results.append(f"{key_part}={key_part}")
             
-            with open(out_path, "w", encoding="utf-8") as f:
+            out_parent = os.path.dirname(task['out'])
+            if out_parent:
+                os.makedirs(out_parent, exist_ok=True)
+            with open(task['out'], "w", encoding="utf-8") as f:
                 f.write("\n".join(final_results))
 
         except Exception as e:
             self.log(f"!! 파일 저장 실패: {e}")
 
-        return current_global_count
-
 class GlossaryManager:
+    """
+    용어집 마스킹 엔진.
+    용어 목록으로 Aho-Corasick 오토마톤을 한 번만 만들어 두고, 줄마다 한 번의 스캔으로
+    가장 왼쪽 + 가장 긴 용어를 마스킹 ID로 바꿉니다. (용어 수와 무관하게 줄 길이에 비례)
+    """
     def __init__(self, glossary_path):
-        # utils의 표준 로더 사용 (mask_id 형식 통일)
+        # utils의 표준 로더 + 공용 마스킹 인덱스 사용 (mask_id 형식 통일)
         self.term_map = utils.load_glossary_data(glossary_path)
-    
+        self.index = utils.GlossaryIndex(self.term_map)
+
     def apply_masking(self, text):
-        active_masks = {}
-        masked_text = text
-        
-        # utils에서 로드된 mask_id (__MSK_XXXX__) 사용
-        for item in self.term_map:
-            src = item['src']
-            mask_id = item['mask_id']
-            if src in masked_text:
-                masked_text = masked_text.replace(src, mask_id)
-                active_masks[mask_id] = item
-                
-        return masked_text, active_masks
+        """:return: (마스킹된 텍스트, {mask_id: 용어 항목}) - 실제로 등장한 용어만 포함"""
+        return self.index.mask(text)
 
     def restore_masking(self, text, active_masks):
-        restored = text
-        # 번역 결과를 복원하므로 item['tgt'] (번역문) 사용
-        for token, info in active_masks.items():
-            restored = restored.replace(token, info['tgt'])
-        return restored
+        """마스킹 ID를 번역문(item['tgt'])으로 한 번에 복원 (이 줄에서 쓰지 않은 ID는 그대로 둠)"""
+        if not active_masks:
+            return text
+        return self.index.restore(text, {mask_id: info['tgt'] for mask_id, info in active_masks.items()})
 
 # ==========================================
 # [인터페이스 함수]
 # ==========================================
-def process_ai_translation(src_dir, out_dir, options, log_callback, progress_callback=None):
-    processor = TranslationProcessor(options, log_callback, progress_callback)
+def process_ai_translation(src_dir, out_dir, options, log_callback, progress_callback=None, control=None):
+    processor = TranslationProcessor(options, log_callback, progress_callback, control)
     processor.run(src_dir, out_dir)
 
-def process_cost_estimation(src_dir, provider, model, log_callback):
-    return calculate_estimates(src_dir, provider, model, log_callback)
\ No newline at end of file
+def process_cost_estimation(src_dir, provider, model, log_callback, options=None):
+    return calculate_estimates(src_dir, provider, model, log_callback, options)
\ No newline at end of file
@@ -17,7 +17,9 @@ from tkinter import filedialog, messagebox
 import os
 import threading
 import configparser
+import multiprocessing
 import sys
+import collections
 
 # 모듈 가져오기 (사용자 기존 모듈 유지)
 import logic
@@ -35,17 +37,61 @@ else:
 
 CONFIG_FILE = os.path.join(BASE_DIR, "config.ini")
 
-# 기본 프롬프트
-DEFAULT_PROMPT = (
-    "You are a professional game translator.\n"
-    "Output must be a JSON array of objects. Format: [{\"id\": 1, \"trans\": \"Korean text\"}, ...]\n"
-    "Do NOT translate tokens like __MASK_XXXX__.\n"
-    "Translate the 'text' field into natural Korean 'trans'."
-)
+# 기본 프롬프트 (CLI와 공유하기 위해 logic_ai에 정의)
+DEFAULT_PROMPT = logic_ai.DEFAULT_PROMPT
+
+# 로그/진행률 화면 반영 주기 및 로그창 최대 줄 수
+UI_TICK_MS = 100
+LOG_MAX_LINES = 5000
 
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
+# ==========================================
+# [UI 버스] 작업 스레드 -> 화면 스레드 로그/진행률 전달
+# ==========================================
+class UiEventBus:
+    """
+    작업 스레드는 메시지를 쌓기만 하고, Tk 스레드가 일정 주기로 한꺼번에 가져갑니다.
+    - 로그: 순서대로 보관 (화면에 남길 수 있는 줄 수를 넘는 오래된 줄은 버리고 개수만 셈)
+    - 진행률: 마지막 값만 유지 (상태 문구는 None이 아닌 마지막 값)
+    - 모델 목록 갱신 요청: 가격표가 새로 들어왔다는 표시만 남김 (여러 번 와도 한 번만 다시 그림)
+    """
+    def __init__(self, max_lines=LOG_MAX_LINES):
+        self._lock = threading.Lock()
+        self._logs = collections.deque(maxlen=max_lines)
+        self._dropped = 0
+        self._progress = None
+        self._status = None
+        self._models_changed = False
+
+    def post_log(self, msg):
+        with self._lock:
+            if len(self._logs) == self._logs.maxlen:
+                self._dropped += 1
+            self._logs.append(msg)
+
+    def post_progress(self, val, text=None):
+        with self._lock:
+            self._progress = val
+            if text:
+                self._status = text
+
+    def post_models_changed(self):
+        with self._lock:
+            self._models_changed = True
+
+    def drain(self):
+        """:return: (로그 목록, 생략된 줄 수, 진행률 또는 None, 상태 문구 또는 None, 모델 목록 갱신 여부)"""
+        with self._lock:
+            logs = list(self._logs)
+            self._logs.clear()
+            dropped, self._dropped = self._dropped, 0
+            progress, self._progress = self._progress, None
+            status, self._status = self._status, None
+            models_changed, self._models_changed = self._models_changed, False
+        return logs, dropped, progress, status, models_changed
+
 class TranslatorApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -64,6 +110,8 @@ class TranslatorApp(ctk.CTk):
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1) # 메인 콘텐츠 영역
 
+        self.ui_bus = UiEventBus()
+        self.job_control = None  # 실행 중인 작업의 utils.JobControl (중지/일시정지 버튼용)
         self.init_variables()
         self.load_config()
         
@@ -78,6 +126,14 @@ class TranslatorApp(ctk.CTk):
         # 초기 모델 목록 설정
         self.refresh_model_list(init=True)
 
+        # 로그/진행률 반영 루프 시작
+        self.after(UI_TICK_MS, self._drain_ui_bus)
+
+        # 가격표는 창을 띄운 뒤 백그라운드에서 읽고(오래되었으면 갱신), 새 데이터가 오면 모델 목록만 다시 그림
+        # (리스너는 백그라운드 스레드에서 호출되므로 UI 버스에 표시만 남기고 _drain_ui_bus에서 처리)
+        logic_ai.pricing_engine.add_listener(self.ui_bus.post_models_changed)
+        threading.Thread(target=logic_ai.pricing_engine.load_data, daemon=True).start()
+
     def init_variables(self):
         self.path_src = tk.StringVar()
         self.path_out = tk.StringVar()
@@ -86,6 +142,11 @@ class TranslatorApp(ctk.CTk):
         self.path_util_db = tk.StringVar()
         self.path_ai_input = tk.StringVar()
         self.path_mask_target = tk.StringVar()
+
+        # 파일 탐색 필터 (하위 폴더 / 포함·제외 패턴)
+        self.opt_recursive = tk.BooleanVar(value=True)
+        self.scan_include = tk.StringVar(value="")
+        self.scan_exclude = tk.StringVar(value="")
         
         self.opt_group_brackets = tk.BooleanVar(value=True)
         self.opt_extract_masking = tk.BooleanVar(value=False)
@@ -96,6 +157,7 @@ class TranslatorApp(ctk.CTk):
 
         self.opt_smart_mode = tk.BooleanVar(value=True)
         self.opt_smart_save = tk.BooleanVar(value=True)
+        self.opt_incremental = tk.BooleanVar(value=True)
         self.key_newline = tk.StringVar(value="\\n")
         self.key_space = tk.StringVar(value=" ")
         self.val_newline = tk.StringVar(value="[ENTER]")
@@ -109,16 +171,25 @@ class TranslatorApp(ctk.CTk):
         self.ai_model = tk.StringVar(value="gpt-4o-mini")
 
         self.ai_chunk_size = tk.IntVar(value=15)
+        self.ai_adaptive_chunk = tk.BooleanVar(value=True)  # 토큰 예산으로 청크 구성 (끄면 줄 수 고정)
+        self.ai_chunk_tokens = tk.IntVar(value=0)  # 0 = 공급자/모델 기본값
         self.ai_temperature = tk.DoubleVar(value=0.1)
         self.ai_force_json = tk.BooleanVar(value=True)
-        self.ai_request_delay = tk.DoubleVar(value=0.5)
+        self.ai_rate_rpm = tk.IntVar(value=0)  # 0 = 공급자 기본값
+        self.ai_rate_tpm = tk.IntVar(value=0)
+        self.ai_max_concurrency = tk.IntVar(value=4)
         self.ai_auto_mask = tk.BooleanVar(value=True)
         self.ai_auto_restore = tk.BooleanVar(value=True)
+        self.ai_use_tm = tk.BooleanVar(value=True)
+        self.ai_resume = tk.BooleanVar(value=True)
+        self.ai_batch_mode = tk.BooleanVar(value=False)
 
         self.opt_smart_header = tk.BooleanVar(value=True)  # 헤더 보호
 #        self.opt_smart_json = tk.BooleanVar(value=True)    # JSON 문법 교정
         self.opt_smart_special = tk.BooleanVar(value=True) # 특수문자 처리
         self.opt_safe_english = tk.BooleanVar(value=False)
+        self.opt_process_pool = tk.BooleanVar(value=True)  # 멀티프로세스 적용
+        self.opt_mask_parallel = tk.BooleanVar(value=False)  # 대용량 DB 마스킹 병렬 처리
 
     # ================================================================
     # [UI Part 1] 사이드바 (Navigation)
@@ -265,6 +336,7 @@ class TranslatorApp(ctk.CTk):
         
         ctk.CTkCheckBox(card3, text="스마트 모드 (권장)", variable=self.opt_smart_mode).pack(anchor="w", padx=15, pady=5)
         ctk.CTkCheckBox(card3, text="스마트 저장", variable=self.opt_smart_save).pack(anchor="w", padx=15, pady=5)
+        ctk.CTkCheckBox(card3, text="증분 적용 (변경분만)", variable=self.opt_incremental).pack(anchor="w", padx=15, pady=5)
         
         self.btn_apply = ctk.CTkButton(card3, text="▶ 적용 시작", command=self.run_translate, fg_color="#27AE60", height=40)
         self.btn_apply.pack(fill="x", padx=15, pady=20, side="bottom")
@@ -290,6 +362,7 @@ class TranslatorApp(ctk.CTk):
         self.create_path_row(container, "원본 폴더 (Source):", self.path_src, is_folder=True, desc="게임의 원본 assets 혹은 텍스트 파일이 있는 폴더")
         self.create_path_row(container, "저장 폴더 (Output):", self.path_out, is_folder=True, desc="추출된 텍스트와 번역 결과물이 저장될 폴더")
         self.create_path_row(container, "용어집 (Glossary):", self.path_glossary, is_folder=False, desc="고유명사 번역을 고정할 CVB/TXT 파일")
+        self.create_filter_row(container)
         btn_sample = ctk.CTkButton(container, text="📘 용어집 샘플 양식 생성", 
                                   command=self.generate_sample_glossary, 
                                   fg_color="#5D6D7E", width=200)
@@ -369,7 +442,8 @@ class TranslatorApp(ctk.CTk):
             target_file, 
             glossary_file, 
             'apply', 
-            self.log
+            self.log,
+            {'parallel': self.opt_mask_parallel.get()}
         )
 
     def run_masking_release(self):
@@ -394,7 +468,8 @@ class TranslatorApp(ctk.CTk):
             target_file, 
             glossary_file, 
             'restore', 
-            self.log
+            self.log,
+            {'parallel': self.opt_mask_parallel.get()}
         )
 
     # [헬퍼] 파일 유효성 검사
@@ -482,6 +557,7 @@ class TranslatorApp(ctk.CTk):
         safe_chk = ctk.CTkCheckBox(smart_grid, text="순수 영문 보호 모드 (변수 오역 방지 / 속도 느림)", 
                                    variable=self.opt_safe_english, text_color="#E74C3C") # 붉은색 강조
         safe_chk.pack(anchor="w", pady=2)
+        ctk.CTkCheckBox(smart_grid, text="멀티프로세스 적용 (CPU 코어 병렬 처리)", variable=self.opt_process_pool).pack(anchor="w", pady=2)
 
         # [신규 섹션] DB 포맷 및 파싱 설정
         frame_fmt = ctk.CTkFrame(parent)
@@ -533,17 +609,30 @@ class TranslatorApp(ctk.CTk):
         
         grid = ctk.CTkFrame(frame_ai, fg_color="transparent")
         grid.pack(fill="x", padx=10, pady=5)
+        ctk.CTkCheckBox(grid, text="토큰 예산 청크", variable=self.ai_adaptive_chunk).pack(side="left", padx=5)
+        ctk.CTkLabel(grid, text="토큰(0=자동):").pack(side="left", padx=5)
+        ctk.CTkEntry(grid, textvariable=self.ai_chunk_tokens, width=60).pack(side="left")
         ctk.CTkLabel(grid, text="청크(줄 수):").pack(side="left", padx=5)
         ctk.CTkEntry(grid, textvariable=self.ai_chunk_size, width=50).pack(side="left")
         ctk.CTkLabel(grid, text="Temperature:").pack(side="left", padx=5)
         ctk.CTkEntry(grid, textvariable=self.ai_temperature, width=50).pack(side="left")
-        ctk.CTkLabel(grid, text="Delay(초):").pack(side="left", padx=5)
-        ctk.CTkEntry(grid, textvariable=self.ai_request_delay, width=50).pack(side="left")
+        ctk.CTkLabel(grid, text="RPM:").pack(side="left", padx=5)
+        ctk.CTkEntry(grid, textvariable=self.ai_rate_rpm, width=50).pack(side="left")
+        ctk.CTkLabel(grid, text="TPM:").pack(side="left", padx=5)
+        ctk.CTkEntry(grid, textvariable=self.ai_rate_tpm, width=70).pack(side="left")
+        ctk.CTkLabel(grid, text="동시 요청:").pack(side="left", padx=5)
+        ctk.CTkEntry(grid, textvariable=self.ai_max_concurrency, width=40).pack(side="left")
         ctk.CTkCheckBox(grid, text="JSON 강제", variable=self.ai_force_json).pack(side="left", padx=15)
         # 1. 번역 전 적용
         ctk.CTkCheckBox(grid, text="마스킹 전처리", variable=self.ai_auto_mask).pack(side="left", padx=5)
         # 2. 번역 후 해제
         ctk.CTkCheckBox(grid, text="마스킹 후처리", variable=self.ai_auto_restore).pack(side="left", padx=5)
+        # 3. 번역 메모리 (이미 번역한 문장 재사용)
+        ctk.CTkCheckBox(grid, text="번역 메모리", variable=self.ai_use_tm).pack(side="left", padx=5)
+        # 4. 이어하기 (중단된 작업의 완료된 청크 건너뛰기)
+        ctk.CTkCheckBox(grid, text="이어하기", variable=self.ai_resume).pack(side="left", padx=5)
+        # 5. 배치 API (OpenAI/Anthropic: 요금 할인, 결과까지 최대 24시간)
+        ctk.CTkCheckBox(grid, text="배치 API", variable=self.ai_batch_mode).pack(side="left", padx=5)
         prompt_header = ctk.CTkFrame(frame_ai, fg_color="transparent")
         prompt_header.pack(fill="x", padx=10, pady=(10, 0))
         
@@ -598,6 +687,8 @@ class TranslatorApp(ctk.CTk):
             command=lambda: self.browse_path(self.path_mask_target, False)
         ).pack(side="left", padx=5)
 
+        ctk.CTkCheckBox(frame_tool, text="병렬 처리 (대용량 DB, 구간별 멀티프로세스)", variable=self.opt_mask_parallel).pack(anchor="w", padx=10, pady=(0, 10))
+
         # [수정] 버튼 2개 배치 (적용 / 해제)
         btn_grid = ctk.CTkFrame(frame_tool, fg_color="transparent")
         btn_grid.pack(fill="x", padx=10, pady=(0, 15))
@@ -742,10 +833,14 @@ class TranslatorApp(ctk.CTk):
   2. 특수문자 처리: 엔터키(줄바꿈)나 공백 문자를 게임 엔진이 인식할 수 있는 코드로 자동 변환
 - 스마트 저장은 번역된 내용이 있는 파일만 저장하는 기능
   1. 번역 DB(번역문)와 매칭되는 문장이 하나도 없는 파일은 저장하지 않음
+- 증분 적용은 지난 적용 이후 바뀐 파일만 다시 처리하는 기능
+  1. 원본 파일이 바뀌었거나, 해당 파일에 쓰인 DB 번역문이 수정/추가된 경우에만 재처리
+  2. 기록 파일(저장폴더명_apply_manifest.json)은 저장 폴더 옆에 생성됨
 - UI 등에 있는 짧은영어도 번역하고 싶을때 고급설정 내 영문 보호모드 체크
 
 [문제 해결]
-- AI 번역이 멈춘 경우: API 사용량 한도를 확인하거나 '고급 설정'의 Delay를 늘려보세요.
+- AI 번역이 멈춘 경우: API 사용량 한도를 확인하거나 '고급 설정'의 RPM/TPM을 계정 한도에 맞게 낮춰보세요.
+  (0 = 공급자 기본값, 429 한도 초과 시 자동으로 대기 후 속도를 낮춤)
 - 영문 보호모드는 연산량이 매우많아 응답없음이 뜹니다. 켜두고 몇분 딴짓하시면 됩니다.
 - 영문 보호모드는 일본어, 일본어+영어 유형만 있을 땐 꺼두시는걸 추천드립니다.
 """
@@ -834,6 +929,14 @@ class TranslatorApp(ctk.CTk):
         row_progress = ctk.CTkFrame(self.log_frame, fg_color="transparent", height=20)
         row_progress.pack(fill="x", padx=10, pady=(10, 5))
         
+        # 실행 중인 작업 중지/일시정지 (추출/AI 번역/적용 실행 중에만 활성화)
+        self.btn_stop = ctk.CTkButton(row_progress, text="⏹ 중지", width=70, height=24, fg_color="#C0392B",
+                                      state="disabled", command=self.stop_job)
+        self.btn_stop.pack(side="right", padx=(5, 0))
+        self.btn_pause = ctk.CTkButton(row_progress, text="⏸ 일시정지", width=90, height=24, fg_color="#555",
+                                       state="disabled", command=self.toggle_pause_job)
+        self.btn_pause.pack(side="right", padx=(5, 0))
+
         self.lbl_percent = ctk.CTkLabel(row_progress, text="0%", width=50, font=("Arial", 13, "bold"))
         self.lbl_percent.pack(side="right")
         
@@ -853,6 +956,32 @@ class TranslatorApp(ctk.CTk):
     # ================================================================
     # Helper Functions
     # ================================================================
+    def create_filter_row(self, parent):
+        wrapper = ctk.CTkFrame(parent, fg_color="transparent")
+        wrapper.pack(fill="x", padx=5, pady=5)
+
+        ctk.CTkLabel(wrapper, text="파일 필터:", width=140, anchor="w", font=("Arial", 12, "bold")).pack(side="left", anchor="n", pady=5)
+
+        right_col = ctk.CTkFrame(wrapper, fg_color="transparent")
+        right_col.pack(side="left", fill="x", expand=True)
+
+        entry_row = ctk.CTkFrame(right_col, fg_color="transparent")
+        entry_row.pack(fill="x")
+        ctk.CTkCheckBox(entry_row, text="하위 폴더 포함", variable=self.opt_recursive).pack(side="left", padx=(0, 10))
+        ctk.CTkEntry(entry_row, textvariable=self.scan_include, placeholder_text="포함 (예: *.txt; Story/*)").pack(side="left", fill="x", expand=True)
+        ctk.CTkEntry(entry_row, textvariable=self.scan_exclude, placeholder_text="제외 (예: backup; *_old.*)").pack(side="left", fill="x", expand=True, padx=(5, 0))
+
+        ctk.CTkLabel(right_col, text="추출/AI 번역/적용 공통. ';'로 구분, '/'가 있으면 상대 경로, 없으면 이름과 비교 (제외된 폴더는 통째로 건너뜀)",
+                     text_color="gray", font=("Arial", 12)).pack(anchor="w", padx=2)
+
+    def get_scan_options(self):
+        """파일 탐색 옵션 (모든 단계 공통)"""
+        return {
+            'recursive': self.opt_recursive.get(),
+            'include_patterns': self.scan_include.get(),
+            'exclude_patterns': self.scan_exclude.get()
+        }
+
     def create_path_row(self, parent, label, var, is_folder, desc=""):
         wrapper = ctk.CTkFrame(parent, fg_color="transparent")
         wrapper.pack(fill="x", padx=5, pady=5)
@@ -881,28 +1010,44 @@ class TranslatorApp(ctk.CTk):
             ctk.CTkLabel(right_col, text=desc, text_color="gray", font=("Arial", 12)).pack(anchor="w", padx=2)
 
     def log(self, msg):
-        def _log():
-            self.log_box.configure(state="normal")
-            self.log_box.insert("end", f"> {msg}\n")
-            self.log_box.see("end")
-            self.log_box.configure(state="disabled")
-        self.after(0, _log)
+        # 어느 스레드에서든 호출 가능 (화면 반영은 _drain_ui_bus에서 묶어서 처리)
+        self.ui_bus.post_log(msg)
 
     def update_progress(self, val, text=None):
-        # [FIX 3] 분리된 라벨(Status, Percent)에 각각 업데이트
-        def _update():
-            safe_val = max(0.0, min(1.0, val))
-            self.progress_bar.set(safe_val)
-            
-            # % 표시는 바 우측에
-            percent = int(safe_val * 100)
-            self.lbl_percent.configure(text=f"{percent}%")
-            
+        self.ui_bus.post_progress(val, text)
+
+    def _drain_ui_bus(self):
+        """UI_TICK_MS마다 쌓인 로그를 한 번에 추가하고, 진행률은 최신 값만 반영"""
+        try:
+            logs, dropped, progress, status, models_changed = self.ui_bus.drain()
+
+            if logs:
+                lines = [f"> ... (로그 {dropped}줄 생략)\n"] if dropped else []
+                lines.extend(f"> {msg}\n" for msg in logs)
+                self.log_box.configure(state="normal")
+                self.log_box.insert("end", "".join(lines))
+                # 로그창 길이 제한 (오래된 줄부터 삭제)
+                line_count = int(self.log_box.index("end-1c").split(".")[0])
+                if line_count > LOG_MAX_LINES:
+                    self.log_box.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+                self.log_box.see("end")
+                self.log_box.configure(state="disabled")
+
+            # [FIX 3] 분리된 라벨(Status, Percent)에 각각 업데이트
+            if progress is not None:
+                safe_val = max(0.0, min(1.0, progress))
+                self.progress_bar.set(safe_val)
+                # % 표시는 바 우측에
+                self.lbl_percent.configure(text=f"{int(safe_val * 100)}%")
+
             # 파일명/상태 메시지는 바 하단에
-            if text:
-                self.lbl_status.configure(text=text)
-                
-        self.after(0, _update)
+            if status:
+                self.lbl_status.configure(text=status)
+
+            if models_changed:
+                self.refresh_model_list()
+        finally:
+            self.after(UI_TICK_MS, self._drain_ui_bus)
         
     def browse_path(self, var, is_folder):
         path = filedialog.askdirectory() if is_folder else filedialog.askopenfilename()
@@ -916,17 +1061,54 @@ class TranslatorApp(ctk.CTk):
         if hasattr(self, 'btn_ai'): self.btn_ai.configure(state=s)
         if hasattr(self, 'btn_apply'): self.btn_apply.configure(state=s)
 
-    def wrap_thread(self, target_func, *args):
+        # 중지/일시정지는 취소 가능한 작업이 실행 중일 때만 사용
+        if state:
+            self.job_control = None
+        job_s = "normal" if self.job_control is not None else "disabled"
+        if hasattr(self, 'btn_stop'): self.btn_stop.configure(state=job_s)
+        if hasattr(self, 'btn_pause'): self.btn_pause.configure(state=job_s, text="⏸ 일시정지")
+
+    def wrap_thread(self, target_func, *args, cancellable=False):
+        """
+        작업 함수를 백그라운드 스레드에서 실행합니다.
+        cancellable=True이면 utils.JobControl을 만들어 control= 인자로 넘기고 중지/일시정지 버튼과 연결합니다.
+        """
+        control = utils.JobControl() if cancellable else None
+
         def _worker():
             try:
-                target_func(*args)
+                if control is not None:
+                    target_func(*args, control=control)
+                else:
+                    target_func(*args)
             except Exception as e:
                 self.log(f"!! Error: {e}")
             finally:
                 self.after(0, lambda: self.toggle_buttons(True))
+        self.job_control = control
         self.toggle_buttons(False)
         threading.Thread(target=_worker, daemon=True).start()
 
+    def stop_job(self):
+        control = self.job_control
+        if control is None or control.cancelled: return
+        control.cancel()
+        self.log(">> 중지 요청: 진행 중인 작업을 마무리하고 지금까지의 결과를 저장합니다...")
+        self.btn_stop.configure(state="disabled")
+        self.btn_pause.configure(state="disabled")
+
+    def toggle_pause_job(self):
+        control = self.job_control
+        if control is None or control.cancelled: return
+        if control.paused:
+            control.resume()
+            self.btn_pause.configure(text="⏸ 일시정지")
+            self.log(">> 작업 재개")
+        else:
+            control.pause()
+            self.btn_pause.configure(text="▶ 재개")
+            self.log(">> 일시정지: 진행 중인 작업까지만 처리하고 대기합니다.")
+
     # ================================================================
     # Event Handlers (Logic 연결)
     # ================================================================
@@ -938,7 +1120,8 @@ class TranslatorApp(ctk.CTk):
         if not save_path: return
         self.update_progress(0, "추출 시작 중...")
         options = {'group_brackets': self.opt_group_brackets.get(), 'extract_masking': self.opt_extract_masking.get(), 'glossary_path': self.path_glossary.get()}
-        self.wrap_thread(logic.process_extract, self.path_src.get(), save_path, options, self.log, self.update_progress)
+        options.update(self.get_scan_options())
+        self.wrap_thread(logic.process_extract, self.path_src.get(), save_path, options, self.log, self.update_progress, cancellable=True)
 
     def run_ai_translate(self):
         target_input = self.path_ai_input.get().strip() or self.path_src.get().strip()
@@ -957,10 +1140,16 @@ class TranslatorApp(ctk.CTk):
             'provider': self.ai_provider.get(), 'api_key': self.ai_api_key.get(), 'model': self.ai_model.get(),
             'glossary_path': self.path_glossary.get(), 'system_prompt': custom_prompt,
             'chunk_size': self.ai_chunk_size.get(), 'temperature': self.ai_temperature.get(),
-            'force_json': self.ai_force_json.get(), 'request_delay': self.ai_request_delay.get(),
-            'auto_restore': self.ai_auto_restore.get(), 'auto_mask': self.ai_auto_mask.get()
+            'adaptive_chunk': self.ai_adaptive_chunk.get(), 'chunk_tokens': self.ai_chunk_tokens.get(),
+            'force_json': self.ai_force_json.get(),
+            'rate_rpm': self.ai_rate_rpm.get(), 'rate_tpm': self.ai_rate_tpm.get(),
+            'max_concurrency': self.ai_max_concurrency.get(),
+            'auto_restore': self.ai_auto_restore.get(), 'auto_mask': self.ai_auto_mask.get(),
+            'use_tm': self.ai_use_tm.get(), 'resume': self.ai_resume.get(),
+            'batch_mode': self.ai_batch_mode.get()
         }
-        self.wrap_thread(logic_ai.process_ai_translation, target_input, out_target, options, self.log, self.update_progress)
+        options.update(self.get_scan_options())
+        self.wrap_thread(logic_ai.process_ai_translation, target_input, out_target, options, self.log, self.update_progress, cancellable=True)
 
     def run_translate(self):
         target_out_dir = filedialog.askdirectory(title="최종 적용 폴더", initialdir=self.path_out.get())
@@ -977,12 +1166,15 @@ class TranslatorApp(ctk.CTk):
 #            'smart_json': self.opt_smart_json.get(),
             'smart_special': self.opt_smart_special.get(),
             'safe_english': self.opt_safe_english.get(),
+            'use_process_pool': self.opt_process_pool.get(),
+            'incremental': self.opt_incremental.get(),
             
             'newline_key': self.key_newline.get(), 'space_key': self.key_space.get(),
             'tag_pattern': self.tag_custom_pattern.get(), 'db_format': self.db_format.get(),
             'newline_val': self.val_newline.get(), 'space_val': self.val_space.get()
         }
-        self.wrap_thread(logic.process_translate, self.path_src.get(), target_out_dir, self.path_db.get(), options, self.log, self.update_progress)
+        options.update(self.get_scan_options())
+        self.wrap_thread(logic.process_translate, self.path_src.get(), target_out_dir, self.path_db.get(), options, self.log, self.update_progress, cancellable=True)
 
     def run_cost_estimation(self):
         # [수정] self.path_ai_input(선택된 대상)을 가져옴
@@ -1005,16 +1197,18 @@ class TranslatorApp(ctk.CTk):
             target_path, 
             self.ai_provider.get(), 
             self.ai_model.get(), 
-            self.log
+            self.log,
+            dict(self.get_scan_options(), chunk_tokens=self.ai_chunk_tokens.get())
         )
 
     def update_price_data(self):
         def _update():
             self.log(">> 가격 정보 갱신 중...")
-            logic_ai.pricing_engine.fetch_community_data()
-            logic_ai.pricing_engine._update_global_models()
-            self.after(0, self.refresh_model_list)
-            self.log(">> 완료.")
+            # 성공 시 모델 목록은 pricing_engine 리스너가 갱신
+            if logic_ai.pricing_engine.fetch_community_data():
+                self.log(">> 완료.")
+            else:
+                self.log("!! 가격 정보 갱신 실패 (기존 가격표 유지)")
         threading.Thread(target=_update, daemon=True).start()
 
     def refresh_model_list(self, init=False):
@@ -1036,8 +1230,13 @@ class TranslatorApp(ctk.CTk):
     def reset_to_defaults(self):
         if not messagebox.askyesno("초기화", "고급 설정을 초기화하시겠습니까?"): return
         self.ai_chunk_size.set(15)
+        self.ai_adaptive_chunk.set(True)
+        self.ai_chunk_tokens.set(0)
         self.ai_temperature.set(0.1)
         self.ai_force_json.set(True)
+        self.ai_max_concurrency.set(4)
+        self.ai_rate_rpm.set(0)
+        self.ai_rate_tpm.set(0)
         if hasattr(self, 'txt_prompt'):
             self.txt_prompt.delete("1.0", "end")
             self.txt_prompt.insert("1.0", DEFAULT_PROMPT)
@@ -1053,6 +1252,10 @@ class TranslatorApp(ctk.CTk):
                 self.path_out.set(config['PATH'].get('out', ''))
                 self.path_db.set(config['PATH'].get('db', ''))
                 self.path_glossary.set(config['PATH'].get('glossary', ''))
+            if 'SCAN' in config:
+                self.opt_recursive.set(config['SCAN'].getboolean('recursive', True))
+                self.scan_include.set(config['SCAN'].get('include', ''))
+                self.scan_exclude.set(config['SCAN'].get('exclude', ''))
             if 'AI' in config:
                 self.ai_provider.set(config['AI'].get('provider', 'OPENAI'))
                 self.ai_api_key.set(config['AI'].get('api_key', ''))
@@ -1060,6 +1263,7 @@ class TranslatorApp(ctk.CTk):
     def save_config(self):
         config = configparser.ConfigParser()
         config['PATH'] = {'src': self.path_src.get(), 'out': self.path_out.get(), 'db': self.path_db.get(), 'glossary': self.path_glossary.get()}
+        config['SCAN'] = {'recursive': str(self.opt_recursive.get()), 'include': self.scan_include.get(), 'exclude': self.scan_exclude.get()}
         p_text = self.txt_prompt.get("1.0", "end-1c") if hasattr(self, 'txt_prompt') else DEFAULT_PROMPT
         config['AI'] = {
             'provider': self.ai_provider.get(), 'api_key': self.ai_api_key.get(), 'model': self.ai_model.get(),
@@ -1091,7 +1295,7 @@ Python과 CustomTkinter로 제작되었으며, 텍스트 추출부터 AI 번역,
     * 실시간 가격 및 모델 정보를 불러와 **예상 번역 비용**을 미리 계산해줍니다.
 
 * **🛡️ 용어집 및 마스킹 (Glossary & Masking)**
-    * 고유명사 보호 및 안전필터 회피를 위한 **마스킹 시스템** (`__MASK_001__`) 탑재.
+    * 고유명사 보호 및 안전필터 회피를 위한 **마스킹 시스템** (`__MSK_0001__`) 탑재.
     * 3단 용어집 지원 (`원문, 의미/힌트, 번역문`)으로 AI에게 문맥 힌트를 제공하여 번역 품질을 극대화합니다.
     * CSV, TXT 형식의 용어집을 지원합니다.
 
@@ -1152,5 +1356,7 @@ Copyright © 2025 anysong. All rights reserved.
             messagebox.showerror("오류", f"파일 생성 실패: {e}")
 
 if __name__ == "__main__":
+    # [필수] 실행 파일(PyInstaller) 환경에서 프로세스 풀 사용 시 자식 프로세스 무한 생성 방지
+    multiprocessing.freeze_support()
     app = TranslatorApp()
     app.mainloop()
@@ -0,0 +1,239 @@
+# matcher.py
+import re
+from bisect import bisect_right
+
+# ==========================================
+# [상수] 유연한 줄바꿈 패턴
+# ==========================================
+# 실제 줄바꿈(\r\n, \n, \r)과 이스케이프 문자열(\\r\\n, \\n, \\r)을 모두 하나의 줄바꿈으로 취급
+# 앞뒤에 붙은 공백/탭도 함께 흡수합니다.
+FLEXIBLE_NEWLINE_REGEX = re.compile(r'[ \t]*(?:\\r\\n|\\n|\\r|\r\n|\n|\r)[ \t]*')
+
+
+def normalize_key(text):
+    """
+    DB 키/매칭 문자열을 검색용 표준 형태로 변환합니다.
+    (이스케이프 줄바꿈 -> 실제 줄바꿈, 각 줄의 앞뒤 공백 제거)
+    """
+    temp_key = text.replace(r'\r\n', '\n').replace(r'\r', '\n').replace(r'\n', '\n')
+    temp_key = temp_key.replace('\r\n', '\n').replace('\r', '\n')
+    return "\n".join(p.strip() for p in temp_key.split('\n'))
+
+
+# ==========================================
+# [Helper] 줄바꿈 정규화 텍스트 (위치 역매핑 지원)
+# ==========================================
+class NormalizedText:
+    """
+    원문의 '공백 + 줄바꿈 + 공백' 덩어리를 단일 '\\n'으로 접은 텍스트.
+    정규화된 위치를 원문 위치로 되돌리는 to_source()를 제공합니다.
+    (전체 오프셋 배열 대신 접힌 지점만 기록하므로 메모리 사용량이 작음)
+    """
+    __slots__ = ('text', '_ends', '_shifts')
+
+    def __init__(self, source):
+        parts = []
+        ends = []
+        shifts = []
+        last = 0
+        npos = 0
+        shift = 0
+
+        for m in FLEXIBLE_NEWLINE_REGEX.finditer(source):
+            s, e = m.span()
+            if e - s == 1 and source[s] == '\n':
+                continue  # 이미 표준 형태인 줄바꿈은 그대로 둠
+            parts.append(source[last:s])
+            parts.append('\n')
+            npos += (s - last) + 1
+            shift += (e - s) - 1
+            ends.append(npos)
+            shifts.append(shift)
+            last = e
+
+        if parts:
+            parts.append(source[last:])
+            self.text = "".join(parts)
+        else:
+            self.text = source
+        self._ends = ends
+        self._shifts = shifts
+
+    def to_source(self, pos):
+        idx = bisect_right(self._ends, pos) - 1
+        return pos + (self._shifts[idx] if idx >= 0 else 0)
+
+    def from_source(self, pos):
+        """원문 위치 -> 정규화 위치 (줄바꿈 덩어리 안쪽 위치는 덩어리 끝으로 보정)"""
+        ends, shifts = self._ends, self._shifts
+        src_ends = [e + s for e, s in zip(ends, shifts)]
+        idx = bisect_right(src_ends, pos) - 1
+        nxt = idx + 1
+        if nxt < len(ends):
+            run_len = shifts[nxt] - (shifts[idx] if idx >= 0 else 0) + 1
+            if pos > src_ends[nxt] - run_len:
+                return ends[nxt]
+        return pos - (shifts[idx] if idx >= 0 else 0)
+
+
+# ==========================================
+# [엔진] Aho-Corasick 다중 패턴 매처 (Leftmost-Longest)
+# ==========================================
+class KeywordMatcher:
+    """
+    수많은 키워드를 한 번의 스캔으로 찾는 Aho-Corasick 오토마톤.
+    거대한 정규식 OR 패턴('|'.join)과 동일하게 '가장 왼쪽 + 가장 긴 키' 우선으로 매칭하며,
+    스캔 비용은 키 개수와 무관하게 텍스트 길이에 비례합니다.
+
+    :param keys: 검색할 문자열 목록 (빈 문자열은 무시)
+    :param flexible_newline: True이면 여러 줄 키가 다양한 줄바꿈 표기(\\n, \\r\\n, 실제 개행 등)에 매칭됨
+    :param guard: guard(text, start, end) -> bool. guarded_keys에 속한 키는 이 조건을 통과해야 매칭됨
+    :param guarded_keys: guard 조건을 적용할 키 목록
+    """
+
+    def __init__(self, keys, flexible_newline=True, guard=None, guarded_keys=None):
+        self.keys = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._depth = [0]
+        self._out = [-1]      # 해당 상태에서 끝나는 키 인덱스 (없으면 -1)
+        self._link = [0]      # 실패 링크를 따라가며 만나는 가장 가까운 '키 종료 상태'
+        self._guarded = set()
+        self.guard = guard
+
+        guarded_keys = set(guarded_keys or ())
+        for key in keys:
+            if key:
+                self._add(key, key in guarded_keys)
+
+        self.multiline = flexible_newline and any('\n' in k for k in self.keys)
+        self.max_newlines = max((k.count('\n') for k in self.keys), default=0)  # 한 매칭이 걸칠 수 있는 최대 줄바꿈 수
+        self._build_links()
+
+        # 루트에서 시작 가능한 문자 집합 -> 관계없는 구간은 정규식 엔진(C)으로 건너뜀
+        first_chars = "".join(re.escape(c) for c in self._goto[0])
+        self._start_re = re.compile(f"[{first_chars}]") if first_chars else None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _add(self, key, guarded):
+        goto, depth = self._goto, self._depth
+        state = 0
+        for ch in key:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto.append({})
+                self._fail.append(0)
+                depth.append(depth[state] + 1)
+                self._out.append(-1)
+                self._link.append(0)
+                goto[state][ch] = nxt
+            state = nxt
+
+        if self._out[state] == -1:
+            self._out[state] = len(self.keys)
+            self.keys.append(key)
+            if guarded:
+                self._guarded.add(state)
+
+    def _build_links(self):
+        goto, fail, out, link = self._goto, self._fail, self._out, self._link
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                link[nxt] = fail[nxt] if out[fail[nxt]] != -1 else link[fail[nxt]]
+                queue.append(nxt)
+
+    def _scan(self, text, pos=0):
+        """정규화된 텍스트의 pos 위치부터 (start, end, key_idx)를 순서대로 생성"""
+        goto, fail, depth, out, link = self._goto, self._fail, self._depth, self._out, self._link
+        guarded, guard = self._guarded, self.guard
+        start_re = self._start_re
+        if start_re is None:
+            return
+
+        n = len(text)
+        i = pos
+        state = 0
+        best = None  # 보류 중인 최선 후보 (start, end, key_idx)
+
+        while True:
+            if i >= n:
+                if best is None:
+                    return
+                yield best
+                i, state, best = best[1], 0, None
+                continue
+
+            if state == 0:
+                m = start_re.search(text, i)
+                if m is None:
+                    i = n
+                    continue
+                i = m.start()
+
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            i += 1
+
+            # 현재 상태로는 더 이상 보류 후보보다 왼쪽에서 시작하는 매칭이 불가능 -> 확정
+            if best is not None and i - depth[state] > best[0]:
+                yield best
+                i, state, best = best[1], 0, None
+                continue
+
+            t = state if out[state] != -1 else link[state]
+            while t:
+                start = i - depth[t]
+                if best is not None and (start > best[0] or (start == best[0] and i <= best[1])):
+                    break  # 이후 후보는 모두 더 짧음 (시작 위치가 더 오른쪽)
+                if t not in guarded or guard(text, start, i):
+                    best = (start, i, out[t])
+                    break
+                t = link[t]
+
+    def finditer(self, text, pos=0):
+        """
+        원문 기준 (start, end, key)를 왼쪽부터 차례로 생성합니다.
+        :param pos: 검색 시작 위치 (앞부분은 가드 판정 등 문맥으로만 사용)
+        """
+        if self.multiline:
+            norm = NormalizedText(text)
+            to_source = norm.to_source
+            for start, end, k in self._scan(norm.text, norm.from_source(pos) if pos else 0):
+                yield to_source(start), to_source(end), self.keys[k]
+        else:
+            for start, end, k in self._scan(text, pos):
+                yield start, end, self.keys[k]
+
+    def subn(self, repl, text):
+        """
+        re.Pattern.subn 대응 함수.
+        :param repl: repl(key, matched_str) -> 치환 문자열
+        :return: (치환된 텍스트, 매칭 횟수)
+        """
+        pieces = []
+        last = 0
+        count = 0
+        for start, end, key in self.finditer(text):
+            pieces.append(text[last:start])
+            pieces.append(repl(key, text[start:end]))
+            last = end
+            count += 1
+
+        if not count:
+            return text, 0
+        pieces.append(text[last:])
+        return "".join(pieces), count
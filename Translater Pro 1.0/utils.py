@@ -1,7 +1,13 @@
 # utils.py
-import chardet
+import codecs
+import fnmatch
+import json
 import os
 import re
+import tempfile
+import threading
+import time
+from matcher import KeywordMatcher
 
 # ==========================================
 # [상수] 정규식 패턴
@@ -9,20 +15,335 @@ import re
 JAPANESE_REGEX_WIDE = re.compile(r'[\u3000-\u303f\u3040-\u309f\u30a0-\u30ff\uff00-\uffef\u4e00-\u9faf\u3400-\u4dbf]')
 BRACKET_REGEX = re.compile(r'(「[^」]+」|『[^』]+』)')
 KOREAN_REGEX = re.compile(r'[\uac00-\ud7a3]')
+# 용어집 마스킹 ID (load_glossary_data에서 부여, 예: __MSK_0000__)
+MASK_ID_REGEX = re.compile(r'__MSK_\d+__')
 
 # ==========================================
-# [함수] 파일 및 데이터 처리
+# [상수] 단계별 처리 대상 확장자
+# ==========================================
+EXTRACT_EXTENSIONS = ('.txt', '.json', '.dat')
+APPLY_EXTENSIONS = ('.txt', '.json', '.dat')
+AI_EXTENSIONS = ('.txt', '.json', '.ini')
+ESTIMATE_EXTENSIONS = ('.txt', '.json')
+
 # ==========================================
+# [상수] 인코딩 감지
+# ==========================================
+# BOM이 있으면 그대로 확정 (긴 BOM부터 비교: UTF-32 LE BOM은 UTF-16 LE BOM으로 시작함)
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+# BOM이 없으면 이 순서대로 엄격(strict) 디코딩을 시도하여 처음 성공한 인코딩 사용
+ENCODING_CANDIDATES = ('utf-8', 'cp932', 'utf-16-le')
+ENCODING_SNIFF_BYTES = 64 * 1024  # detect_encoding()이 읽는 앞부분 크기
+
+ENCODING_CACHE_FILENAME = "encoding_cache.json"
+ENCODING_CACHE_VERSION = 1
+ENCODING_CACHE_MAX_ENTRIES = 50000
+
+# ==========================================
+# [함수] 파일 탐색 (하위 폴더 + 포함/제외 패턴)
+# ==========================================
+def parse_glob_patterns(text):
+    """'*.txt; data/*' 처럼 ; 또는 , 로 구분된 패턴 문자열 -> 패턴 리스트"""
+    if not text:
+        return []
+    if isinstance(text, (list, tuple)):
+        return [p.strip() for p in text if p and p.strip()]
+    return [p.strip() for p in re.split(r'[;,]', text) if p.strip()]
+
+def _match_glob(rel_path, name, patterns):
+    """
+    패턴에 '/'가 있으면 상대 경로 전체와, 없으면 파일/폴더 이름과 비교합니다.
+    (대소문자 무시, 경로 구분자는 '/'로 통일)
+    """
+    rel_path = rel_path.lower()
+    name = name.lower()
+    for pat in patterns:
+        pat = pat.replace('\\', '/').lower()
+        target = rel_path if '/' in pat else name
+        if fnmatch.fnmatchcase(target, pat):
+            return True
+    return False
+
+def iter_source_files(root, extensions=None, include=None, exclude=None, recursive=True, skip_dirs=None):
+    """
+    root 아래의 처리 대상 파일을 찾아 상대 경로(os.sep 구분)를 하나씩 생성합니다.
+    폴더 탐색이 끝나기 전에 바로 작업을 시작할 수 있도록 제너레이터로 동작합니다.
+
+    :param extensions: 허용 확장자 튜플 (None이면 전체)
+    :param include: 포함 패턴 목록 (비어 있으면 전체 포함)
+    :param exclude: 제외 패턴 목록 (폴더가 매칭되면 하위 전체를 건너뜀)
+    :param recursive: False이면 root 바로 아래 파일만
+    :param skip_dirs: 탐색하지 않을 폴더 (원본 폴더 안에 출력 폴더를 둔 경우 결과물 재처리 방지)
+    """
+    include = parse_glob_patterns(include)
+    exclude = parse_glob_patterns(exclude)
+    extensions = tuple(e.lower() for e in extensions) if extensions else None
+    skip_dirs = {os.path.normcase(os.path.abspath(d)) for d in (skip_dirs or ()) if d}
+
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        sub_dirs = []
+        for entry in entries:
+            rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            rel_posix = rel.replace(os.sep, '/')
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not recursive or (exclude and _match_glob(rel_posix, entry.name, exclude)):
+                        continue
+                    if skip_dirs and os.path.normcase(os.path.abspath(entry.path)) in skip_dirs:
+                        continue
+                    sub_dirs.append(rel)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+
+            if extensions and not entry.name.lower().endswith(extensions):
+                continue
+            if include and not _match_glob(rel_posix, entry.name, include):
+                continue
+            if exclude and _match_glob(rel_posix, entry.name, exclude):
+                continue
+            yield rel
+
+        # 스택이므로 역순으로 넣어야 이름 순서대로 방문
+        stack.extend(reversed(sub_dirs))
+
+def iter_stage_files(root, extensions=None, options=None, skip_dirs=None):
+    """옵션(recursive / include_patterns / exclude_patterns)을 적용한 iter_source_files"""
+    options = options or {}
+    return iter_source_files(
+        root, extensions,
+        include=options.get('include_patterns'),
+        exclude=options.get('exclude_patterns'),
+        recursive=options.get('recursive', True),
+        skip_dirs=skip_dirs
+    )
+
+# ==========================================
+# [캐시] 파일별 인코딩 감지 결과 (경로 + 크기 + 수정시각)
+# ==========================================
+class EncodingCache:
+    """
+    UTF-8이 아닌 파일의 감지 결과를 디스크에 보관합니다.
+    (UTF-8은 항상 먼저 시도하므로 기록하지 않음 -> 같은 Shift-JIS 원본을 매일 다시 감지하지 않음)
+    여러 프로세스가 동시에 저장할 수 있으므로 잠금 파일(<캐시>.lock)을 잡은 상태에서
+    디스크 내용과 병합 후 원자적으로 교체합니다. (잠금 없이 병합하면 동시에 저장한 쪽의 새 항목이 사라짐)
+    """
+    LOCK_TIMEOUT = 2.0   # 잠금 대기 한도 (초과 시 이번 저장은 건너뛰고 다음 flush에서 다시 시도)
+    LOCK_STALE = 30.0    # 이보다 오래된 잠금 파일은 비정상 종료로 남은 것으로 보고 제거
+    def __init__(self, path=None):
+        self.path = path or self._determine_cache_path()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries = None   # {정규화 경로: [크기, 수정시각(ns), 인코딩]}
+        self._dirty = {}
+
+    def _determine_cache_path(self):
+        # 프로그램 폴더에 쓸 수 없으면 임시 폴더 사용
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        if os.access(base_dir, os.W_OK):
+            return os.path.join(base_dir, ENCODING_CACHE_FILENAME)
+        return os.path.join(tempfile.gettempdir(), ENCODING_CACHE_FILENAME)
+
+    def _read_disk(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == ENCODING_CACHE_VERSION:
+                return data.get('files', {})
+        except: pass
+        return {}
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def get(self, file_path, st=None):
+        try:
+            st = st or os.stat(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read_disk()
+            rec = self._entries.get(self._key(file_path))
+        if rec and rec[0] == st.st_size and rec[1] == st.st_mtime_ns:
+            return rec[2]
+        return None
+
+    def put(self, file_path, encoding, st=None):
+        try:
+            st = st or os.stat(file_path)
+        except OSError:
+            return
+        rec = [st.st_size, st.st_mtime_ns, encoding]
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read_disk()
+            key = self._key(file_path)
+            self._entries[key] = rec
+            self._dirty[key] = rec
+
+    def discard(self, file_path):
+        with self._lock:
+            if self._entries:
+                self._entries.pop(self._key(file_path), None)
+
+    def _acquire_file_lock(self):
+        """다른 프로세스와 공유하는 잠금 파일 생성 (O_EXCL). :return: 잠금 파일 경로 또는 None(시간 초과)"""
+        lock_path = self.path + ".lock"
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return lock_path
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.LOCK_STALE:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue  # 그 사이 다른 프로세스가 해제함
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.01)
+
+    def flush(self):
+        """새로 감지한 결과가 있으면 저장 (실패해도 작업에는 영향 없음)"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                dirty, self._dirty = self._dirty, {}
+            lock_path = None
+            try:
+                lock_path = self._acquire_file_lock()
+                if lock_path is None:
+                    raise TimeoutError("encoding cache lock")
+                files = self._read_disk()
+                files.update(dirty)
+                if len(files) > ENCODING_CACHE_MAX_ENTRIES:
+                    files = dict(list(files.items())[-ENCODING_CACHE_MAX_ENTRIES:])
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'version': ENCODING_CACHE_VERSION, 'files': files}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                # 저장하지 못한 항목은 다음 flush에서 다시 시도
+                with self._lock:
+                    for key, rec in dirty.items():
+                        self._dirty.setdefault(key, rec)
+            finally:
+                if lock_path:
+                    try: os.remove(lock_path)
+                    except OSError: pass
+
+encoding_cache = EncodingCache()
+
+# ==========================================
+# [함수] 인코딩 감지 (BOM -> 후보 순차 시도 -> chardet)
+# ==========================================
+def _sniff_bom(raw):
+    for bom, enc in BOM_ENCODINGS:
+        if raw.startswith(bom):
+            return enc
+    return None
+
+def _try_candidates(raw, final=True):
+    """
+    후보 인코딩으로 엄격 디코딩을 시도하여 처음 성공한 (인코딩, 텍스트)를 반환.
+    final=False이면 앞부분 샘플로 판단 (끝에서 잘린 멀티바이트 문자는 허용, 텍스트는 None)
+    """
+    for enc in ENCODING_CANDIDATES:
+        # BOM 없는 UTF-16은 어떤 짝수 길이 바이트도 대부분 디코딩되므로 NUL 바이트가 있을 때만 인정
+        if enc.startswith('utf-16') and (b'\x00' not in raw or (final and len(raw) % 2)):
+            continue
+        try:
+            if final:
+                return enc, raw.decode(enc)
+            codecs.getincrementaldecoder(enc)('strict').decode(raw, final=False)
+            return enc, None
+        except UnicodeDecodeError:
+            continue
+    return None, None
+
+def _chardet_fallback(raw):
+    try:
+        import chardet  # 후보 인코딩이 모두 실패한 경우에만 필요하므로 지연 로딩
+        enc = chardet.detect(raw[:ENCODING_SNIFF_BYTES])['encoding'] or 'utf-8'
+        codecs.lookup(enc)
+        return enc
+    except:
+        return 'utf-8'
+
 def detect_encoding(file_path):
-    """파일의 인코딩을 감지하여 반환 (기본값: utf-8)"""
+    """파일의 인코딩을 감지하여 반환 (기본값: utf-8). 결과는 경로+수정시각 단위로 캐시됨"""
     try:
+        st = os.stat(file_path)
+        cached = encoding_cache.get(file_path, st)
+        if cached:
+            return cached
+
         with open(file_path, 'rb') as f:
-            raw = f.read(4096)
-            result = chardet.detect(raw)
-            return result['encoding'] or 'utf-8'
+            raw = f.read(ENCODING_SNIFF_BYTES)
+        enc = _sniff_bom(raw)
+        if not enc:
+            enc, _ = _try_candidates(raw, final=len(raw) == st.st_size)
+        if not enc:
+            enc = _chardet_fallback(raw)
+
+        if enc != 'utf-8':
+            encoding_cache.put(file_path, enc, st)
+        return enc
     except:
         return 'utf-8'
 
+def decode_bytes(raw, file_path=None):
+    """
+    파일 전체 바이트를 디코딩하여 (텍스트, 인코딩)을 반환합니다.
+    캐시된 인코딩 -> BOM -> 후보 순서로 시도하므로 UTF-8 실패 후 파일을 다시 읽거나 두 번 디코딩하지 않습니다.
+    어떤 후보도 맞지 않으면 chardet 결과로 오류 문자를 치환하며 디코딩합니다.
+    """
+    if file_path:
+        cached = encoding_cache.get(file_path)
+        if cached:
+            try:
+                return raw.decode(cached), cached
+            except (UnicodeDecodeError, LookupError):
+                encoding_cache.discard(file_path)
+
+    enc = _sniff_bom(raw)
+    if enc:
+        text = raw.decode(enc, errors='replace')
+    else:
+        enc, text = _try_candidates(raw)
+        if not enc:
+            enc = _chardet_fallback(raw)
+            text = raw.decode(enc, errors='replace')
+
+    if file_path and enc != 'utf-8':
+        encoding_cache.put(file_path, enc)
+    return text, enc
+
+# ==========================================
+# [함수] 파일 및 데이터 처리
+# ==========================================
+
 def load_glossary_data(path):
     """
     용어집 파일을 읽어서 리스트 구조로 반환합니다.
@@ -81,4 +402,108 @@ def load_glossary_data(path):
 
     except Exception as e:
         print(f"!! [utils.py] 용어집 로드 중 오류: {e}")
-        return []
\ No newline at end of file
+        return []
+
+# ==========================================
+# [인덱스] 용어집 마스킹 (추출 / DB 마스킹 / AI 번역 공용)
+# ==========================================
+class GlossaryIndex:
+    """
+    load_glossary_data() 결과로 한 번만 만드는 마스킹 인덱스.
+    - matcher: 용어 원문 Aho-Corasick 매처 (가장 왼쪽 + 가장 긴 용어 우선, 한 번의 스캔)
+    - src_to_item / src_to_id: 매칭된 원문 -> 항목 / 마스킹 ID (O(1) 조회)
+    - id_to_src / id_to_tgt: 마스킹 ID -> 원문 / 번역문 (복원용)
+    같은 원문이 여러 번 있으면 정렬상 먼저 오는 항목(=더 작은 ID)을 사용합니다.
+    """
+    def __init__(self, masking_data):
+        self.items = masking_data or []
+        self.src_to_item = {}
+        for item in self.items:
+            self.src_to_item.setdefault(item['src'], item)
+        self.src_to_id = {src: item['mask_id'] for src, item in self.src_to_item.items()}
+        self.id_to_src = {item['mask_id']: item['src'] for item in self.items}
+        self.id_to_tgt = {item['mask_id']: item['tgt'] for item in self.items}
+        self.matcher = KeywordMatcher(self.src_to_item.keys(), flexible_newline=False) if self.src_to_item else None
+
+    def __len__(self):
+        return len(self.items)
+
+    def mask(self, text):
+        """:return: (마스킹된 텍스트, {mask_id: 항목}) - 실제로 등장한 용어만 포함"""
+        active_masks = {}
+        if not self.matcher:
+            return text, active_masks
+
+        pieces = []
+        last = 0
+        src_to_item = self.src_to_item
+        for start, end, src in self.matcher.finditer(text):
+            item = src_to_item[src]
+            pieces.append(text[last:start])
+            pieces.append(item['mask_id'])
+            active_masks[item['mask_id']] = item
+            last = end
+
+        if not pieces:
+            return text, active_masks
+        pieces.append(text[last:])
+        return "".join(pieces), active_masks
+
+    def mask_text(self, text):
+        return self.mask(text)[0]
+
+    @staticmethod
+    def restore(text, target_map):
+        """텍스트 내 마스킹 ID를 target_map(ID -> 문자열)으로 치환 (맵에 없는 ID는 그대로 유지)"""
+        if not target_map or '__MSK_' not in text:
+            return text
+
+        def _cb(m):
+            return target_map.get(m.group(0), m.group(0))
+
+        return MASK_ID_REGEX.sub(_cb, text)
+
+# ==========================================
+# [클래스] 작업 취소 토큰 + 일시정지 게이트
+# ==========================================
+# 일시정지/취소 상태를 확인하는 최대 간격 (결과 대기 루프의 timeout)
+CONTROL_POLL_INTERVAL = 0.2
+
+class JobControl:
+    """
+    오래 걸리는 작업(추출/적용/AI 번역)을 밖에서 멈추거나 일시정지하기 위한 협력적 제어 객체.
+    작업 쪽은 새 일을 시작하기 전에 checkpoint()를 호출하고, False가 반환되면 정리 후 종료합니다.
+    (이미 실행 중인 파일/배치/요청은 끝까지 처리되므로 결과 파일이 중간에 잘리지 않음)
+    """
+    def __init__(self):
+        self._cancel = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def paused(self):
+        return not self._resume.is_set() and not self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        self._resume.set()  # 일시정지 중 대기하던 작업도 깨워서 종료하게 함
+
+    def pause(self):
+        if not self._cancel.is_set():
+            self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    def checkpoint(self):
+        """일시정지 중이면 재개/취소될 때까지 대기. 계속 진행해도 되면 True"""
+        self._resume.wait()
+        return not self._cancel.is_set()
+
+    def sleep(self, seconds):
+        """취소되면 바로 깨어나는 time.sleep. 계속 진행해도 되면 True"""
+        return not self._cancel.wait(seconds)